@@ -0,0 +1,42 @@
+"""Add middah indexes to content tables
+
+Revision ID: 5b7e2c41d9a3
+Revises: 1a31ce608336
+Create Date: 2026-10-17 09:12:05.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c41d9a3'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+# Composite (middah, id) indexes serve both the ?middah= filter on the paginated
+# list routes and the foreign key lookups when a middah is deleted.
+MIDDAH_INDEXES = {
+    'reminder_phrases': 'ix_reminder_phrases_middah_id',
+    'daily_texts': 'ix_daily_texts_middah_id',
+    'kabbalot': 'ix_kabbalot_middah_id',
+}
+
+
+def upgrade():
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table_name, index_name in MIDDAH_INDEXES.items():
+        # The content tables may not exist yet on a fresh database, in which
+        # case they are created together with their indexes from the models.
+        if table_name in existing_tables:
+            op.create_index(index_name, table_name, ['middah', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table_name, index_name in MIDDAH_INDEXES.items():
+        if table_name in existing_tables:
+            op.drop_index(index_name, table_name=table_name, if_exists=True)
@@ -0,0 +1,101 @@
+"""Add mussar content tables
+
+Revision ID: a4d6f0c8e1b2
+Revises: 5b7e2c41d9a3
+Create Date: 2026-10-17 10:03:41.772519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d6f0c8e1b2'
+down_revision = '5b7e2c41d9a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases initialized before this revision already have the content tables,
+    # created by SQLModel.metadata.create_all in init_db, so only create missing ones.
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'middot' not in existing_tables:
+        op.create_table('middot',
+        sa.Column('name_transliterated', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.Column('name_hebrew', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.Column('name_english', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.PrimaryKeyConstraint('name_transliterated'),
+        sa.UniqueConstraint('name_english'),
+        sa.UniqueConstraint('name_hebrew')
+        )
+    if 'reminder_phrases' not in existing_tables:
+        op.create_table('reminder_phrases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('middah', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.Column('text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['middah'], ['middot.name_transliterated'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('middah', 'text', name='reminder_phrases_middah_text_uq')
+        )
+    if 'daily_texts' not in existing_tables:
+        op.create_table('daily_texts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('middah', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.Column('sefaria_url', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('content', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['middah'], ['middot.name_transliterated'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sefaria_url')
+        )
+    if 'kabbalot' not in existing_tables:
+        op.create_table('kabbalot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('middah', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=False),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['middah'], ['middot.name_transliterated'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('middah', 'description', name='kabbalot_middah_description_uq')
+        )
+    if 'weekly_texts' not in existing_tables:
+        op.create_table('weekly_texts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sefaria_url', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('content', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sefaria_url')
+        )
+
+    # 5b7e2c41d9a3 skips the middah indexes when the tables did not exist yet
+    op.create_index('ix_reminder_phrases_middah_id', 'reminder_phrases', ['middah', 'id'], if_not_exists=True)
+    op.create_index('ix_daily_texts_middah_id', 'daily_texts', ['middah', 'id'], if_not_exists=True)
+    op.create_index('ix_kabbalot_middah_id', 'kabbalot', ['middah', 'id'], if_not_exists=True)
+
+    # Keyset pagination ordered by (updated_at, id)
+    op.create_index('ix_reminder_phrases_updated_at_id', 'reminder_phrases', ['updated_at', 'id'], if_not_exists=True)
+    op.create_index('ix_daily_texts_updated_at_id', 'daily_texts', ['updated_at', 'id'], if_not_exists=True)
+    op.create_index('ix_kabbalot_updated_at_id', 'kabbalot', ['updated_at', 'id'], if_not_exists=True)
+    op.create_index('ix_weekly_texts_updated_at_id', 'weekly_texts', ['updated_at', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    # The content tables may predate this revision, created by init_db, so they and
+    # their data are left in place; upgrading again finds them and skips them. Only
+    # the indexes this revision always adds are dropped, 5b7e2c41d9a3 drops the
+    # middah ones.
+    op.drop_index('ix_weekly_texts_updated_at_id', table_name='weekly_texts', if_exists=True)
+    op.drop_index('ix_kabbalot_updated_at_id', table_name='kabbalot', if_exists=True)
+    op.drop_index('ix_daily_texts_updated_at_id', table_name='daily_texts', if_exists=True)
+    op.drop_index('ix_reminder_phrases_updated_at_id', table_name='reminder_phrases', if_exists=True)
@@ -0,0 +1,27 @@
+"""Add item owner_id index
+
+Revision ID: c7e3a9d2f4b1
+Revises: a4d6f0c8e1b2
+Create Date: 2026-10-17 14:38:51.604127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a9d2f4b1'
+down_revision = 'a4d6f0c8e1b2'
+branch_labels = None
+depends_on = None
+
+
+# Without it the ON DELETE CASCADE of a user's items, and each batch of a background
+# purge, scans the whole item table.
+def upgrade():
+    op.create_index('ix_item_owner_id', 'item', ['owner_id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_item_owner_id', table_name='item', if_exists=True)
@@ -0,0 +1,104 @@
+from collections import Counter
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import Boolean, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud import utc_now
+from app.models import (
+    BulkItemResult,
+    BulkUpsertResult,
+    DailyText,
+    DailyTextUpsert,
+    Middah,
+    WeeklyText,
+    WeeklyTextUpsert,
+)
+
+
+async def lock_existing_middot(session: AsyncSession, names: Iterable[str]) -> set[str]:
+    """
+    Return which of ``names`` are existing middot.
+
+    The middot found are locked FOR SHARE until the transaction ends, so they cannot be
+    deleted before the rows that reference them are inserted.
+    """
+    statement = (
+        select(Middah.name_transliterated)
+        .where(col(Middah.name_transliterated).in_(set(names)))
+        .with_for_update(read=True)
+    )
+    return set((await session.exec(statement)).all())
+
+
+async def upsert_by_sefaria_url(
+    *,
+    session: AsyncSession,
+    model: type[DailyText] | type[WeeklyText],
+    items: Sequence[DailyTextUpsert | WeeklyTextUpsert],
+    invalid_indexes: set[int] | None = None,
+) -> BulkUpsertResult:
+    """
+    Insert ``items``, or update the rows with the same sefaria_url, with one INSERT ... ON
+    CONFLICT (sefaria_url) DO UPDATE statement. Items at ``invalid_indexes`` are left out
+    and reported as invalid_middah.
+
+    A conflicting row is only updated, and its updated_at only bumped, when another column
+    differs, so unchanged rows are neither written nor returned.
+    """
+    invalid_indexes = invalid_indexes or set()
+    # Postgres rejects a statement that updates the same row twice, the last item wins
+    last_indexes = {
+        item.sefaria_url: index for index, item in enumerate(items) if index not in invalid_indexes
+    }
+    written: dict[str, tuple[int, bool]] = {}
+    if last_indexes:
+        rows = [
+            {**items[index].model_dump(), "created_at": utc_now(), "updated_at": utc_now()}
+            for index in last_indexes.values()
+        ]
+        table = model.__table__  # type: ignore[union-attr]
+        insert_statement = insert(table).values(rows)
+        columns = [
+            name for name in rows[0] if name not in ("sefaria_url", "created_at", "updated_at")
+        ]
+        statement = insert_statement.on_conflict_do_update(
+            index_elements=[table.c.sefaria_url],
+            set_={name: insert_statement.excluded[name] for name in [*columns, "updated_at"]},
+            where=tuple_(*(table.c[name] for name in columns)).is_distinct_from(
+                tuple_(*(insert_statement.excluded[name] for name in columns))
+            ),
+        ).returning(
+            table.c.id,
+            table.c.sefaria_url,
+            # xmax is only 0 for a row version created by an insert
+            literal_column("xmax = 0", Boolean).label("inserted"),
+        )
+        result = await session.exec(statement)  # type: ignore
+        written = {sefaria_url: (id, inserted) for id, sefaria_url, inserted in result.all()}
+
+    results = []
+    for index, item in enumerate(items):
+        sefaria_url = item.sefaria_url
+        if index in invalid_indexes:
+            results.append(BulkItemResult(index=index, status="invalid_middah"))
+        elif last_indexes[sefaria_url] != index:
+            results.append(BulkItemResult(index=index, status="skipped"))
+        elif sefaria_url in written:
+            id, inserted = written[sefaria_url]
+            results.append(
+                BulkItemResult(index=index, status="inserted" if inserted else "updated", id=id)
+            )
+        else:
+            results.append(BulkItemResult(index=index, status="unchanged"))
+    counts = Counter(result.status for result in results)
+    return BulkUpsertResult(
+        inserted=counts["inserted"],
+        updated=counts["updated"],
+        unchanged=counts["unchanged"],
+        skipped=counts["skipped"],
+        invalid_middah=counts["invalid_middah"],
+        items=results,
+    )
@@ -0,0 +1,92 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import ColumnElement
+from sqlmodel import SQLModel, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    # Weak, since it is derived from the data and not from the encoded response bytes
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def for_row(cls, row: Any) -> "Validators":
+        return cls(etag=make_etag(row.id, row.updated_at), last_modified=row.updated_at)
+
+    def _last_modified_utc(self) -> datetime | None:
+        if self.last_modified is None:
+            return None
+        # Timestamps are stored in UTC without a time zone
+        if self.last_modified.tzinfo is None:
+            return self.last_modified.replace(tzinfo=timezone.utc)
+        return self.last_modified
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        last_modified = self._last_modified_utc()
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        return headers
+
+    def is_not_modified(self, request: Request) -> bool:
+        """
+        Evaluate If-None-Match, or If-Modified-Since when there is no If-None-Match.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # Weak comparison, W/ prefixes are ignored
+            own_tag = self.etag.removeprefix("W/")
+            return any(
+                tag.strip().removeprefix("W/") == own_tag for tag in if_none_match.split(",")
+            )
+        if_modified_since = request.headers.get("if-modified-since")
+        last_modified = self._last_modified_utc()
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates only have a one second resolution
+        return last_modified.replace(microsecond=0) <= since
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+
+async def list_validators(
+    *,
+    session: AsyncSession,
+    request: Request,
+    model: type[SQLModel],
+    filters: list[ColumnElement[bool]],
+) -> Validators:
+    """
+    Validators of a list response, derived from the row count and latest updated_at of
+    the filtered rows with a single aggregate query, without fetching any row.
+
+    The query string is part of the ETag, so every page and filter has its own. There is
+    no Last-Modified, max(updated_at) alone does not change when a row is deleted.
+    """
+    updated_at = col(model.updated_at)  # type: ignore[attr-defined]
+    statement = select(func.count(), func.max(updated_at)).select_from(model).where(*filters)
+    count, max_updated_at = (await session.exec(statement)).one()
+    return Validators(etag=make_etag(request.url.path, request.url.query, count, max_updated_at))
@@ -1,16 +1,23 @@
-from collections.abc import Generator
+import hashlib
+import time
+import uuid
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
+from app.core.cache import CachedUser, token_cache, user_cache
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, async_read_engine, engine
+from app.middleware import READ_PRIMARY_COOKIE
 from app.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
@@ -21,11 +28,55 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Attributes must not expire on commit, reloading them would need IO outside an await
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def should_read_from_primary(request: Request) -> bool:
+    """
+    Keep a client on the primary right after it wrote, or when it asks for fresh data.
+    """
+    if "no-cache" in request.headers.get("cache-control", ""):
+        return True
+    read_primary_until = request.cookies.get(READ_PRIMARY_COOKIE)
+    if not read_primary_until:
+        return False
+    try:
+        return float(read_primary_until) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_engine(request: Request) -> AsyncEngine:
+    return async_engine if should_read_from_primary(request) else async_read_engine
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(get_read_engine(request), expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db)]
+# For responses that outlive the dependencies, like streams, and open their own session
+ReadEngineDep = Annotated[AsyncEngine, Depends(get_read_engine)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def decode_token(token: str) -> TokenPayload:
+    """
+    Verify the token and return its claims, served from the token cache once verified.
+
+    A cached entry expires with the token, so an expired token is verified again and
+    rejected. Revocation is not decided here, the token epoch is checked on each request.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
         token_data = TokenPayload(**payload)
@@ -34,18 +85,80 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    if "exp" in payload:
+        ttl = min(settings.TOKEN_CACHE_TTL_SECONDS, payload["exp"] - time.time())
+        token_cache.set(digest, token_data, ttl=ttl)
+    return token_data
+
+
+def cached_user_of(user: User) -> CachedUser:
+    return CachedUser(
+        id=user.id,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+        token_epoch=user.token_epoch,
+    )
+
+
+def check_token_epoch(token_data: TokenPayload, token_epoch: int) -> None:
+    # Issued before the user's tokens were revoked, e.g. by a password change
+    if token_data.epoch != token_epoch:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> User:
+    token_data = decode_token(token)
+    user = await session.get(User, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    check_token_epoch(token_data, user.token_epoch)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    user_cache.set(user.id, cached_user_of(user))
     return user
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+async def get_current_user_cached(session: AsyncSessionDep, token: TokenDep) -> CachedUser:
+    """
+    Like get_current_user, but only returns the fields needed for authorization and
+    serves them from the user cache, skipping the DB lookup on a hit.
+
+    The token epoch is checked against the cached one, so a revocation reaches the other
+    workers within USER_CACHE_TTL_SECONDS.
+    """
+    token_data = decode_token(token)
+    try:
+        user_id = uuid.UUID(token_data.sub)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    cached_user = user_cache.get(user_id)
+    # A newer epoch than the cached one means another worker revoked the user's tokens
+    # since it was cached, so the cached fields are stale
+    if cached_user is None or token_data.epoch > cached_user.token_epoch:
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        cached_user = cached_user_of(user)
+        user_cache.set(user_id, cached_user)
+    check_token_epoch(token_data, cached_user.token_epoch)
+    if not cached_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return cached_user
+
+
+CachedCurrentUser = Annotated[CachedUser, Depends(get_current_user_cached)]
+
+
+async def get_current_active_superuser(current_user: CachedCurrentUser) -> CachedUser:
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
     return current_user
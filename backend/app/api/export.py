@@ -0,0 +1,95 @@
+import csv
+import io
+import logging
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(adapter: TypeAdapter[Any], rows: Sequence[Any]) -> bytes:
+    return b"".join(
+        adapter.dump_json(adapter.validate_python(row, from_attributes=True)) + b"\n"
+        for row in rows
+    )
+
+
+def encode_csv(adapter: TypeAdapter[Any], rows: Sequence[Any], columns: list[str]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        values = adapter.dump_python(
+            adapter.validate_python(row, from_attributes=True), mode="json"
+        )
+        writer.writerow(values[column] for column in columns)
+    return buffer.getvalue().encode()
+
+
+async def stream_table(
+    *,
+    engine: AsyncEngine,
+    model: type[SQLModel],
+    read_model: type[SQLModel],
+    format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the whole table in ``format``, one chunk per batch of EXPORT_BATCH_SIZE rows
+    fetched from a server-side cursor, so memory use does not depend on the table size.
+
+    StreamingResponse cancels the iteration when the client disconnects, which closes
+    the cursor and the session.
+    """
+    adapter: TypeAdapter[Any] = TypeAdapter(read_model)
+    columns = list(read_model.model_fields)
+    if format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(columns)
+        yield header.getvalue().encode()
+
+    exported = 0
+    statement = (
+        select(model)
+        .order_by(col(model.id))  # type: ignore[attr-defined]
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    async with AsyncSession(engine) as session:
+        result = await session.stream_scalars(statement)
+        async for rows in result.partitions():
+            if format == "csv":
+                yield encode_csv(adapter, rows, columns)
+            else:
+                yield encode_ndjson(adapter, rows)
+            exported += len(rows)
+            # The rows are not needed anymore, don't keep them in the identity map
+            session.expunge_all()
+    logger.info(f"Exported table={model.__tablename__} {format=} rows={exported}")
+
+
+def export_response(
+    *,
+    engine: AsyncEngine,
+    model: type[SQLModel],
+    read_model: type[SQLModel],
+    format: ExportFormat,
+) -> StreamingResponse:
+    filename = f"{model.__tablename__}.{format}"
+    return StreamingResponse(
+        stream_table(engine=engine, model=model, read_model=read_model, format=format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
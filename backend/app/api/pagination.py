@@ -0,0 +1,97 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any, Literal, TypeVar
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import tuple_
+from sqlmodel import SQLModel, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.config import settings
+
+OrderBy = Literal["id", "updated_at"]
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+@dataclass
+class PageParams:
+    after: str | None
+    limit: int
+    order_by: OrderBy
+
+
+async def get_page_params(
+    after: str | None = None,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.PAGINATION_MAX_LIMIT)
+    ] = settings.PAGINATION_DEFAULT_LIMIT,
+    order_by: OrderBy = "id",
+) -> PageParams:
+    return PageParams(after=after, limit=limit, order_by=order_by)
+
+
+PageParamsDep = Annotated[PageParams, Depends(get_page_params)]
+
+
+def encode_cursor(*, order_by: OrderBy, row: Any) -> str:
+    if order_by == "updated_at":
+        key: list[Any] = [row.updated_at.isoformat(), row.id]
+    else:
+        key = [row.id]
+    raw = json.dumps({"o": order_by, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(*, cursor: str, order_by: OrderBy) -> list[Any]:
+    """
+    Decode an opaque cursor into its key values, rejecting cursors issued for another ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload["o"] != order_by:
+            raise ValueError("cursor ordering mismatch")
+        key = payload["k"]
+        if order_by == "updated_at":
+            return [datetime.fromisoformat(key[0]), int(key[1])]
+        return [int(key[0])]
+    except (binascii.Error, ValueError, KeyError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    *,
+    session: AsyncSession,
+    statement: SelectOfScalar[ModelT],
+    model: type[ModelT],
+    page: PageParams,
+) -> tuple[Sequence[ModelT], str | None]:
+    """
+    Apply keyset pagination to ``statement`` and return one page plus the cursor of the next one.
+
+    One extra row is fetched to tell whether another page exists, so no count query is needed.
+    """
+    id_col = col(model.id)  # type: ignore[attr-defined]
+    if page.order_by == "updated_at":
+        updated_at_col = col(model.updated_at)  # type: ignore[attr-defined]
+        if page.after:
+            updated_at, last_id = decode_cursor(cursor=page.after, order_by=page.order_by)
+            statement = statement.where(tuple_(updated_at_col, id_col) > (updated_at, last_id))
+        statement = statement.order_by(updated_at_col, id_col)
+    else:
+        if page.after:
+            (last_id,) = decode_cursor(cursor=page.after, order_by=page.order_by)
+            statement = statement.where(id_col > last_id)
+        statement = statement.order_by(id_col)
+
+    rows = (await session.exec(statement.limit(page.limit + 1))).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    return rows, encode_cursor(order_by=page.order_by, row=rows[-1])
@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.models import (
+    DailyTextRead,
+    DailyTextsPage,
+    KabbalahRead,
+    KabbalotPage,
+    MiddahBundle,
+    MiddahRead,
+    ReminderPhraseRead,
+    ReminderPhrasesPage,
+    UserPublic,
+    UsersPublic,
+    WeeklyTextRead,
+    WeeklyTextsPage,
+)
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by pydantic-core instead of json.dumps, the default response
+    class of the app.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+# Built once at import, building a TypeAdapter compiles its validator and serializer
+adapters: dict[Any, TypeAdapter[Any]] = {
+    response_type: TypeAdapter(response_type)
+    for response_type in (
+        MiddahRead,
+        list[MiddahRead],
+        MiddahBundle,
+        ReminderPhraseRead,
+        ReminderPhrasesPage,
+        DailyTextRead,
+        DailyTextsPage,
+        KabbalahRead,
+        KabbalotPage,
+        WeeklyTextRead,
+        WeeklyTextsPage,
+        UserPublic,
+        UsersPublic,
+    )
+}
+
+
+def get_adapter(response_type: Any) -> TypeAdapter[Any]:
+    adapter = adapters.get(response_type)
+    if adapter is None:
+        adapter = adapters[response_type] = TypeAdapter(response_type)
+    return adapter
+
+
+def model_response(
+    response_type: Any, content: Any, *, headers: Mapping[str, str] | None = None
+) -> Response:
+    """
+    Validate ``content``, ORM rows included, against ``response_type`` and encode it
+    straight to JSON bytes.
+
+    For a returned value FastAPI validates it against the route's response_model, dumps it
+    to Python objects and then encodes those. A returned Response skips all of it, so the
+    value is validated and encoded exactly once here. Keep response_model on the route for
+    the OpenAPI schema.
+    """
+    adapter = get_adapter(response_type)
+    value = adapter.validate_python(content, from_attributes=True)
+    return Response(adapter.dump_json(value), headers=headers, media_type="application/json")
@@ -1,17 +1,32 @@
 import logging
-from datetime import datetime, timezone
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import select
-
-from app.api.deps import CurrentUser, SessionDep
+from sqlmodel import col, select
+
+from app import crud
+from app.api.bulk import lock_existing_middot, upsert_by_sefaria_url
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CachedCurrentUser,
+    ReadEngineDep,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import PageParamsDep, paginate
+from app.api.responses import model_response
+from app.core.config import settings
 from app.models import (
+    BulkUpsertResult,
     DailyText,
     DailyTextCreate,
     DailyTextPatch,
     DailyTextRead,
+    DailyTextsPage,
+    DailyTextUpsert,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,16 +34,48 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/daily_texts", tags=["daily_texts"])
 
 
-@router.get("/", response_model=list[DailyTextRead])
-def list_daily_texts(session: SessionDep, current_user: CurrentUser) -> Any:
-    logger.info(f"Listing all daily texts user_id={current_user.id}")
-    statement = select(DailyText)
-    return session.exec(statement).all()
+@router.get("/", response_model=DailyTextsPage)
+async def list_daily_texts(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    page: PageParamsDep,
+    middah: str | None = None,
+) -> Any:
+    logger.info(
+        f"Listing daily texts user_id={current_user.id} {middah=} after={page.after} limit={page.limit}"
+    )
+    filters = [] if middah is None else [col(DailyText.middah) == middah]
+    validators = await list_validators(
+        session=session, request=request, model=DailyText, filters=filters
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    statement = select(DailyText).where(*filters)
+    rows, next_cursor = await paginate(
+        session=session, statement=statement, model=DailyText, page=page
+    )
+    return model_response(
+        DailyTextsPage, {"data": rows, "next_cursor": next_cursor}, headers=validators.headers()
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_daily_texts(
+    read_engine: ReadEngineDep, current_user: CachedCurrentUser, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream all daily texts as NDJSON or CSV.
+    """
+    logger.info(f"Exporting daily texts user_id={current_user.id} {format=}")
+    return export_response(
+        engine=read_engine, model=DailyText, read_model=DailyTextRead, format=format
+    )
 
 
 @router.post("/", response_model=DailyTextRead)
-def create_daily_text(
-    *, session: SessionDep, current_user: CurrentUser, daily_text_in: DailyTextCreate
+async def create_daily_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, daily_text_in: DailyTextCreate
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(f"Non-superuser attempted to create daily text user_id={current_user.id}")
@@ -36,20 +83,13 @@ def create_daily_text(
 
     payload = daily_text_in.model_dump()
     logger.info(f"Creating daily text user_id={current_user.id} {payload=}")
-    daily_text = DailyText.model_validate(
-        daily_text_in,
-        update={
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-        },
-    )
-    session.add(daily_text)
     try:
-        session.commit()
-        session.refresh(daily_text)
+        daily_text = await crud.create_content(
+            session=session, model=DailyText, content_in=daily_text_in
+        )
         logger.info(f"Successfully created daily text daily_text_id={daily_text.id}")
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError creating daily text {error_info}")
         if "foreign key constraint" in error_info.lower():
@@ -58,19 +98,63 @@ def create_daily_text(
     return daily_text
 
 
+@router.put("/bulk", response_model=BulkUpsertResult)
+async def bulk_upsert_daily_texts(
+    *,
+    session: AsyncSessionDep,
+    current_user: CachedCurrentUser,
+    daily_texts_in: Annotated[
+        list[DailyTextUpsert], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+) -> Any:
+    """
+    Insert or update many daily texts by sefaria_url with a single INSERT ... ON CONFLICT.
+
+    Texts identical to the stored ones are reported as unchanged and keep their updated_at.
+    """
+    if not current_user.is_superuser:
+        logger.warning(
+            f"Non-superuser attempted to bulk upsert daily texts user_id={current_user.id}"
+        )
+        raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+
+    logger.info(f"Bulk upserting daily texts user_id={current_user.id} count={len(daily_texts_in)}")
+    valid_middot = await lock_existing_middot(session, (t.middah for t in daily_texts_in))
+    invalid_indexes = {
+        index for index, t in enumerate(daily_texts_in) if t.middah not in valid_middot
+    }
+    result = await upsert_by_sefaria_url(
+        session=session, model=DailyText, items=daily_texts_in, invalid_indexes=invalid_indexes
+    )
+    await session.commit()
+    logger.info(
+        f"Bulk upserted daily texts user_id={current_user.id} inserted={result.inserted} "
+        f"updated={result.updated} unchanged={result.unchanged}"
+    )
+    return result
+
+
 @router.get("/{id}", response_model=DailyTextRead)
-def get_daily_text(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def get_daily_text(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    id: int,
+) -> Any:
     logger.info(f"Fetching daily text user_id={current_user.id} daily_text_id={id}")
-    daily_text = session.get(DailyText, id)
+    daily_text = await session.get(DailyText, id)
     if not daily_text:
         logger.warning(f"Daily text not found user_id={current_user.id} daily_text_id={id}")
         raise HTTPException(status_code=404, detail="Daily text not found")
-    return daily_text
+    validators = Validators.for_row(daily_text)
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(DailyTextRead, daily_text, headers=validators.headers())
 
 
 @router.patch("/{id}", response_model=DailyTextRead)
-def patch_daily_text(
-    *, session: SessionDep, current_user: CurrentUser, id: int, patch: DailyTextPatch
+async def patch_daily_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int, patch: DailyTextPatch
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(
@@ -78,45 +162,37 @@ def patch_daily_text(
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    daily_text = session.get(DailyText, id)
-    if not daily_text:
-        logger.warning(f"Daily text not found for patch daily_text_id={id}")
-        raise HTTPException(status_code=404, detail="Daily text not found")
-
     update_dict = patch.model_dump(exclude_unset=True)
     logger.info(f"Patching daily text user_id={current_user.id} daily_text_id={id} {update_dict}")
-    for k, v in update_dict.items():
-        setattr(daily_text, k, v)
-    daily_text.updated_at = datetime.now(timezone.utc)
     try:
-        session.commit()
-        session.refresh(daily_text)
-        logger.info(f"Successfully patched daily text daily_text_id={id}")
+        daily_text = await crud.patch_content(session=session, model=DailyText, id=id, patch=patch)
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError patching daily text daily_text_id={id} {error_info}")
         if "foreign key constraint" in error_info.lower():
             raise HTTPException(status_code=400, detail="Invalid middah specified")
         raise HTTPException(status_code=400, detail="Database constraint violation")
+    if not daily_text:
+        logger.warning(f"Daily text not found for patch daily_text_id={id}")
+        raise HTTPException(status_code=404, detail="Daily text not found")
+    logger.info(f"Successfully patched daily text daily_text_id={id}")
     return daily_text
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_daily_text(*, session: SessionDep, current_user: CurrentUser, id: int) -> Response:
+async def delete_daily_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int
+) -> Response:
     if not current_user.is_superuser:
         logger.warning(
             f"Non-superuser attempted to delete daily text user_id={current_user.id} daily_text_id={id}"
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    daily_text = session.get(DailyText, id)
-    if not daily_text:
+    logger.info(f"Deleting daily text user_id={current_user.id} daily_text_id={id}")
+    if not await crud.delete_content(session=session, model=DailyText, id=id):
         logger.warning(f"Daily text not found for deletion daily_text_id={id}")
         raise HTTPException(status_code=404, detail="Daily text not found")
-
-    logger.info(f"Deleting daily text user_id={current_user.id} daily_text_id={id}")
-    session.delete(daily_text)
-    session.commit()
     logger.info(f"Successfully deleted daily text daily_text_id={id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
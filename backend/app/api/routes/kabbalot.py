@@ -1,17 +1,28 @@
 import logging
-from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import select
-
-from app.api.deps import CurrentUser, SessionDep
+from sqlmodel import col, select
+
+from app import crud
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CachedCurrentUser,
+    ReadEngineDep,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import PageParamsDep, paginate
+from app.api.responses import model_response
 from app.models import (
     Kabbalah,
     KabbalahCreate,
     KabbalahPatch,
     KabbalahRead,
+    KabbalotPage,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,16 +30,48 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/kabbalot", tags=["kabbalot"])
 
 
-@router.get("/", response_model=list[KabbalahRead])
-def list_kabbalot(session: SessionDep, current_user: CurrentUser) -> Any:
-    logger.info(f"Listing all kabbalot user_id={current_user.id}")
-    statement = select(Kabbalah)
-    return session.exec(statement).all()
+@router.get("/", response_model=KabbalotPage)
+async def list_kabbalot(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    page: PageParamsDep,
+    middah: str | None = None,
+) -> Any:
+    logger.info(
+        f"Listing kabbalot user_id={current_user.id} {middah=} after={page.after} limit={page.limit}"
+    )
+    filters = [] if middah is None else [col(Kabbalah.middah) == middah]
+    validators = await list_validators(
+        session=session, request=request, model=Kabbalah, filters=filters
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    statement = select(Kabbalah).where(*filters)
+    rows, next_cursor = await paginate(
+        session=session, statement=statement, model=Kabbalah, page=page
+    )
+    return model_response(
+        KabbalotPage, {"data": rows, "next_cursor": next_cursor}, headers=validators.headers()
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_kabbalot(
+    read_engine: ReadEngineDep, current_user: CachedCurrentUser, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream all kabbalot as NDJSON or CSV.
+    """
+    logger.info(f"Exporting kabbalot user_id={current_user.id} {format=}")
+    return export_response(
+        engine=read_engine, model=Kabbalah, read_model=KabbalahRead, format=format
+    )
 
 
 @router.post("/", response_model=KabbalahRead)
-def create_kabbalah(
-    *, session: SessionDep, current_user: CurrentUser, kabbalah_in: KabbalahCreate
+async def create_kabbalah(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, kabbalah_in: KabbalahCreate
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(f"Non-superuser attempted to create kabbalah user_id={current_user.id}")
@@ -36,20 +79,13 @@ def create_kabbalah(
 
     payload = kabbalah_in.model_dump()
     logger.info(f"Creating kabbalah user_id={current_user.id} {payload=}")
-    kabbalah = Kabbalah.model_validate(
-        kabbalah_in,
-        update={
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-        },
-    )
-    session.add(kabbalah)
     try:
-        session.commit()
-        session.refresh(kabbalah)
+        kabbalah = await crud.create_content(
+            session=session, model=Kabbalah, content_in=kabbalah_in
+        )
         logger.info(f"Successfully created kabbalah kabbalah_id={kabbalah.id}")
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError creating kabbalah {error_info}")
         if "kabbalot_middah_description_uq" in error_info:
@@ -64,18 +100,26 @@ def create_kabbalah(
 
 
 @router.get("/{id}", response_model=KabbalahRead)
-def get_kabbalah(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def get_kabbalah(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    id: int,
+) -> Any:
     logger.info(f"Fetching kabbalah user_id={current_user.id} kabbalah_id={id}")
-    kabbalah = session.get(Kabbalah, id)
+    kabbalah = await session.get(Kabbalah, id)
     if not kabbalah:
         logger.warning(f"Kabbalah not found user_id={current_user.id} kabbalah_id={id}")
         raise HTTPException(status_code=404, detail="Kabbalah not found")
-    return kabbalah
+    validators = Validators.for_row(kabbalah)
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(KabbalahRead, kabbalah, headers=validators.headers())
 
 
 @router.patch("/{id}", response_model=KabbalahRead)
-def patch_kabbalah(
-    *, session: SessionDep, current_user: CurrentUser, id: int, patch: KabbalahPatch
+async def patch_kabbalah(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int, patch: KabbalahPatch
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(
@@ -83,22 +127,12 @@ def patch_kabbalah(
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    kabbalah = session.get(Kabbalah, id)
-    if not kabbalah:
-        logger.warning(f"Kabbalah not found for patch kabbalah_id={id}")
-        raise HTTPException(status_code=404, detail="Kabbalah not found")
-
     update_dict = patch.model_dump(exclude_unset=True)
     logger.info(f"Patching kabbalah user_id={current_user.id} kabbalah_id={id} {update_dict}")
-    for k, v in update_dict.items():
-        setattr(kabbalah, k, v)
-    kabbalah.updated_at = datetime.now(timezone.utc)
     try:
-        session.commit()
-        session.refresh(kabbalah)
-        logger.info(f"Successfully patched kabbalah kabbalah_id={id}")
+        kabbalah = await crud.patch_content(session=session, model=Kabbalah, id=id, patch=patch)
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError patching kabbalah kabbalah_id={id} {error_info}")
         if "kabbalot_middah_description_uq" in error_info:
@@ -109,24 +143,26 @@ def patch_kabbalah(
         elif "foreign key constraint" in error_info.lower():
             raise HTTPException(status_code=400, detail="Invalid middah specified")
         raise HTTPException(status_code=400, detail="Database constraint violation")
+    if not kabbalah:
+        logger.warning(f"Kabbalah not found for patch kabbalah_id={id}")
+        raise HTTPException(status_code=404, detail="Kabbalah not found")
+    logger.info(f"Successfully patched kabbalah kabbalah_id={id}")
     return kabbalah
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_kabbalah(*, session: SessionDep, current_user: CurrentUser, id: int) -> Response:
+async def delete_kabbalah(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int
+) -> Response:
     if not current_user.is_superuser:
         logger.warning(
             f"Non-superuser attempted to delete kabbalah user_id={current_user.id} kabbalah_id={id}"
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    kabbalah = session.get(Kabbalah, id)
-    if not kabbalah:
+    logger.info(f"Deleting kabbalah user_id={current_user.id} kabbalah_id={id}")
+    if not await crud.delete_content(session=session, model=Kabbalah, id=id):
         logger.warning(f"Kabbalah not found for deletion kabbalah_id={id}")
         raise HTTPException(status_code=404, detail="Kabbalah not found")
-
-    logger.info(f"Deleting kabbalah user_id={current_user.id} kabbalah_id={id}")
-    session.delete(kabbalah)
-    session.commit()
     logger.info(f"Successfully deleted kabbalah kabbalah_id={id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,24 @@
-from datetime import timedelta
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.deps import (
+    AsyncSessionDep,
+    CurrentUser,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.api.throttle import throttle
 from app.core import security
-from app.core.config import settings
-from app.core.security import get_password_hash
-from app.models import Message, NewPassword, Token, UserPublic
+from app.core.cache import user_cache
+from app.core.security import get_password_hash_async
+from app.models import Message, NewPassword, RefreshTokenRequest, Token, UserPublic
 from app.utils import (
     generate_password_reset_token,
     generate_reset_password_email,
-    send_email,
     verify_password_reset_token,
 )
 
@@ -22,21 +26,47 @@ router = APIRouter(tags=["login"])
 
 
 @router.post("/login/access-token")
-def login_access_token(
-    session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+async def login_access_token(
+    request: Request,
+    session: AsyncSessionDep,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = crud.authenticate(session=session, email=form_data.username, password=form_data.password)
+    await throttle(request, "login", form_data.username)
+    user = await crud.authenticate_async(
+        session=session, email=form_data.username, password=form_data.password
+    )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return Token(
-        access_token=security.create_access_token(user.id, expires_delta=access_token_expires)
-    )
+    refresh_token = await crud.issue_refresh_token(session=session, user=user)
+    await session.commit()
+    return Token(access_token=security.create_user_access_token(user), refresh_token=refresh_token)
+
+
+@router.post("/login/refresh-token")
+async def refresh_access_token(session: AsyncSessionDep, body: RefreshTokenRequest) -> Token:
+    """
+    Exchange a refresh token for a new access token and refresh token, each refresh token
+    can only be used once
+    """
+    rotated = await crud.rotate_refresh_token(session=session, refresh_token=body.refresh_token)
+    if rotated is None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    user, refresh_token = rotated
+    return Token(access_token=security.create_user_access_token(user), refresh_token=refresh_token)
+
+
+@router.post("/login/revoke-tokens")
+async def revoke_tokens(session: AsyncSessionDep, current_user: CurrentUser) -> Message:
+    """
+    Sign out everywhere, revoking every access and refresh token of the current user
+    """
+    await crud.revoke_user_tokens(session=session, user=current_user)
+    return Message(message="Tokens revoked")
 
 
 @router.post("/login/test-token", response_model=UserPublic)
@@ -48,38 +78,38 @@ def test_token(current_user: CurrentUser) -> Any:
 
 
 @router.post("/password-recovery/{email}")
-def recover_password(email: str, session: SessionDep) -> Message:
+async def recover_password(request: Request, email: str, session: AsyncSessionDep) -> Message:
     """
     Password Recovery
     """
-    user = crud.get_user_by_email(session=session, email=email)
+    await throttle(request, "password-recovery", email)
+    user = await crud.get_user_by_email_async(session=session, email=email)
 
     if not user:
         raise HTTPException(
             status_code=404,
             detail="The user with this email does not exist in the system.",
         )
-    password_reset_token = generate_password_reset_token(email=email)
-    email_data = generate_reset_password_email(
-        email_to=user.email, email=email, token=password_reset_token
-    )
-    send_email(
+    # The reset token is generated when the email is sent, it is not stored
+    await crud.enqueue_email(
+        session=session,
         email_to=user.email,
-        subject=email_data.subject,
-        html_content=email_data.html_content,
+        email_type="reset_password",
+        context={"email": email},
     )
+    await session.commit()
     return Message(message="Password recovery email sent")
 
 
 @router.post("/reset-password/")
-def reset_password(session: SessionDep, body: NewPassword) -> Message:
+async def reset_password(session: AsyncSessionDep, body: NewPassword) -> Message:
     """
     Reset password
     """
     email = verify_password_reset_token(token=body.token)
     if not email:
         raise HTTPException(status_code=400, detail="Invalid token")
-    user = crud.get_user_by_email(session=session, email=email)
+    user = await crud.get_user_by_email_async(session=session, email=email)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -87,10 +117,12 @@ def reset_password(session: SessionDep, body: NewPassword) -> Message:
         )
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    hashed_password = get_password_hash(password=body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
     user.hashed_password = hashed_password
+    user.token_epoch += 1
     session.add(user)
-    session.commit()
+    await session.commit()
+    user_cache.pop(user.id)
     return Message(message="Password updated successfully")
 
 
@@ -1,46 +1,192 @@
 import logging
-from typing import Any
+from types import SimpleNamespace
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from sqlalchemy import CompoundSelect, func, literal, union_all
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import select
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Middah, MiddahCreate, MiddahRead
+from app import crud
+from app.api.conditional import Validators, make_etag
+from app.api.deps import AsyncReadSessionDep, AsyncSessionDep, CachedCurrentUser
+from app.api.pagination import encode_cursor
+from app.api.responses import model_response
+from app.core.cache import MIDDOT_CACHE_KEY, middot_cache
+from app.core.config import settings
+from app.models import (
+    DailyText,
+    Kabbalah,
+    Middah,
+    MiddahBundle,
+    MiddahCreate,
+    MiddahRead,
+    ReminderPhrase,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/middot", tags=["middot"])
 
 
+async def load_middot(session: AsyncSession) -> dict[str, MiddahRead]:
+    statement = select(Middah)
+    middot = {
+        middah.name_transliterated: MiddahRead.model_validate(middah)
+        for middah in (await session.exec(statement)).all()
+    }
+    middot_cache.set(MIDDOT_CACHE_KEY, middot)
+    return middot
+
+
+async def get_cached_middot(session: AsyncSession) -> dict[str, MiddahRead]:
+    middot = middot_cache.get(MIDDOT_CACHE_KEY)
+    if middot is None:
+        middot = await load_middot(session)
+    return middot
+
+
+def update_cached_middah(name_transliterated: str, middah: MiddahRead | None) -> None:
+    """
+    Apply a write to the cached middot in place, None for a deletion, instead of reloading
+    the table. Readers may hold the cached dict, so it is copied.
+    """
+    middot = middot_cache.get(MIDDOT_CACHE_KEY)
+    if middot is None:
+        return
+    middot = dict(middot)
+    if middah is None:
+        middot.pop(name_transliterated, None)
+    else:
+        middot[name_transliterated] = middah
+    middot_cache.set(MIDDOT_CACHE_KEY, middot)
+
+
 @router.get("/", response_model=list[MiddahRead])
-def list_middot(session: SessionDep, current_user: CurrentUser) -> Any:
+async def list_middot(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+) -> Any:
     """
     Retrieve middot.
     """
     logger.info(f"Listing all middot user_id={current_user.id}")
-    statement = select(Middah)
-    return session.exec(statement).all()
+    middot = list((await get_cached_middot(session)).values())
+    # Middot have no timestamps, the ETag is derived from the content itself
+    validators = Validators(etag=make_etag(*middot))
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(list[MiddahRead], middot, headers=validators.headers())
 
 
 @router.get("/{name_transliterated}", response_model=MiddahRead)
-def get_middah(session: SessionDep, current_user: CurrentUser, name_transliterated: str) -> Any:
+async def get_middah(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    name_transliterated: str,
+) -> Any:
     """
     Get middah by name_transliterated.
     """
     logger.info(f"Fetching middah user_id={current_user.id} middah_name={name_transliterated}")
-    middah = session.get(Middah, name_transliterated)
+    middah = (await get_cached_middot(session)).get(name_transliterated)
     if not middah:
         logger.warning(
             f"Middah not found user_id={current_user.id} middah_name={name_transliterated}"
         )
         raise HTTPException(status_code=404, detail="Middah not found")
-    return middah
+    validators = Validators(etag=make_etag(middah))
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(MiddahRead, middah, headers=validators.headers())
+
+
+SectionLimit = Annotated[int, Query(ge=1, le=settings.PAGINATION_MAX_LIMIT)]
+
+BUNDLE_SECTIONS: dict[str, type[ReminderPhrase | DailyText | Kabbalah]] = {
+    "reminder_phrases": ReminderPhrase,
+    "daily_texts": DailyText,
+    "kabbalot": Kabbalah,
+}
+
+
+def bundle_statement(name_transliterated: str, limits: dict[str, int]) -> CompoundSelect:
+    """
+    Select the first ``limit + 1`` rows of each bundle section of a middah, by id, in one
+    UNION ALL. The tables differ, so each row comes back as JSON next to its section name.
+    """
+    branches = []
+    for key, model in BUNDLE_SECTIONS.items():
+        page = (
+            select(model)
+            .where(col(model.middah) == name_transliterated)
+            .order_by(col(model.id))
+            .limit(limits[key] + 1)
+            .subquery()
+        )
+        row = func.to_jsonb(page.table_valued()).label("row")
+        branches.append(select(literal(key).label("section"), page.c.id, row))
+    statement = union_all(*branches)
+    return statement.order_by(statement.selected_columns.id)
+
+
+@router.get("/{name_transliterated}/bundle", response_model=MiddahBundle)
+async def get_middah_bundle(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    name_transliterated: str,
+    reminder_phrases_limit: SectionLimit = settings.PAGINATION_DEFAULT_LIMIT,
+    daily_texts_limit: SectionLimit = settings.PAGINATION_DEFAULT_LIMIT,
+    kabbalot_limit: SectionLimit = settings.PAGINATION_DEFAULT_LIMIT,
+) -> Any:
+    """
+    Get a middah with its reminder phrases, daily texts and kabbalot in one request.
+
+    Each section is capped by its own limit. A section's next_cursor can be passed as
+    ``after`` to the matching list endpoint, filtered by the same middah, to read the rest.
+    """
+    logger.info(
+        f"Fetching middah bundle user_id={current_user.id} middah_name={name_transliterated}"
+    )
+    middah = (await get_cached_middot(session)).get(name_transliterated)
+    if not middah:
+        logger.warning(
+            f"Middah not found user_id={current_user.id} middah_name={name_transliterated}"
+        )
+        raise HTTPException(status_code=404, detail="Middah not found")
+
+    limits = {
+        "reminder_phrases": reminder_phrases_limit,
+        "daily_texts": daily_texts_limit,
+        "kabbalot": kabbalot_limit,
+    }
+    statement = bundle_statement(name_transliterated, limits)
+    rows: dict[str, list[dict[str, Any]]] = {key: [] for key in limits}
+    for section, _, row in (await session.exec(statement)).all():  # type: ignore[call-overload]
+        rows[section].append(row)
+    # Each section fetched one extra row to tell whether another page exists
+    sections: dict[str, Any] = {}
+    for key, limit in limits.items():
+        data = rows[key][:limit]
+        next_cursor = None
+        if len(rows[key]) > limit:
+            next_cursor = encode_cursor(order_by="id", row=SimpleNamespace(**data[-1]))
+        sections[key] = {"data": data, "next_cursor": next_cursor}
+    bundle = MiddahBundle.model_validate({"middah": middah, **sections})
+
+    validators = Validators(etag=make_etag(bundle))
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(MiddahBundle, bundle, headers=validators.headers())
 
 
 @router.post("/", response_model=MiddahRead)
-def create_middah(
-    *, session: SessionDep, current_user: CurrentUser, middah_in: MiddahCreate
+async def create_middah(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, middah_in: MiddahCreate
 ) -> Any:
     # Require superuser to create
     if not current_user.is_superuser:
@@ -49,38 +195,41 @@ def create_middah(
 
     payload = middah_in.model_dump()
     logger.info(f"Creating middah user_id={current_user.id} {payload=}")
-    middah = Middah.model_validate(middah_in)
-    session.add(middah)
     try:
-        session.commit()
-        session.refresh(middah)
+        middah = await crud.create_content(session=session, model=Middah, content_in=middah_in)
         logger.info(f"Successfully created middah middah_name={middah.name_transliterated}")
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError creating middah {error_info}")
         if "primary key" in error_info.lower() or "unique" in error_info.lower():
             raise HTTPException(status_code=400, detail="Middah already exists")
         raise HTTPException(status_code=400, detail="Database constraint violation")
+    update_cached_middah(middah.name_transliterated, MiddahRead.model_validate(middah))
     return middah
 
 
 @router.delete("/{name_transliterated}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_middah(
-    *, session: SessionDep, current_user: CurrentUser, name_transliterated: str
+async def delete_middah(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, name_transliterated: str
 ) -> Response:
     if not current_user.is_superuser:
         logger.warning(
             f"Non-superuser attempted to delete middah user_id={current_user.id} middah_name={name_transliterated}"
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
-    middah = session.get(Middah, name_transliterated)
-    if not middah:
-        logger.warning(f"Middah not found for deletion middah_name={name_transliterated}")
-        raise HTTPException(status_code=404, detail="Middah not found")
 
     logger.info(f"Deleting middah user_id={current_user.id} middah_name={name_transliterated}")
-    session.delete(middah)
-    session.commit()
+    statement = (
+        delete(Middah)
+        .where(col(Middah.name_transliterated) == name_transliterated)
+        .returning(col(Middah.name_transliterated))
+    )
+    deleted = (await session.exec(statement)).scalar_one_or_none()  # type: ignore
+    await session.commit()
+    if deleted is None:
+        logger.warning(f"Middah not found for deletion middah_name={name_transliterated}")
+        raise HTTPException(status_code=404, detail="Middah not found")
+    update_cached_middah(name_transliterated, None)
     logger.info(f"Successfully deleted middah middah_name={name_transliterated}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,17 +1,35 @@
 import logging
-from datetime import datetime, timezone
-from typing import Any
+from collections import Counter
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import select
-
-from app.api.deps import CurrentUser, SessionDep
+from sqlmodel import col, select
+
+from app import crud
+from app.api.bulk import lock_existing_middot
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CachedCurrentUser,
+    ReadEngineDep,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import PageParamsDep, paginate
+from app.api.responses import model_response
+from app.core.config import settings
+from app.crud import utc_now
 from app.models import (
+    BulkItemResult,
     ReminderPhrase,
     ReminderPhraseCreate,
     ReminderPhrasePatch,
     ReminderPhraseRead,
+    ReminderPhrasesBulkResult,
+    ReminderPhrasesPage,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,18 +37,52 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reminder_phrases", tags=["reminder_phrases"])
 
 
-@router.get("/", response_model=list[ReminderPhraseRead])
-def list_reminder_phrases(session: SessionDep, current_user: CurrentUser) -> Any:
-    logger.info(f"Listing all reminder phrases user_id={current_user.id}")
-    statement = select(ReminderPhrase)
-    return session.exec(statement).all()
+@router.get("/", response_model=ReminderPhrasesPage)
+async def list_reminder_phrases(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    page: PageParamsDep,
+    middah: str | None = None,
+) -> Any:
+    logger.info(
+        f"Listing reminder phrases user_id={current_user.id} {middah=} after={page.after} limit={page.limit}"
+    )
+    filters = [] if middah is None else [col(ReminderPhrase.middah) == middah]
+    validators = await list_validators(
+        session=session, request=request, model=ReminderPhrase, filters=filters
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    statement = select(ReminderPhrase).where(*filters)
+    rows, next_cursor = await paginate(
+        session=session, statement=statement, model=ReminderPhrase, page=page
+    )
+    return model_response(
+        ReminderPhrasesPage,
+        {"data": rows, "next_cursor": next_cursor},
+        headers=validators.headers(),
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_reminder_phrases(
+    read_engine: ReadEngineDep, current_user: CachedCurrentUser, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream all reminder phrases as NDJSON or CSV.
+    """
+    logger.info(f"Exporting reminder phrases user_id={current_user.id} {format=}")
+    return export_response(
+        engine=read_engine, model=ReminderPhrase, read_model=ReminderPhraseRead, format=format
+    )
 
 
 @router.post("/", response_model=ReminderPhraseRead)
-def create_reminder_phrase(
+async def create_reminder_phrase(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: CachedCurrentUser,
     reminder_phrase_in: ReminderPhraseCreate,
 ) -> Any:
     if not current_user.is_superuser:
@@ -41,20 +93,13 @@ def create_reminder_phrase(
 
     payload = reminder_phrase_in.model_dump()
     logger.info(f"Creating reminder phrase user_id={current_user.id} {payload=}")
-    reminder_phrase = ReminderPhrase.model_validate(
-        reminder_phrase_in,
-        update={
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-        },
-    )
-    session.add(reminder_phrase)
     try:
-        session.commit()
-        session.refresh(reminder_phrase)
+        reminder_phrase = await crud.create_content(
+            session=session, model=ReminderPhrase, content_in=reminder_phrase_in
+        )
         logger.info(f"Successfully created reminder phrase reminder_phrase_id={reminder_phrase.id}")
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError creating reminder phrase {error_info}")
         if "reminder_phrases_middah_text_uq" in error_info or "unique" in error_info.lower():
@@ -68,23 +113,92 @@ def create_reminder_phrase(
     return reminder_phrase
 
 
+@router.post("/bulk", response_model=ReminderPhrasesBulkResult)
+async def bulk_create_reminder_phrases(
+    *,
+    session: AsyncSessionDep,
+    current_user: CachedCurrentUser,
+    reminder_phrases_in: Annotated[
+        list[ReminderPhraseCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+) -> Any:
+    """
+    Create many reminder phrases with a single INSERT.
+
+    Phrases that already exist for their middah, or repeat an earlier item, are skipped and
+    phrases of an unknown middah are reported. Neither fails the request.
+    """
+    if not current_user.is_superuser:
+        logger.warning(
+            f"Non-superuser attempted to bulk create reminder phrases user_id={current_user.id}"
+        )
+        raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+
+    logger.info(
+        f"Bulk creating reminder phrases user_id={current_user.id} count={len(reminder_phrases_in)}"
+    )
+    valid_middot = await lock_existing_middot(session, (p.middah for p in reminder_phrases_in))
+    rows = [
+        {"middah": p.middah, "text": p.text, "created_at": utc_now(), "updated_at": utc_now()}
+        for p in reminder_phrases_in
+        if p.middah in valid_middot
+    ]
+    inserted_ids: dict[tuple[str, str], int] = {}
+    if rows:
+        statement = (
+            insert(ReminderPhrase)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="reminder_phrases_middah_text_uq")
+            .returning(col(ReminderPhrase.id), col(ReminderPhrase.middah), col(ReminderPhrase.text))
+        )
+        result = await session.exec(statement)  # type: ignore
+        inserted_ids = {(middah, text): id for id, middah, text in result.all()}
+    await session.commit()
+
+    items = []
+    for index, reminder_phrase_in in enumerate(reminder_phrases_in):
+        if reminder_phrase_in.middah not in valid_middot:
+            items.append(BulkItemResult(index=index, status="invalid_middah"))
+            continue
+        # Popped so that a repeated item is reported as skipped
+        id = inserted_ids.pop((reminder_phrase_in.middah, reminder_phrase_in.text), None)
+        item_status = "inserted" if id is not None else "skipped"
+        items.append(BulkItemResult(index=index, status=item_status, id=id))
+    counts = Counter(item.status for item in items)
+    logger.info(f"Bulk created reminder phrases user_id={current_user.id} {dict(counts)}")
+    return ReminderPhrasesBulkResult(
+        inserted=counts["inserted"],
+        skipped=counts["skipped"],
+        invalid_middah=counts["invalid_middah"],
+        items=items,
+    )
+
+
 @router.get("/{id}", response_model=ReminderPhraseRead)
-def get_reminder_phrase(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def get_reminder_phrase(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    id: int,
+) -> Any:
     logger.info(f"Fetching reminder phrase user_id={current_user.id} reminder_phrase_id={id}")
-    reminder_phrase = session.get(ReminderPhrase, id)
+    reminder_phrase = await session.get(ReminderPhrase, id)
     if not reminder_phrase:
         logger.warning(
             f"Reminder phrase not found user_id={current_user.id} reminder_phrase_id={id}"
         )
         raise HTTPException(status_code=404, detail="Reminder phrase not found")
-    return reminder_phrase
+    validators = Validators.for_row(reminder_phrase)
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(ReminderPhraseRead, reminder_phrase, headers=validators.headers())
 
 
 @router.patch("/{id}", response_model=ReminderPhraseRead)
-def patch_reminder_phrase(
+async def patch_reminder_phrase(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: CachedCurrentUser,
     id: int,
     patch: ReminderPhrasePatch,
 ) -> Any:
@@ -94,24 +208,16 @@ def patch_reminder_phrase(
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    reminder_phrase = session.get(ReminderPhrase, id)
-    if not reminder_phrase:
-        logger.warning(f"Reminder phrase not found for patch reminder_phrase_id={id}")
-        raise HTTPException(status_code=404, detail="Reminder phrase not found")
-
     update_dict = patch.model_dump(exclude_unset=True)
     logger.info(
         f"Patching reminder phrase user_id={current_user.id} reminder_phrase_id={id} {update_dict}"
     )
-    for k, v in update_dict.items():
-        setattr(reminder_phrase, k, v)
-    reminder_phrase.updated_at = datetime.now(timezone.utc)
     try:
-        session.commit()
-        session.refresh(reminder_phrase)
-        logger.info(f"Successfully patched reminder phrase reminder_phrase_id={id}")
+        reminder_phrase = await crud.patch_content(
+            session=session, model=ReminderPhrase, id=id, patch=patch
+        )
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(
             f"IntegrityError patching reminder phrase reminder_phrase_id={id} {error_info}"
@@ -124,24 +230,26 @@ def patch_reminder_phrase(
         elif "foreign key constraint" in error_info.lower():
             raise HTTPException(status_code=400, detail="Invalid middah specified")
         raise HTTPException(status_code=400, detail="Database constraint violation")
+    if not reminder_phrase:
+        logger.warning(f"Reminder phrase not found for patch reminder_phrase_id={id}")
+        raise HTTPException(status_code=404, detail="Reminder phrase not found")
+    logger.info(f"Successfully patched reminder phrase reminder_phrase_id={id}")
     return reminder_phrase
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_reminder_phrase(*, session: SessionDep, current_user: CurrentUser, id: int) -> Response:
+async def delete_reminder_phrase(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int
+) -> Response:
     if not current_user.is_superuser:
         logger.warning(
             f"Non-superuser attempted to delete reminder phrase user_id={current_user.id} reminder_phrase_id={id}"
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    reminder_phrase = session.get(ReminderPhrase, id)
-    if not reminder_phrase:
+    logger.info(f"Deleting reminder phrase user_id={current_user.id} reminder_phrase_id={id}")
+    if not await crud.delete_content(session=session, model=ReminderPhrase, id=id):
         logger.warning(f"Reminder phrase not found for deletion reminder_phrase_id={id}")
         raise HTTPException(status_code=404, detail="Reminder phrase not found")
-
-    logger.info(f"Deleting reminder phrase user_id={current_user.id} reminder_phrase_id={id}")
-    session.delete(reminder_phrase)
-    session.commit()
     logger.info(f"Successfully deleted reminder phrase reminder_phrase_id={id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
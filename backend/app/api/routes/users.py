@@ -1,20 +1,38 @@
+import logging
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
 from app.api.deps import (
+    AsyncSessionDep,
     CurrentUser,
-    SessionDep,
     get_current_active_superuser,
 )
+from app.api.responses import model_response
+from app.api.throttle import throttle
+from app.core.cache import user_cache
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.db import async_engine
+from app.core.security import (
+    create_user_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.models import (
-    Item,
     Message,
+    Token,
     UpdatePassword,
     User,
     UserCreate,
@@ -24,95 +42,140 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
 )
-from app.utils import generate_new_account_email, send_email
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+async def purge_user_in_background(user_id: uuid.UUID) -> None:
+    # Runs after the response is sent, the request's session is closed by then
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        try:
+            deleted = await crud.purge_user(
+                session=session, user_id=user_id, batch_size=settings.USER_PURGE_BATCH_SIZE
+            )
+        except Exception:
+            logger.exception(f"Purging user failed user_id={user_id}")
+            return
+    logger.info(f"Purged user user_id={user_id} items={deleted}")
+
+
+async def remove_user(
+    *,
+    session: AsyncSession,
+    user: User,
+    background: bool,
+    background_tasks: BackgroundTasks,
+    response: Response,
+) -> Message:
+    if not background:
+        # The items go with it, deleted by the database through ON DELETE CASCADE
+        await session.delete(user)
+        await session.commit()
+        user_cache.pop(user.id)
+        return Message(message="User deleted successfully")
+
+    # Deactivated right away, so the account cannot be used while it is purged
+    user.is_active = False
+    session.add(user)
+    await session.commit()
+    user_cache.pop(user.id)
+    background_tasks.add_task(purge_user_in_background, user.id)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return Message(message="User deletion scheduled")
+
+
 @router.get(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_users(session: AsyncSessionDep, skip: int = 0, limit: int = 100) -> Any:
     """
     Retrieve users.
     """
 
     count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    count = (await session.exec(count_statement)).one()
 
     statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    users = (await session.exec(statement)).all()
 
-    return UsersPublic(data=users, count=count)
+    return model_response(UsersPublic, {"data": users, "count": count})
 
 
 @router.post("/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic)
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: AsyncSessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await crud.get_user_by_email_async(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
-        email_data = generate_new_account_email(
-            email_to=user_in.email, username=user_in.email, password=user_in.password
-        )
-        send_email(
+        # Committed with the user, the email is only sent if the user is created. It does
+        # not carry the password, which would be stored in the outbox until then
+        await crud.enqueue_email(
+            session=session,
             email_to=user_in.email,
-            subject=email_data.subject,
-            html_content=email_data.html_content,
+            email_type="new_account",
+            context={"username": user_in.email},
         )
+    user = await crud.create_user_async(session=session, user_create=user_in)
     return user
 
 
 @router.patch("/me", response_model=UserPublic)
-def update_user_me(*, session: SessionDep, user_in: UserUpdateMe, current_user: CurrentUser) -> Any:
+async def update_user_me(
+    *, session: AsyncSessionDep, user_in: UserUpdateMe, current_user: CurrentUser
+) -> Any:
     """
     Update own user.
     """
 
     if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
+        existing_user = await crud.get_user_by_email_async(session=session, email=user_in.email)
         if existing_user and existing_user.id != current_user.id:
             raise HTTPException(status_code=409, detail="User with this email already exists")
     user_data = user_in.model_dump(exclude_unset=True)
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await session.commit()
+    user_cache.pop(current_user.id)
     return current_user
 
 
-@router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
+@router.patch("/me/password", response_model=Token)
+async def update_password_me(
+    *, session: AsyncSessionDep, body: UpdatePassword, current_user: CurrentUser
 ) -> Any:
     """
-    Update own password.
+    Update own password. Every other session is signed out, this one continues with
+    the returned tokens.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(body.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
     current_user.hashed_password = hashed_password
+    current_user.token_epoch += 1
     session.add(current_user)
-    session.commit()
-    return Message(message="Password updated successfully")
+    refresh_token = await crud.issue_refresh_token(session=session, user=current_user)
+    await session.commit()
+    user_cache.pop(current_user.id)
+    return Token(access_token=create_user_access_token(current_user), refresh_token=refresh_token)
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+async def read_user_me(current_user: CurrentUser) -> Any:
     """
     Get current user.
     """
@@ -120,41 +183,57 @@ def read_user_me(current_user: CurrentUser) -> Any:
 
 
 @router.delete("/me", response_model=Message)
-def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
+async def delete_user_me(
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    background: bool = False,
+) -> Any:
     """
     Delete own user.
+
+    With background=true the account is deactivated and a 202 is returned at once, its
+    items and then the user are deleted in batches afterwards.
     """
     if current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    return await remove_user(
+        session=session,
+        user=current_user,
+        background=background,
+        background_tasks=background_tasks,
+        response=response,
+    )
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(request: Request, session: AsyncSessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    await throttle(request, "signup", user_in.email)
+    user = await crud.get_user_by_email_async(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = crud.create_user(session=session, user_create=user_create)
+    user = await crud.create_user_async(session=session, user_create=user_create)
     return user
 
 
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user_by_id(user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Any:
+async def read_user_by_id(
+    user_id: uuid.UUID, session: AsyncSessionDep, current_user: CurrentUser
+) -> Any:
     """
     Get a specific user by id.
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if user == current_user:
         return user
     if not current_user.is_superuser:
@@ -170,9 +249,9 @@ def read_user_by_id(user_id: uuid.UUID, session: SessionDep, current_user: Curre
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UserPublic,
 )
-def update_user(
+async def update_user(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     user_id: uuid.UUID,
     user_in: UserUpdate,
 ) -> Any:
@@ -180,35 +259,47 @@ def update_user(
     Update a user.
     """
 
-    db_user = session.get(User, user_id)
+    db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
     if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
+        existing_user = await crud.get_user_by_email_async(session=session, email=user_in.email)
         if existing_user and existing_user.id != user_id:
             raise HTTPException(status_code=409, detail="User with this email already exists")
 
-    db_user = crud.update_user(session=session, db_user=db_user, user_in=user_in)
+    db_user = await crud.update_user_async(session=session, db_user=db_user, user_in=user_in)
     return db_user
 
 
 @router.delete("/{user_id}", dependencies=[Depends(get_current_active_superuser)])
-def delete_user(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID) -> Message:
+async def delete_user(
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    user_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    background: bool = False,
+) -> Message:
     """
     Delete a user.
+
+    With background=true the user is deactivated and a 202 is returned at once, its items
+    and then the user are deleted in batches afterwards.
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user == current_user:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
-    return Message(message="User deleted successfully")
+    return await remove_user(
+        session=session,
+        user=user,
+        background=background,
+        background_tasks=background_tasks,
+        response=response,
+    )
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
-from app.models import Message
-from app.utils import generate_test_email, send_email
+from app import crud
+from app.api.deps import AsyncSessionDep, get_current_active_superuser
+from app.core.cache import caches
+from app.core.db import get_pool_stats
+from app.core.security import password_hasher
+from app.models import CacheStats, DBPoolStats, Message, PasswordHashingStats
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -13,19 +16,54 @@ router = APIRouter(prefix="/utils", tags=["utils"])
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+async def test_email(session: AsyncSessionDep, email_to: EmailStr) -> Message:
     """
     Test emails.
     """
-    email_data = generate_test_email(email_to=email_to)
-    send_email(
-        email_to=email_to,
-        subject=email_data.subject,
-        html_content=email_data.html_content,
-    )
+    await crud.enqueue_email(session=session, email_to=email_to, email_type="test_email")
+    await session.commit()
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=dict[str, DBPoolStats],
+)
+def db_pool_stats() -> dict[str, DBPoolStats]:
+    """
+    Statistics of each connection pool of the worker process that served the request:
+    "primary" serves the async routes, "primary_sync" the sync ones, and "replica" the
+    reads sent to the replica when one is configured.
+    """
+    return get_pool_stats()
+
+
+@router.get(
+    "/cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=dict[str, CacheStats],
+)
+def cache_stats() -> dict[str, CacheStats]:
+    """
+    Hit and miss counters of the in-process caches of the worker that served the request.
+    """
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+@router.get(
+    "/password-hashing/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PasswordHashingStats,
+)
+def password_hashing_stats() -> PasswordHashingStats:
+    """
+    Queue depth and latency of the password hashing pool of the worker that served the
+    request.
+    """
+    return password_hasher.stats()
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
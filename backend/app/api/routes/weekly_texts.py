@@ -1,17 +1,32 @@
 import logging
-from datetime import datetime, timezone
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app import crud
+from app.api.bulk import upsert_by_sefaria_url
+from app.api.conditional import Validators, list_validators
+from app.api.deps import (
+    AsyncReadSessionDep,
+    AsyncSessionDep,
+    CachedCurrentUser,
+    ReadEngineDep,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.pagination import PageParamsDep, paginate
+from app.api.responses import model_response
+from app.core.config import settings
 from app.models import (
+    BulkUpsertResult,
     WeeklyText,
     WeeklyTextCreate,
     WeeklyTextPatch,
     WeeklyTextRead,
+    WeeklyTextsPage,
+    WeeklyTextUpsert,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,16 +34,46 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/weekly_texts", tags=["weekly_texts"])
 
 
-@router.get("/", response_model=list[WeeklyTextRead])
-def list_weekly_texts(session: SessionDep, current_user: CurrentUser) -> Any:
-    logger.info(f"Listing all weekly texts user_id={current_user.id}")
+@router.get("/", response_model=WeeklyTextsPage)
+async def list_weekly_texts(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    page: PageParamsDep,
+) -> Any:
+    logger.info(
+        f"Listing weekly texts user_id={current_user.id} after={page.after} limit={page.limit}"
+    )
+    validators = await list_validators(
+        session=session, request=request, model=WeeklyText, filters=[]
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
     statement = select(WeeklyText)
-    return session.exec(statement).all()
+    rows, next_cursor = await paginate(
+        session=session, statement=statement, model=WeeklyText, page=page
+    )
+    return model_response(
+        WeeklyTextsPage, {"data": rows, "next_cursor": next_cursor}, headers=validators.headers()
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_weekly_texts(
+    read_engine: ReadEngineDep, current_user: CachedCurrentUser, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream all weekly texts as NDJSON or CSV.
+    """
+    logger.info(f"Exporting weekly texts user_id={current_user.id} {format=}")
+    return export_response(
+        engine=read_engine, model=WeeklyText, read_model=WeeklyTextRead, format=format
+    )
 
 
 @router.post("/", response_model=WeeklyTextRead)
-def create_weekly_text(
-    *, session: SessionDep, current_user: CurrentUser, weekly_text_in: WeeklyTextCreate
+async def create_weekly_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, weekly_text_in: WeeklyTextCreate
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(f"Non-superuser attempted to create weekly text user_id={current_user.id}")
@@ -36,20 +81,13 @@ def create_weekly_text(
 
     payload = weekly_text_in.model_dump()
     logger.info(f"Creating weekly text user_id={current_user.id} {payload=}")
-    weekly_text = WeeklyText.model_validate(
-        weekly_text_in,
-        update={
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-        },
-    )
-    session.add(weekly_text)
     try:
-        session.commit()
-        session.refresh(weekly_text)
+        weekly_text = await crud.create_content(
+            session=session, model=WeeklyText, content_in=weekly_text_in
+        )
         logger.info(f"Successfully created weekly text weekly_text_id={weekly_text.id}")
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError creating weekly text {error_info}")
         if "foreign key constraint" in error_info.lower():
@@ -58,19 +96,59 @@ def create_weekly_text(
     return weekly_text
 
 
+@router.put("/bulk", response_model=BulkUpsertResult)
+async def bulk_upsert_weekly_texts(
+    *,
+    session: AsyncSessionDep,
+    current_user: CachedCurrentUser,
+    weekly_texts_in: Annotated[
+        list[WeeklyTextUpsert], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+) -> Any:
+    """
+    Insert or update many weekly texts by sefaria_url with a single INSERT ... ON CONFLICT.
+
+    Texts identical to the stored ones are reported as unchanged and keep their updated_at.
+    """
+    if not current_user.is_superuser:
+        logger.warning(
+            f"Non-superuser attempted to bulk upsert weekly texts user_id={current_user.id}"
+        )
+        raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+
+    logger.info(
+        f"Bulk upserting weekly texts user_id={current_user.id} count={len(weekly_texts_in)}"
+    )
+    result = await upsert_by_sefaria_url(session=session, model=WeeklyText, items=weekly_texts_in)
+    await session.commit()
+    logger.info(
+        f"Bulk upserted weekly texts user_id={current_user.id} inserted={result.inserted} "
+        f"updated={result.updated} unchanged={result.unchanged}"
+    )
+    return result
+
+
 @router.get("/{id}", response_model=WeeklyTextRead)
-def get_weekly_text(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def get_weekly_text(
+    request: Request,
+    session: AsyncReadSessionDep,
+    current_user: CachedCurrentUser,
+    id: int,
+) -> Any:
     logger.info(f"Fetching weekly text user_id={current_user.id} weekly_text_id={id}")
-    weekly_text = session.get(WeeklyText, id)
+    weekly_text = await session.get(WeeklyText, id)
     if not weekly_text:
         logger.warning(f"Weekly text not found user_id={current_user.id} weekly_text_id={id}")
         raise HTTPException(status_code=404, detail="Weekly text not found")
-    return weekly_text
+    validators = Validators.for_row(weekly_text)
+    if validators.is_not_modified(request):
+        return validators.not_modified_response()
+    return model_response(WeeklyTextRead, weekly_text, headers=validators.headers())
 
 
 @router.patch("/{id}", response_model=WeeklyTextRead)
-def patch_weekly_text(
-    *, session: SessionDep, current_user: CurrentUser, id: int, patch: WeeklyTextPatch
+async def patch_weekly_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int, patch: WeeklyTextPatch
 ) -> Any:
     if not current_user.is_superuser:
         logger.warning(
@@ -78,45 +156,39 @@ def patch_weekly_text(
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    weekly_text = session.get(WeeklyText, id)
-    if not weekly_text:
-        logger.warning(f"Weekly text not found for patch weekly_text_id={id}")
-        raise HTTPException(status_code=404, detail="Weekly text not found")
-
     update_dict = patch.model_dump(exclude_unset=True)
     logger.info(f"Patching weekly text user_id={current_user.id} weekly_text_id={id} {update_dict}")
-    for k, v in update_dict.items():
-        setattr(weekly_text, k, v)
-    weekly_text.updated_at = datetime.now(timezone.utc)
     try:
-        session.commit()
-        session.refresh(weekly_text)
-        logger.info(f"Successfully patched weekly text weekly_text_id={id}")
+        weekly_text = await crud.patch_content(
+            session=session, model=WeeklyText, id=id, patch=patch
+        )
     except IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         error_info = str(e.orig)
         logger.error(f"IntegrityError patching weekly text weekly_text_id={id} {error_info}")
         if "foreign key constraint" in error_info.lower():
             raise HTTPException(status_code=400, detail="Invalid middah specified")
         raise HTTPException(status_code=400, detail="Database constraint violation")
+    if not weekly_text:
+        logger.warning(f"Weekly text not found for patch weekly_text_id={id}")
+        raise HTTPException(status_code=404, detail="Weekly text not found")
+    logger.info(f"Successfully patched weekly text weekly_text_id={id}")
     return weekly_text
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_weekly_text(*, session: SessionDep, current_user: CurrentUser, id: int) -> Response:
+async def delete_weekly_text(
+    *, session: AsyncSessionDep, current_user: CachedCurrentUser, id: int
+) -> Response:
     if not current_user.is_superuser:
         logger.warning(
             f"Non-superuser attempted to delete weekly text user_id={current_user.id} weekly_text_id={id}"
         )
         raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
 
-    weekly_text = session.get(WeeklyText, id)
-    if not weekly_text:
+    logger.info(f"Deleting weekly text user_id={current_user.id} weekly_text_id={id}")
+    if not await crud.delete_content(session=session, model=WeeklyText, id=id):
         logger.warning(f"Weekly text not found for deletion weekly_text_id={id}")
         raise HTTPException(status_code=404, detail="Weekly text not found")
-
-    logger.info(f"Deleting weekly text user_id={current_user.id} weekly_text_id={id}")
-    session.delete(weekly_text)
-    session.commit()
     logger.info(f"Successfully deleted weekly text weekly_text_id={id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,56 @@
+import logging
+import math
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.throttle import (
+    Bucket,
+    MemoryRateLimitStore,
+    PostgresRateLimitStore,
+    RateLimitStore,
+)
+
+logger = logging.getLogger(__name__)
+
+IP_BUCKET = Bucket(
+    capacity=settings.THROTTLE_IP_CAPACITY, per_minute=settings.THROTTLE_IP_PER_MINUTE
+)
+EMAIL_BUCKET = Bucket(
+    capacity=settings.THROTTLE_EMAIL_CAPACITY, per_minute=settings.THROTTLE_EMAIL_PER_MINUTE
+)
+
+
+def create_store() -> RateLimitStore:
+    if settings.THROTTLE_STORE == "postgres":
+        idle_seconds = max(b.capacity / b.per_second for b in (IP_BUCKET, EMAIL_BUCKET))
+        return PostgresRateLimitStore(async_engine, idle_seconds=idle_seconds)
+    return MemoryRateLimitStore(maxsize=settings.THROTTLE_MEMORY_MAX_KEYS)
+
+
+throttle_store = create_store()
+
+
+async def throttle(request: Request, action: str, email: str | None = None) -> None:
+    """
+    Take a token from the client IP's bucket for ``action``, and from the bucket of
+    ``email`` when given, or raise a 429 with Retry-After.
+
+    Called first thing in the route, so a rejected attempt costs no lookup and no hash.
+    Each action has its own buckets, failed logins do not block signing up.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    buckets = [(f"{action}:ip:{client_ip}", IP_BUCKET)]
+    if email:
+        buckets.append((f"{action}:email:{email.strip().lower()}", EMAIL_BUCKET))
+    for key, bucket in buckets:
+        # Stops at the first empty bucket, a throttled IP does not drain the email's
+        wait = await throttle_store.take(key, bucket)
+        if wait:
+            logger.warning(f"Throttled {key} retry_after={wait:.1f}s")
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
@@ -1,5 +1,10 @@
 import logging
+from pathlib import Path
 
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from sqlalchemy import Engine
 from sqlmodel import Session, select
 from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
@@ -12,6 +17,8 @@ logger = logging.getLogger(__name__)
 max_tries = 60 * 5  # 5 minutes
 wait_seconds = 1
 
+alembic_ini_path = Path(__file__).parent.parent / "alembic.ini"
+
 
 @retry(
     stop=stop_after_attempt(max_tries),
@@ -29,9 +36,28 @@ def init(db_engine: Engine) -> None:
         raise e
 
 
+def migrate(db_engine: Engine) -> None:
+    """
+    Upgrade the DB to the Alembic head, skipping the upgrade when it is already there.
+
+    Reading the head from the script directory does not import env.py or the models,
+    so an up-to-date DB only costs a single query on alembic_version.
+    """
+    config = Config(str(alembic_ini_path))
+    head_revisions = set(ScriptDirectory.from_config(config).get_heads())
+    with db_engine.connect() as connection:
+        current_revisions = set(MigrationContext.configure(connection).get_current_heads())
+    if current_revisions == head_revisions:
+        logger.info(f"DB already at head revision {', '.join(sorted(head_revisions))}")
+        return
+    logger.info(f"Upgrading DB from {current_revisions or 'empty'} to {head_revisions}")
+    command.upgrade(config, "head")
+
+
 def main() -> None:
     logger.info("Initializing service")
     init(engine)
+    migrate(engine)
     logger.info("Service finished initializing")
 
 
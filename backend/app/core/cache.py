@@ -0,0 +1,118 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from app.core.config import settings
+from app.models import CacheStats, MiddahRead, TokenPayload
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Every cache registers itself here so its counters can be reported
+caches: dict[str, "TTLCache[Hashable, object]"] = {}
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Safe to use from the event loop and from threadpool workers. Each worker process has
+    its own copy, so invalidations only reach the worker that made them and the other
+    workers converge once the TTL expires.
+
+    Unless ``register`` is False, it is listed in ``caches`` and its counters reported by
+    /utils/cache-stats/.
+    """
+
+    def __init__(self, *, name: str, maxsize: int, ttl: float, register: bool = True) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if register:
+            caches[name] = self  # type: ignore[assignment]
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: K, value: V, *, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._data),
+                maxsize=self.maxsize,
+                ttl_seconds=self.ttl,
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    The user fields needed to authorize a request, cached to skip the user lookup.
+    """
+
+    id: uuid.UUID
+    is_active: bool
+    is_superuser: bool
+    token_epoch: int
+
+
+user_cache: TTLCache[uuid.UUID, CachedUser] = TTLCache(
+    name="users", maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+# Verified claims of access tokens keyed by the SHA-256 digest of the token, so the
+# tokens themselves are not kept in memory
+token_cache: TTLCache[bytes, TokenPayload] = TTLCache(
+    name="tokens", maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+
+
+# The whole middot table, keyed by name_transliterated, stored under MIDDOT_CACHE_KEY
+MIDDOT_CACHE_KEY = "middot"
+
+middot_cache: TTLCache[str, dict[str, MiddahRead]] = TTLCache(
+    name="middot", maxsize=1, ttl=settings.MIDDOT_CACHE_TTL_SECONDS
+)
+
+
+# Compressed response bodies keyed by (encoding, path, query string, ETag)
+compressed_cache: TTLCache[tuple[str, str, str, str], bytes] = TTLCache(
+    name="compressed_responses",
+    maxsize=settings.COMPRESSION_CACHE_MAX_SIZE,
+    ttl=settings.COMPRESSION_CACHE_TTL_SECONDS,
+)
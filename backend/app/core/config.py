@@ -28,14 +28,29 @@ class Settings(BaseSettings):
         # Use top level .env file (one level above ./backend/)
         env_file="../.env",
         env_ignore_empty=True,
+        # Lets optional settings such as POSTGRES_PREPARE_THRESHOLD be unset with "null"
+        env_parse_none_str="null",
         extra="ignore",
     )
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
-    # 60 minutes * 24 hours * 8 days = 8 days
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Access tokens are short-lived, clients renew them with their refresh token
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # A refresh token presented again within this many seconds of its rotation is only
+    # rejected, e.g. two browser tabs refreshing at once, later its whole family is revoked
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
+    # Page size for cursor-paginated list endpoints; MAX is enforced server-side
+    PAGINATION_DEFAULT_LIMIT: int = 100
+    PAGINATION_MAX_LIMIT: int = 500
+    # Maximum number of items accepted by a bulk write endpoint
+    BULK_MAX_ITEMS: int = 1000
+    # Rows fetched per round trip by the server-side cursor of the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+    # Items deleted per transaction when a user is purged in the background
+    USER_PURGE_BATCH_SIZE: int = 10000
 
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = []
 
@@ -53,6 +68,20 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pools, per worker process. The async pool serves the async routes, the
+    # sync pool the few sync routes left and the scripts. Size them so that
+    # workers * (POOL_SIZE + MAX_OVERFLOW + SYNC_POOL_SIZE + SYNC_MAX_OVERFLOW) stays
+    # below Postgres max_connections, a replica gets another async pool of its own
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 20
+    POSTGRES_SYNC_POOL_SIZE: int = 2
+    POSTGRES_SYNC_MAX_OVERFLOW: int = 3
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # psycopg prepares a statement after it ran this many times, "null" disables it
+    # (needed behind PgBouncer in transaction pooling mode)
+    POSTGRES_PREPARE_THRESHOLD: int | None = 5
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -66,6 +95,62 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional read replica, used by GET routes of the reference content. Clients read
+    # from the primary for REPLICA_READ_PRIMARY_AFTER_WRITE_SECONDS after a write
+    POSTGRES_REPLICA_DSN: PostgresDsn | None = None
+    REPLICA_READ_PRIMARY_AFTER_WRITE_SECONDS: int = 5
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_DSN:
+            return None
+        # Use the same psycopg driver as the primary, whatever scheme the DSN has
+        dsn = str(self.POSTGRES_REPLICA_DSN)
+        return PostgresDsn(f"postgresql+psycopg://{dsn.split('://', 1)[1]}")
+
+    # Scheme and cost of new password hashes. Hashes with another scheme or cost still
+    # verify and are replaced at the next login
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # argon2id, memory cost in KiB
+    PASSWORD_ARGON2_TIME_COST: int = 2
+    PASSWORD_ARGON2_MEMORY_COST: int = 19456
+    PASSWORD_ARGON2_PARALLELISM: int = 1
+    # Threads per worker that hash and verify passwords, apart from the AnyIO threadpool
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashes allowed to wait for a thread, beyond that requests get a 503 with Retry-After
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Token buckets checked before any lookup or hash on login, signup and password
+    # recovery, per client IP and per email. CAPACITY attempts in a burst, then
+    # PER_MINUTE a minute. "memory" keeps them per worker, "postgres" shares them.
+    THROTTLE_STORE: Literal["memory", "postgres"] = "memory"
+    THROTTLE_MEMORY_MAX_KEYS: int = 100_000
+    THROTTLE_IP_CAPACITY: int = 30
+    THROTTLE_IP_PER_MINUTE: float = 30
+    THROTTLE_EMAIL_CAPACITY: int = 10
+    THROTTLE_EMAIL_PER_MINUTE: float = 5
+
+    # Per-worker cache of the user fields checked on every authenticated request
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10_000
+    # Per-worker cache of verified access token claims, an entry never outlives its token
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    # Per-worker snapshot of the middot table, other workers see writes within the TTL
+    MIDDOT_CACHE_TTL_SECONDS: int = 30
+
+    # Responses of at least COMPRESSION_MINIMUM_SIZE bytes are compressed with brotli,
+    # when the brotli package is installed, or gzip, as negotiated by Accept-Encoding
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    # Compressed bodies of responses with an ETag are reused while the ETag is unchanged
+    COMPRESSION_CACHE_MAX_SIZE: int = 64
+    COMPRESSION_CACHE_TTL_SECONDS: int = 300
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -82,6 +167,19 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Email templates precompiled by scripts/compile_email_templates.py, in the image
+    EMAIL_TEMPLATES_COMPILED_DIR: str | None = None
+    # Handlers queue emails in the email_outbox table, a background task of each worker
+    # sends them over one SMTP connection, up to BATCH_SIZE per poll. Failed sends are
+    # retried after RETRY_BASE_SECONDS, doubling up to RETRY_MAX_SECONDS. Claimed emails
+    # are retried by any worker after LEASE_SECONDS if their worker died sending them.
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: int = 30
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300
 
     @computed_field  # type: ignore[prop-decorator]
     @property
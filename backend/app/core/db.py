@@ -1,10 +1,118 @@
+import os
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
-from app.models import User, UserCreate
+from app.models import DBPoolStats, User, UserCreate
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait to check out a connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._checkout_timeouts = 0
+        self._checkout_wait_total = 0.0
+        self._checkout_wait_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._checkout_wait_total += waited
+                self._checkout_wait_max = max(self._checkout_wait_max, waited)
+
+    def stats(self) -> DBPoolStats:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return DBPoolStats(
+                pid=os.getpid(),
+                pool_size=self.size(),
+                max_overflow=self._max_overflow,
+                checked_out=self.checkedout(),
+                idle=self.checkedin(),
+                overflow=max(self.overflow(), 0),
+                checkouts=checkouts,
+                checkout_timeouts=self._checkout_timeouts,
+                checkout_wait_avg_ms=(
+                    self._checkout_wait_total / checkouts * 1000 if checkouts else 0.0
+                ),
+                checkout_wait_max_ms=self._checkout_wait_max * 1000,
+            )
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    InstrumentedQueuePool for async engines, waiting on the asyncio-aware queue.
+    """
+
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+pool_options: dict[str, Any] = {
+    "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+    "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+    "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    "connect_args": {"prepare_threshold": settings.POSTGRES_PREPARE_THRESHOLD},
+}
+
+async_pool_options: dict[str, Any] = {
+    "poolclass": InstrumentedAsyncQueuePool,
+    "pool_size": settings.POSTGRES_POOL_SIZE,
+    "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+    **pool_options,
+}
+
+# Only the sync routes left, the scripts and the tests use it, so its pool is small
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.POSTGRES_SYNC_POOL_SIZE,
+    max_overflow=settings.POSTGRES_SYNC_MAX_OVERFLOW,
+    **pool_options,
+)
+
+# Used by the async routes, psycopg picks its async connection class for this engine
+async_engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), **async_pool_options)
+
+# Read-only traffic goes to the replica when one is configured
+async_read_engine = (
+    create_async_engine(str(settings.SQLALCHEMY_REPLICA_DATABASE_URI), **async_pool_options)
+    if settings.SQLALCHEMY_REPLICA_DATABASE_URI
+    else async_engine
+)
+
+
+def get_pool_stats() -> dict[str, DBPoolStats]:
+    """
+    Statistics of each connection pool of the current worker process, each uvicorn
+    worker has its own pools. "replica" is only there when a replica is configured.
+    """
+    pools = {"primary": async_engine.pool, "primary_sync": engine.pool}
+    if async_read_engine is not async_engine:
+        pools["replica"] = async_read_engine.pool
+    stats = {}
+    for name, pool in pools.items():
+        assert isinstance(pool, InstrumentedQueuePool)
+        stats[name] = pool.stats()
+    return stats
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -13,14 +121,7 @@ engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 
 
 def init_db(session: Session) -> None:
-    # Tables should be created with Alembic migrations
-    # But if you don't want to use migrations, create
-    # the tables un-commenting the next lines
-    from sqlmodel import SQLModel
-
-    # This works because the models are already imported and registered from app.models
-    SQLModel.metadata.create_all(engine)
-
+    # Tables are created with Alembic migrations, run from app/backend_pre_start.py
     user = session.exec(select(User).where(User.email == settings.FIRST_SUPERUSER)).first()
     if not user:
         user_in = UserCreate(
@@ -1,27 +1,210 @@
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
 import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.models import PasswordHashingStats, User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+
+def build_crypt_context(
+    scheme: str,
+    *,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Context that hashes with ``scheme`` and the given cost, and still verifies hashes of
+    the other scheme.
+
+    Hashes of the other scheme, or with another cost, are reported by needs_update, so
+    they are replaced at the user's next login.
+    """
+    context = CryptContext(
+        schemes=[scheme, *(other for other in ("bcrypt", "argon2") if other != scheme)],
+        deprecated="auto",
+        # Equal bounds, so a hash with more rounds than configured is replaced too
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+    if not context.handler(scheme).has_backend():  # type: ignore[attr-defined, unused-ignore]
+        raise RuntimeError(f"No backend for the {scheme} password hash scheme is installed")
+    return context
+
+
+pwd_context = build_crypt_context(
+    settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+)
 
 
 ALGORITHM = "HS256"
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
+def create_access_token(subject: str | Any, expires_delta: timedelta, token_epoch: int = 0) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "epoch": token_epoch}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_user_access_token(user: User) -> str:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(
+        user.id, expires_delta=access_token_expires, token_epoch=user.token_epoch
+    )
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    # Refresh tokens are random, a fast hash is enough to not store them in clear
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def generate_refresh_token() -> tuple[str, str]:
+    """
+    Return a new opaque refresh token and the hash to store.
+    """
+    refresh_token = secrets.token_urlsafe(32)
+    return refresh_token, hash_refresh_token(refresh_token)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    verified: bool = pwd_context.verify(plain_password, hashed_password)
+    return verified
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    hashed_password: str = pwd_context.hash(password)
+    return hashed_password
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and, when its hash does not match the configured scheme and cost,
+    return a new hash of it to store.
+    """
+    # Annotated so the result is typed without the passlib stubs too
+    result: tuple[bool, str | None] = pwd_context.verify_and_update(plain_password, hashed_password)
+    return result
+
+
+class PasswordHashingBusy(Exception):
+    """
+    Raised instead of queueing a hash when the password hashing queue is full.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashes and verifications on its own bounded thread pool.
+
+    bcrypt releases the GIL, so threads run in parallel, and keeping them off the AnyIO
+    threadpool means a burst of logins cannot delay the other routes. Once ``workers``
+    hashes are running and ``max_queue`` are waiting, further ones raise
+    PasswordHashingBusy instead of queueing.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusy
+            self._pending += 1
+        submitted = time.perf_counter()
+
+        def timed() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._wait_total += started - submitted
+                    self._wait_max = max(self._wait_max, started - submitted)
+                    self._run_total += finished - started
+                    self._run_max = max(self._run_max, finished - started)
+
+        future = self._executor.submit(timed)
+        # Released when the hash is done or cancelled before it started, not when the
+        # awaiting request goes away while it runs
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future: "Future[Any]") -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> PasswordHashingStats:
+        with self._lock:
+            completed = self._completed
+            return PasswordHashingStats(
+                workers=self.workers,
+                max_queue=self.max_queue,
+                running=self._running,
+                queued=self._pending - self._running,
+                completed=completed,
+                rejected=self._rejected,
+                wait_avg_ms=self._wait_total / completed * 1000 if completed else 0.0,
+                wait_max_ms=self._wait_max * 1000,
+                run_avg_ms=self._run_total / completed * 1000 if completed else 0.0,
+                run_max_ms=self._run_max * 1000,
+            )
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_hasher.run(verify_and_update_password, plain_password, hashed_password)
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """
+    Token bucket allowing ``capacity`` attempts in a burst, refilled by ``per_minute``
+    tokens a minute.
+    """
+
+    capacity: int
+    per_minute: float
+
+    @property
+    def per_second(self) -> float:
+        return self.per_minute / 60
+
+    def seconds_until_token(self, tokens: float) -> float:
+        return max(1 - tokens, 0) / self.per_second
+
+
+class RateLimitStore(Protocol):
+    async def take(self, key: str, bucket: Bucket) -> float:
+        """
+        Take a token from the bucket of ``key``. Return 0 when one was available,
+        otherwise the seconds until there is one.
+        """
+        ...
+
+
+class MemoryRateLimitStore:
+    """
+    Buckets kept by each worker process, so a client spreading its attempts over the
+    workers gets up to one bucket per worker.
+
+    The least recently used keys are dropped beyond ``maxsize``, they start over with a
+    full bucket. ``clock`` can be replaced to control time in tests.
+    """
+
+    def __init__(self, *, maxsize: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, bucket: Bucket) -> float:
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (bucket.capacity, now))
+            tokens = min(bucket.capacity, tokens + (now - updated_at) * bucket.per_second)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = bucket.seconds_until_token(tokens)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# The bucket refilled up to now, in the statements below
+REFILLED = """
+    LEAST(:capacity, bucket.tokens
+        + EXTRACT(EPOCH FROM timezone('UTC', now()) - bucket.updated_at) * :per_second)
+"""
+
+# Takes a token and returns a row only when one is available, a rejected attempt leaves
+# the bucket as it is
+TAKE = text(f"""
+    INSERT INTO rate_limit_buckets AS bucket (key, tokens, updated_at)
+    VALUES (:key, :capacity - 1, timezone('UTC', now()))
+    ON CONFLICT (key) DO UPDATE
+    SET tokens = {REFILLED} - 1, updated_at = timezone('UTC', now())
+    WHERE {REFILLED} >= 1
+    RETURNING bucket.tokens
+""")
+
+TOKENS = text(f"SELECT {REFILLED} FROM rate_limit_buckets AS bucket WHERE key = :key")
+
+# Buckets idle for long enough to be full again are equivalent to no row
+PRUNE = text("""
+    DELETE FROM rate_limit_buckets
+    WHERE updated_at < timezone('UTC', now()) - make_interval(secs => :idle_seconds)
+""")
+
+
+class PostgresRateLimitStore:
+    """
+    Buckets in the rate_limit_buckets table, shared by every worker and replica of the
+    backend. Each attempt is one statement, and a rejected one a second to compute when
+    to retry.
+
+    Every ``prune_every`` attempts of a worker, buckets idle for ``idle_seconds``, long
+    enough for any bucket to be full again, are deleted.
+    """
+
+    def __init__(self, engine: AsyncEngine, *, idle_seconds: float, prune_every: int = 1000):
+        self.engine = engine
+        self.idle_seconds = idle_seconds
+        self.prune_every = prune_every
+        self._attempts = 0
+
+    async def take(self, key: str, bucket: Bucket) -> float:
+        parameters = {"key": key, "capacity": bucket.capacity, "per_second": bucket.per_second}
+        async with self.engine.begin() as connection:
+            taken = (await connection.execute(TAKE, parameters)).first()
+            if taken is not None:
+                wait = 0.0
+            else:
+                tokens = (await connection.execute(TOKENS, parameters)).scalar_one()
+                wait = bucket.seconds_until_token(tokens)
+            self._attempts += 1
+            if self._attempts % self.prune_every == 0:
+                await connection.execute(PRUNE, {"idle_seconds": self.idle_seconds})
+        return wait
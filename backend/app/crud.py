@@ -1,9 +1,21 @@
 import uuid
-from typing import Any
-
-from sqlmodel import Session, select
-
-from app.core.security import get_password_hash, verify_password
+from datetime import datetime, timedelta, timezone
+from typing import Any, TypeVar
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, SQLModel, col, delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import MIDDOT_CACHE_KEY, middot_cache, user_cache
+from app.core.config import settings
+from app.core.security import (
+    generate_refresh_token,
+    get_password_hash,
+    get_password_hash_async,
+    hash_refresh_token,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
 from app.models import (
     DailyText,
     DailyTextCreate,
@@ -13,6 +25,8 @@ from app.models import (
     KabbalahCreate,
     Middah,
     MiddahCreate,
+    OutboxEmail,
+    RefreshToken,
     ReminderPhrase,
     ReminderPhraseCreate,
     User,
@@ -22,28 +36,37 @@ from app.models import (
     WeeklyTextCreate,
 )
 
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
     db_obj = User.model_validate(
         user_create, update={"hashed_password": get_password_hash(user_create.password)}
     )
-    session.add(db_obj)
+    return _insert_returning(session, User, db_obj.model_dump())
+
+
+def _update_user_returning(session: Session, user_id: uuid.UUID, values: dict[str, Any]) -> User:
+    statement = update(User).where(col(User.id) == user_id).values(**values).returning(User)
+    db_user: User = session.exec(statement).scalar_one()  # type: ignore
+    # Detached before the commit would expire it, every column was loaded by RETURNING
+    session.expunge(db_user)
     session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return db_user
 
 
 def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     user_data = user_in.model_dump(exclude_unset=True)
-    extra_data = {}
     if "password" in user_data:
-        password = user_data["password"]
+        password = user_data.pop("password")
         hashed_password = get_password_hash(password)
-        extra_data["hashed_password"] = hashed_password
-    db_user.sqlmodel_update(user_data, update=extra_data)
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+        user_data["hashed_password"] = hashed_password
+        # Signs out the sessions that used the old password
+        user_data["token_epoch"] = User.token_epoch + 1
+    if not user_data:
+        return db_user
+    db_user = _update_user_returning(session, db_user.id, user_data)
+    user_cache.pop(db_user.id)
     return db_user
 
 
@@ -57,11 +80,188 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        # Stored with an outdated scheme or cost, replaced now that the password is known
+        db_user = _update_user_returning(session, db_user.id, {"hashed_password": new_hash})
+    return db_user
+
+
+# Async counterparts used by the async user routes, password hashing is CPU bound
+# and runs on the password hashing pool so it does not block the event loop
+async def create_user_async(*, session: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await get_password_hash_async(user_create.password)
+    db_obj = User.model_validate(user_create, update={"hashed_password": hashed_password})
+    session.add(db_obj)
+    await session.commit()
+    return db_obj
+
+
+async def update_user_async(*, session: AsyncSession, db_user: User, user_in: UserUpdate) -> Any:
+    user_data = user_in.model_dump(exclude_unset=True)
+    extra_data: dict[str, Any] = {}
+    if "password" in user_data:
+        password = user_data["password"]
+        hashed_password = await get_password_hash_async(password)
+        extra_data["hashed_password"] = hashed_password
+        # Signs out the sessions that used the old password
+        extra_data["token_epoch"] = db_user.token_epoch + 1
+    db_user.sqlmodel_update(user_data, update=extra_data)
+    session.add(db_user)
+    await session.commit()
+    user_cache.pop(db_user.id)
+    return db_user
+
+
+async def get_user_by_email_async(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    session_user = (await session.exec(statement)).first()
+    return session_user
+
+
+async def authenticate_async(*, session: AsyncSession, email: str, password: str) -> User | None:
+    db_user = await get_user_by_email_async(session=session, email=email)
+    if not db_user:
+        return None
+    verified, new_hash = await verify_and_update_password_async(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored with an outdated scheme or cost, replaced now that the password is known
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
     return db_user
 
 
+async def issue_refresh_token(
+    *, session: AsyncSession, user: User, family_id: uuid.UUID | None = None
+) -> str:
+    """
+    Store a new refresh token of ``user``, in a new family unless ``family_id`` is given,
+    and return it. The transaction is left to the caller to commit.
+    """
+    refresh_token, token_hash = generate_refresh_token()
+    statement = insert(RefreshToken).values(
+        id=uuid.uuid4(),
+        token_hash=token_hash,
+        user_id=user.id,
+        family_id=family_id or uuid.uuid4(),
+        token_epoch=user.token_epoch,
+        expires_at=utc_now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    await session.exec(statement)  # type: ignore
+    return refresh_token
+
+
+async def rotate_refresh_token(
+    *, session: AsyncSession, refresh_token: str
+) -> tuple[User, str] | None:
+    """
+    Exchange a refresh token for a new one of the same family. Return the user and the
+    new token, or None when the token is unknown, expired, already used, or was issued
+    before the user's token epoch changed.
+
+    A token used again after REFRESH_TOKEN_REUSE_GRACE_SECONDS has most likely leaked, so
+    every token of its family is revoked.
+    """
+    statement = (
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+        .where(col(RefreshToken.expires_at) > utc_now())
+        .with_for_update()
+    )
+    stored = (await session.exec(statement)).first()
+    if stored is None:
+        return None
+    if stored.used_at is not None:
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        # Stored timestamps are UTC without a time zone
+        if stored.used_at < datetime.now(timezone.utc).replace(tzinfo=None) - grace:
+            revoke = (
+                update(RefreshToken)
+                .where(col(RefreshToken.family_id) == stored.family_id)
+                .where(col(RefreshToken.used_at).is_(None))
+                .values(used_at=utc_now())
+            )
+            await session.exec(revoke)  # type: ignore
+            await session.commit()
+        return None
+
+    user = await session.get(User, stored.user_id)
+    if user is None or not user.is_active or stored.token_epoch != user.token_epoch:
+        return None
+    mark_used = (
+        update(RefreshToken).where(col(RefreshToken.id) == stored.id).values(used_at=utc_now())
+    )
+    await session.exec(mark_used)  # type: ignore
+    new_refresh_token = await issue_refresh_token(
+        session=session, user=user, family_id=stored.family_id
+    )
+    await session.commit()
+    return user, new_refresh_token
+
+
+async def revoke_user_tokens(*, session: AsyncSession, user: User) -> None:
+    """
+    Revoke every access and refresh token of ``user`` by bumping its token epoch.
+    """
+    user.token_epoch += 1
+    session.add(user)
+    await session.commit()
+    user_cache.pop(user.id)
+
+
+async def enqueue_email(
+    *,
+    session: AsyncSession,
+    email_to: str,
+    email_type: str,
+    context: dict[str, Any] | None = None,
+) -> None:
+    """
+    Queue an email of ``email_type`` for the outbox worker, see utils.generate_email. It is
+    only sent once the caller commits, with whatever else the transaction writes.
+    ``context`` is stored as is and must not hold passwords or tokens.
+    """
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    statement = insert(OutboxEmail).values(
+        id=uuid.uuid4(),
+        email_to=email_to,
+        email_type=email_type,
+        context=context or {},
+        next_attempt_at=utc_now(),
+        created_at=utc_now(),
+    )
+    await session.exec(statement)  # type: ignore
+
+
+async def purge_user(*, session: AsyncSession, user_id: uuid.UUID, batch_size: int) -> int:
+    """
+    Delete the items of a user ``batch_size`` at a time, committing after each batch, and
+    then the user. Return the number of items deleted.
+
+    Unlike a single DELETE cascading to every item, no transaction holds the locks of all
+    the rows and each one stays short.
+    """
+    batch = select(Item.id).where(col(Item.owner_id) == user_id).limit(batch_size)
+    statement = delete(Item).where(col(Item.id).in_(batch))
+    deleted = 0
+    while True:
+        result = await session.exec(statement)  # type: ignore
+        await session.commit()
+        batch_deleted: int = result.rowcount
+        deleted += batch_deleted
+        if batch_deleted < batch_size:
+            break
+    await session.exec(delete(User).where(col(User.id) == user_id))  # type: ignore
+    await session.commit()
+    user_cache.pop(user_id)
+    return deleted
+
+
 def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
@@ -70,11 +270,67 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
     return db_item
 
 
-def create_middah(*, session: Session, middah_in: MiddahCreate) -> Middah:
-    db_middah = Middah.model_validate(middah_in)
-    session.add(db_middah)
+# Content writes are single INSERT, UPDATE or DELETE ... RETURNING statements, so the
+# row comes back without a refresh. created_at and updated_at are set by the database.
+ContentT = TypeVar("ContentT", ReminderPhrase, DailyText, Kabbalah, WeeklyText)
+
+
+def utc_now() -> Any:
+    # The transaction's start time, as UTC like every stored timestamp
+    return func.timezone("UTC", func.now())
+
+
+def insert_statement(model: type[ModelT], values: dict[str, Any]) -> Any:
+    if "updated_at" in model.model_fields:
+        values = {**values, "created_at": utc_now(), "updated_at": utc_now()}
+    return insert(model).values(**values).returning(model)
+
+
+def _insert_returning(session: Session, model: type[ModelT], values: dict[str, Any]) -> ModelT:
+    db_obj: ModelT = session.exec(insert_statement(model, values)).scalar_one()
+    # Detached before the commit would expire it, every column was loaded by RETURNING
+    session.expunge(db_obj)
     session.commit()
-    session.refresh(db_middah)
+    return db_obj
+
+
+async def create_content(
+    *, session: AsyncSession, model: type[ModelT], content_in: SQLModel
+) -> ModelT:
+    result = await session.exec(insert_statement(model, content_in.model_dump()))
+    db_obj: ModelT = result.scalar_one()
+    await session.commit()
+    return db_obj
+
+
+async def patch_content(
+    *, session: AsyncSession, model: type[ContentT], id: int, patch: SQLModel
+) -> ContentT | None:
+    """
+    Apply ``patch`` to the row with ``id`` and bump its updated_at, None if there is no row.
+    """
+    statement = (
+        update(model)
+        .where(col(model.id) == id)
+        .values(**patch.model_dump(exclude_unset=True), updated_at=utc_now())
+        .returning(model)
+    )
+    db_obj: ContentT | None = (await session.exec(statement)).scalar_one_or_none()  # type: ignore
+    await session.commit()
+    return db_obj
+
+
+async def delete_content(*, session: AsyncSession, model: type[ContentT], id: int) -> bool:
+    statement = delete(model).where(col(model.id) == id).returning(col(model.id))
+    deleted = (await session.exec(statement)).scalar_one_or_none()  # type: ignore
+    await session.commit()
+    return deleted is not None
+
+
+def create_middah(*, session: Session, middah_in: MiddahCreate) -> Middah:
+    values = MiddahCreate.model_validate(middah_in).model_dump()
+    db_middah = _insert_returning(session, Middah, values)
+    middot_cache.pop(MIDDOT_CACHE_KEY)
     return db_middah
 
 
@@ -83,6 +339,7 @@ def delete_middah(*, session: Session, name_transliterated: str) -> None:
     if middah:
         session.delete(middah)
         session.commit()
+        middot_cache.pop(MIDDOT_CACHE_KEY)
     else:
         raise ValueError("Middah not found in db crud operation")
 
@@ -90,11 +347,8 @@ def delete_middah(*, session: Session, name_transliterated: str) -> None:
 def create_reminder_phrase(
     *, session: Session, reminder_phrase_in: ReminderPhraseCreate
 ) -> ReminderPhrase:
-    db_reminder_phrase = ReminderPhrase.model_validate(reminder_phrase_in)
-    session.add(db_reminder_phrase)
-    session.commit()
-    session.refresh(db_reminder_phrase)
-    return db_reminder_phrase
+    values = ReminderPhraseCreate.model_validate(reminder_phrase_in).model_dump()
+    return _insert_returning(session, ReminderPhrase, values)
 
 
 def delete_reminder_phrase(*, session: Session, reminder_phrase_id: int) -> None:
@@ -107,11 +361,8 @@ def delete_reminder_phrase(*, session: Session, reminder_phrase_id: int) -> None
 
 
 def create_daily_text(*, session: Session, daily_text_in: DailyTextCreate) -> DailyText:
-    db_daily_text = DailyText.model_validate(daily_text_in)
-    session.add(db_daily_text)
-    session.commit()
-    session.refresh(db_daily_text)
-    return db_daily_text
+    values = DailyTextCreate.model_validate(daily_text_in).model_dump()
+    return _insert_returning(session, DailyText, values)
 
 
 def delete_daily_text(*, session: Session, daily_text_id: str) -> None:
@@ -124,11 +375,8 @@ def delete_daily_text(*, session: Session, daily_text_id: str) -> None:
 
 
 def create_kabbalah(*, session: Session, kabbalah_in: KabbalahCreate) -> Kabbalah:
-    db_kabbalah = Kabbalah.model_validate(kabbalah_in)
-    session.add(db_kabbalah)
-    session.commit()
-    session.refresh(db_kabbalah)
-    return db_kabbalah
+    values = KabbalahCreate.model_validate(kabbalah_in).model_dump()
+    return _insert_returning(session, Kabbalah, values)
 
 
 def delete_kabbalah(*, session: Session, kabbalah_id: int) -> None:
@@ -141,11 +389,8 @@ def delete_kabbalah(*, session: Session, kabbalah_id: int) -> None:
 
 
 def create_weekly_text(*, session: Session, weekly_text_in: WeeklyTextCreate) -> WeeklyText:
-    db_weekly_text = WeeklyText.model_validate(weekly_text_in)
-    session.add(db_weekly_text)
-    session.commit()
-    session.refresh(db_weekly_text)
-    return db_weekly_text
+    values = WeeklyTextCreate.model_validate(weekly_text_in).model_dump()
+    return _insert_returning(session, WeeklyText, values)
 
 
 def delete_weekly_text(*, session: Session, weekly_text_id: int) -> None:
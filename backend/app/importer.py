@@ -0,0 +1,299 @@
+"""
+Import the Mussar corpus from JSON Lines or CSV files.
+
+Each file is validated in batches with the matching *Create model and streamed with COPY
+into a temporary staging table, then every staging table is merged into its real table.
+Everything runs in one transaction, so an import is applied completely or not at all,
+and memory use does not depend on the size of the files.
+
+Usage, from the backend directory:
+
+    python -m app.importer middot=data/middot.csv reminder_phrases=data/phrases.jsonl
+
+Files are matched to tables by the name before the ``=`` and imported in foreign key
+order. The format comes from the extension: .jsonl, .ndjson or .csv.
+
+Middot are upserted by name_transliterated, daily and weekly texts by sefaria_url, and
+reminder phrases and kabbalot already present for their middah are skipped. Running API
+workers see imported middot once their middot cache expires.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import psycopg
+from psycopg import sql
+from pydantic import TypeAdapter, ValidationError
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.models import (
+    DailyTextCreate,
+    KabbalahCreate,
+    MiddahCreate,
+    ReminderPhraseCreate,
+    WeeklyTextCreate,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Content rows with the same sefaria_url are reduced to the last one in the file, rows
+# without a sefaria_url are all kept
+LAST_BY_SEFARIA_URL = """
+    SELECT *, row_number() OVER (PARTITION BY sefaria_url ORDER BY line DESC) AS rank
+    FROM {staging}
+"""
+
+
+# The transaction's start time, as UTC like every stored timestamp, so every row of an
+# import gets the same one
+NOW = sql.SQL("timezone('UTC', now())")
+
+
+@dataclass(frozen=True)
+class Resource:
+    table: str
+    create_model: type[SQLModel]
+    columns: tuple[str, ...]
+    # Merges the staging table into the table, {now} is the created_at and updated_at
+    merge: str
+    references_middot: bool = True
+
+
+# In foreign key order
+RESOURCES = {
+    resource.table: resource
+    for resource in (
+        Resource(
+            table="middot",
+            create_model=MiddahCreate,
+            columns=("name_transliterated", "name_hebrew", "name_english"),
+            merge="""
+                INSERT INTO middot (name_transliterated, name_hebrew, name_english)
+                SELECT DISTINCT ON (name_transliterated)
+                    name_transliterated, name_hebrew, name_english
+                FROM {staging}
+                ORDER BY name_transliterated, line DESC
+                ON CONFLICT (name_transliterated) DO UPDATE
+                SET name_hebrew = excluded.name_hebrew, name_english = excluded.name_english
+                WHERE (middot.name_hebrew, middot.name_english)
+                    IS DISTINCT FROM (excluded.name_hebrew, excluded.name_english)
+            """,
+            references_middot=False,
+        ),
+        Resource(
+            table="reminder_phrases",
+            create_model=ReminderPhraseCreate,
+            columns=("middah", "text"),
+            merge="""
+                INSERT INTO reminder_phrases (middah, text, created_at, updated_at)
+                SELECT middah, text, {now}, {now} FROM {staging} ORDER BY line
+                ON CONFLICT ON CONSTRAINT reminder_phrases_middah_text_uq DO NOTHING
+            """,
+        ),
+        Resource(
+            table="daily_texts",
+            create_model=DailyTextCreate,
+            columns=("middah", "sefaria_url", "title", "content"),
+            merge=f"""
+                INSERT INTO daily_texts (middah, sefaria_url, title, content, created_at, updated_at)
+                SELECT middah, sefaria_url, title, content, {{now}}, {{now}}
+                FROM ({LAST_BY_SEFARIA_URL}) AS last
+                WHERE rank = 1 OR sefaria_url IS NULL
+                ORDER BY line
+                ON CONFLICT (sefaria_url) DO UPDATE
+                SET middah = excluded.middah, title = excluded.title,
+                    content = excluded.content, updated_at = excluded.updated_at
+                WHERE (daily_texts.middah, daily_texts.title, daily_texts.content)
+                    IS DISTINCT FROM (excluded.middah, excluded.title, excluded.content)
+            """,
+        ),
+        Resource(
+            table="kabbalot",
+            create_model=KabbalahCreate,
+            columns=("middah", "description"),
+            merge="""
+                INSERT INTO kabbalot (middah, description, created_at, updated_at)
+                SELECT middah, description, {now}, {now} FROM {staging} ORDER BY line
+                ON CONFLICT ON CONSTRAINT kabbalot_middah_description_uq DO NOTHING
+            """,
+        ),
+        Resource(
+            table="weekly_texts",
+            create_model=WeeklyTextCreate,
+            columns=("sefaria_url", "title", "content"),
+            merge=f"""
+                INSERT INTO weekly_texts (sefaria_url, title, content, created_at, updated_at)
+                SELECT sefaria_url, title, content, {{now}}, {{now}}
+                FROM ({LAST_BY_SEFARIA_URL}) AS last
+                WHERE rank = 1 OR sefaria_url IS NULL
+                ORDER BY line
+                ON CONFLICT (sefaria_url) DO UPDATE
+                SET title = excluded.title, content = excluded.content,
+                    updated_at = excluded.updated_at
+                WHERE (weekly_texts.title, weekly_texts.content)
+                    IS DISTINCT FROM (excluded.title, excluded.content)
+            """,
+            references_middot=False,
+        ),
+    )
+}
+
+
+def read_records(path: Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yield each record of a JSON Lines or CSV file with its line number.
+
+    Empty CSV fields are read as null.
+    """
+    suffix = path.suffix.lower()
+    with path.open(newline="", encoding="utf-8") as file:
+        if suffix in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: {e}") from e
+        elif suffix == ".csv":
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, {k: v if v != "" else None for k, v in record.items()}
+        else:
+            raise ValueError(f"{path}: unsupported format, use .jsonl, .ndjson or .csv")
+
+
+def validated_batches(
+    resource: Resource, path: Path, batch_size: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    """
+    Yield the records of ``path`` in batches of staging rows, the line number followed by
+    the resource columns, after validating each batch with the resource's *Create model.
+    """
+    adapter = TypeAdapter(list[resource.create_model])  # type: ignore[name-defined]
+    records = read_records(path)
+    while batch := list(islice(records, batch_size)):
+        try:
+            items = adapter.validate_python([record for _, record in batch])
+        except ValidationError as e:
+            error = e.errors()[0]
+            line_number = batch[int(error["loc"][0])][0]
+            field = ".".join(str(loc) for loc in error["loc"][1:])
+            raise ValueError(f"{path}:{line_number}: {field} {error['msg']}") from e
+        yield [
+            (line_number, *(getattr(item, column) for column in resource.columns))
+            for (line_number, _), item in zip(batch, items, strict=True)
+        ]
+
+
+def copy_to_staging(
+    connection: psycopg.Connection[Any], resource: Resource, path: Path, batch_size: int
+) -> sql.Identifier:
+    staging = sql.Identifier(f"staging_{resource.table}")
+    columns = sql.SQL(", ").join(map(sql.Identifier, resource.columns))
+    connection.execute(
+        sql.SQL(
+            "CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            "SELECT 0::bigint AS line, {columns} FROM {table} WITH NO DATA"
+        ).format(staging=staging, columns=columns, table=sql.Identifier(resource.table))
+    )
+
+    start = time.perf_counter()
+    copied = 0
+    with connection.cursor() as cursor:
+        copy_statement = sql.SQL("COPY {staging} (line, {columns}) FROM STDIN").format(
+            staging=staging, columns=columns
+        )
+        with cursor.copy(copy_statement) as copy:
+            for rows in validated_batches(resource, path, batch_size):
+                for row in rows:
+                    copy.write_row(row)
+                copied += len(rows)
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"{resource.table}: {copied} rows copied, {copied / elapsed:.0f} rows/s"
+                )
+    return staging
+
+
+def check_middot(
+    connection: psycopg.Connection[Any], resource: Resource, staging: sql.Identifier
+) -> None:
+    statement = sql.SQL(
+        "SELECT DISTINCT middah FROM {staging} "
+        "WHERE middah NOT IN (SELECT name_transliterated FROM middot) LIMIT 10"
+    ).format(staging=staging)
+    missing = [middah for (middah,) in connection.execute(statement)]
+    if missing:
+        raise ValueError(f"{resource.table}: unknown middot {', '.join(missing)}")
+
+
+def import_files(files: dict[str, Path], *, batch_size: int = DEFAULT_BATCH_SIZE) -> dict[str, int]:
+    """
+    Import ``files``, keyed by table name, in one transaction. Return the number of rows
+    inserted or updated in each table.
+    """
+    unknown = set(files) - set(RESOURCES)
+    if unknown:
+        raise ValueError(f"Unknown tables {', '.join(sorted(unknown))}")
+
+    conninfo = str(settings.SQLALCHEMY_DATABASE_URI).replace("postgresql+psycopg", "postgresql")
+    merged: dict[str, int] = {}
+    # Committed when the block exits normally, rolled back on any error
+    with psycopg.connect(conninfo) as connection:
+        for table, resource in RESOURCES.items():
+            if table not in files:
+                continue
+            staging = copy_to_staging(connection, resource, files[table], batch_size)
+            if resource.references_middot:
+                check_middot(connection, resource, staging)
+            start = time.perf_counter()
+            merge = sql.SQL(resource.merge).format(staging=staging, now=NOW)
+            merged[table] = connection.execute(merge).rowcount
+            logger.info(
+                f"{table}: {merged[table]} rows inserted or updated "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+    return merged
+
+
+def parse_file_argument(value: str) -> tuple[str, Path]:
+    table, separator, path = value.partition("=")
+    if not separator or not path:
+        raise argparse.ArgumentTypeError(f"expected TABLE=PATH, got {value!r}")
+    return table, Path(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import the Mussar corpus from JSON Lines or CSV files.",
+        epilog=f"Tables: {', '.join(RESOURCES)}",
+    )
+    parser.add_argument("files", nargs="+", type=parse_file_argument, metavar="TABLE=PATH")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        merged = import_files(dict(args.files), batch_size=args.batch_size)
+    except (ValueError, psycopg.Error) as e:
+        logger.error(f"Import failed, nothing was imported: {e}")
+        sys.exit(1)
+    logger.info(f"Imported {sum(merged.values())} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.responses import PydanticJSONResponse
+from app.core.cache import compressed_cache
 from app.core.config import settings
+from app.core.db import async_engine, async_read_engine
+from app.core.security import PasswordHashingBusy
+from app.middleware import CompressionMiddleware, ReadPrimaryAfterWriteMiddleware
+from app.outbox import run_outbox_worker
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +25,29 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    outbox_worker = None
+    if settings.emails_enabled and settings.EMAIL_OUTBOX_WORKER:
+        outbox_worker = asyncio.create_task(run_outbox_worker())
+    yield
+    if outbox_worker is not None:
+        outbox_worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await outbox_worker
+    # Async connections are bound to the event loop that opened them
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=PydanticJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +60,29 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    app.add_middleware(
+        ReadPrimaryAfterWriteMiddleware,
+        window_seconds=settings.REPLICA_READ_PRIMARY_AFTER_WRITE_SECONDS,
+    )
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    cache=compressed_cache,
+)
+
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(_request: Request, _exc: Exception) -> JSONResponse:
+    # Refused before queueing, the client retries once the burst of logins has drained
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many password checks in progress, retry later"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
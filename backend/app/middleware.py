@@ -0,0 +1,215 @@
+import time
+import zlib
+from collections.abc import Callable
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+
+try:
+    import brotli  # type: ignore[import-not-found, import-untyped, unused-ignore]
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadPrimaryAfterWriteMiddleware:
+    """
+    Set a short-lived cookie on successful writes so that the client's next reads go to
+    the primary instead of a replica that may not have replayed the write yet.
+
+    The cookie holds the expiry timestamp, so it works whichever worker serves the read.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                read_primary_until = int(time.time()) + self.window_seconds
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={read_primary_until}; "
+                    f"Max-Age={self.window_seconds}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Offered in this order of preference when the client accepts both equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Bodies above this size are compressed in the threadpool to keep the event loop free
+THREADPOOL_COMPRESSION_SIZE = 64 * 1024
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the supported content coding with the highest q-value in Accept-Encoding.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class StreamCompressor:
+    def __init__(self, encoding: str, *, gzip_level: int, brotli_quality: int) -> None:
+        self._compress: Callable[[bytes], bytes]
+        self._finish: Callable[[], bytes]
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress, self._finish = compressor.process, compressor.finish
+        else:
+            # wbits 31 writes the gzip header and trailer around the deflate stream
+            compressobj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress, self._finish = compressobj.compress, compressobj.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies of at least ``minimum_size`` bytes with the content coding
+    negotiated from Accept-Encoding. Streamed bodies are compressed chunk by chunk.
+
+    With a ``cache``, the compressed body of a response that has an ETag is kept and
+    reused for the same path, query string and ETag instead of compressing it again.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+        cache: TTLCache[tuple[str, str, str, str], bytes] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        compressor: StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is not None:
+                body = compressor.compress(body)
+                if not more_body:
+                    body += compressor.finish()
+                if body or not more_body:
+                    await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            if "content-encoding" in headers or (not more_body and len(body) < self.minimum_size):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                compressor = self.compressor(encoding)
+                await send(start_message)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": compressor.compress(body),
+                        "more_body": True,
+                    }
+                )
+                return
+
+            compressed = await self.compress_body(scope, headers, encoding, body)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def compressor(self, encoding: str) -> StreamCompressor:
+        return StreamCompressor(
+            encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality
+        )
+
+    async def compress_body(
+        self, scope: Scope, headers: MutableHeaders, encoding: str, body: bytes
+    ) -> bytes:
+        etag = headers.get("etag")
+        key = None
+        if etag is not None and self.cache is not None:
+            query_string = scope.get("query_string", b"").decode("latin-1")
+            key = (encoding, scope["path"], query_string, etag)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        compressor = self.compressor(encoding)
+
+        def compress() -> bytes:
+            return compressor.compress(body) + compressor.finish()
+
+        if len(body) >= THREADPOOL_COMPRESSION_SIZE:
+            compressed = await run_in_threadpool(compress)
+        else:
+            compressed = compress()
+        if key is not None and self.cache is not None:
+            self.cache.set(key, compressed)
+        return compressed
@@ -1,8 +1,10 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Any, Literal
 
 from pydantic import EmailStr
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Column, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -45,7 +47,12 @@ class UpdatePassword(SQLModel):
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
-    items: list["Item"] = Relationship(back_populates="owner", cascade_delete=True)
+    # Tokens carry the epoch they were issued in, bumping it revokes all of them
+    token_epoch: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    # Deleted by the ON DELETE CASCADE of item.owner_id, without loading them
+    items: list["Item"] = Relationship(
+        back_populates="owner", cascade_delete=True, passive_deletes=True
+    )
 
 
 # Properties to return via API, id is always required
@@ -77,7 +84,9 @@ class ItemUpdate(ItemBase):
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    owner_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
+    )
     owner: User | None = Relationship(back_populates="items")
 
 
@@ -97,15 +106,90 @@ class Message(SQLModel):
     message: str
 
 
+# Counters of an in-process cache of a single worker process
+class CacheStats(SQLModel):
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+
+
+# Connection pool statistics of a single worker process
+class DBPoolStats(SQLModel):
+    pid: int
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_avg_ms: float
+    checkout_wait_max_ms: float
+
+
+# Password hashing pool statistics of a single worker process
+class PasswordHashingStats(SQLModel):
+    workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    run_avg_ms: float
+    run_max_ms: float
+
+
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
 
 
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+    # Tokens issued before token epochs existed have none, the epoch of every user then
+    epoch: int = 0
+
+
+class RefreshTokenRequest(SQLModel):
+    refresh_token: str
+
+
+# Only a hash of the token is stored. Tokens rotated from the same login share a family,
+# which is revoked as a whole when one of them is used twice.
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_tokens"
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    token_hash: str = Field(max_length=64, unique=True)
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    family_id: uuid.UUID = Field(index=True)
+    token_epoch: int
+    expires_at: datetime
+    used_at: datetime | None = None
+
+
+# Emails queued by the request handlers for the outbox worker, sent ones are deleted. Rows
+# that used up their attempts stay, with the last error, until someone looks at them. Only
+# the type of email and its non-secret context are stored, the email is rendered, with any
+# token it carries, when it is sent.
+class OutboxEmail(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    email_type: str = Field(max_length=40)
+    context: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB, nullable=False))
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    next_attempt_at: datetime = Field(index=True)
+    last_error: str | None = None
+    created_at: datetime
 
 
 class NewPassword(SQLModel):
@@ -113,11 +197,40 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=128)
 
 
+# Token bucket of the shared login throttling store, see app.core.throttle
+class RateLimitBucket(SQLModel, table=True):
+    __tablename__ = "rate_limit_buckets"
+    key: str = Field(primary_key=True, max_length=320)
+    tokens: float
+    updated_at: datetime = Field(index=True)
+
+
 # =============================================================
 # New domain models per CRUD specification
 # =============================================================
 
 
+# ------------------------- Bulk writes ------------------------
+BulkItemStatus = Literal["inserted", "updated", "unchanged", "skipped", "invalid_middah"]
+
+
+class BulkItemResult(SQLModel):
+    # Position of the item in the request body
+    index: int
+    status: BulkItemStatus
+    id: int | None = None
+
+
+class BulkUpsertResult(SQLModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    # Items whose sefaria_url appears again later in the same request, the last one wins
+    skipped: int
+    invalid_middah: int
+    items: list[BulkItemResult]
+
+
 # --------------------------- Middot ---------------------------
 class MiddahAttributes(SQLModel):
     name_transliterated: str = Field(max_length=80)
@@ -156,6 +269,11 @@ class ReminderPhraseRead(ReminderPhraseAttributes):
     updated_at: datetime
 
 
+class ReminderPhrasesPage(SQLModel):
+    data: list[ReminderPhraseRead]
+    next_cursor: str | None = None
+
+
 class ReminderPhrasePatch(SQLModel):
     middah: str | None = Field(default=None, max_length=80)
     text: str | None = None
@@ -163,7 +281,11 @@ class ReminderPhrasePatch(SQLModel):
 
 class ReminderPhrase(SQLModel, table=True):
     __tablename__ = "reminder_phrases"
-    __table_args__ = (UniqueConstraint("middah", "text", name="reminder_phrases_middah_text_uq"),)
+    __table_args__ = (
+        UniqueConstraint("middah", "text", name="reminder_phrases_middah_text_uq"),
+        Index("ix_reminder_phrases_middah_id", "middah", "id"),
+        Index("ix_reminder_phrases_updated_at_id", "updated_at", "id"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     middah: str = Field(foreign_key="middot.name_transliterated", max_length=80, nullable=False)
     text: str = Field(nullable=False)
@@ -171,6 +293,13 @@ class ReminderPhrase(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class ReminderPhrasesBulkResult(SQLModel):
+    inserted: int
+    skipped: int
+    invalid_middah: int
+    items: list[BulkItemResult]
+
+
 # ------------------------- Daily Texts ------------------------
 class DailyTextAttributes(SQLModel):
     # Required keys, values may be null
@@ -184,12 +313,22 @@ class DailyTextCreate(DailyTextAttributes):
     pass
 
 
+class DailyTextUpsert(DailyTextAttributes):
+    # The upsert key
+    sefaria_url: str
+
+
 class DailyTextRead(DailyTextAttributes):
     id: int
     created_at: datetime
     updated_at: datetime
 
 
+class DailyTextsPage(SQLModel):
+    data: list[DailyTextRead]
+    next_cursor: str | None = None
+
+
 class DailyTextPatch(SQLModel):
     middah: str | None = Field(default=None, max_length=80)
     sefaria_url: str | None = None
@@ -199,6 +338,10 @@ class DailyTextPatch(SQLModel):
 
 class DailyText(SQLModel, table=True):
     __tablename__ = "daily_texts"
+    __table_args__ = (
+        Index("ix_daily_texts_middah_id", "middah", "id"),
+        Index("ix_daily_texts_updated_at_id", "updated_at", "id"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     middah: str = Field(foreign_key="middot.name_transliterated", max_length=80, nullable=False)
     sefaria_url: str | None = Field(default=None, unique=True)
@@ -224,6 +367,11 @@ class KabbalahRead(KabbalahAttributes):
     updated_at: datetime
 
 
+class KabbalotPage(SQLModel):
+    data: list[KabbalahRead]
+    next_cursor: str | None = None
+
+
 class KabbalahPatch(SQLModel):
     middah: str | None = Field(default=None, max_length=80)
     description: str | None = None
@@ -233,6 +381,8 @@ class Kabbalah(SQLModel, table=True):
     __tablename__ = "kabbalot"
     __table_args__ = (
         UniqueConstraint("middah", "description", name="kabbalot_middah_description_uq"),
+        Index("ix_kabbalot_middah_id", "middah", "id"),
+        Index("ix_kabbalot_updated_at_id", "updated_at", "id"),
     )
     id: int | None = Field(default=None, primary_key=True)
     middah: str = Field(foreign_key="middot.name_transliterated", max_length=80, nullable=False)
@@ -241,6 +391,15 @@ class Kabbalah(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+# ------------------------ Middah Bundle -----------------------
+class MiddahBundle(SQLModel):
+    # Each section is the first page of the matching list endpoint filtered by middah
+    middah: MiddahRead
+    reminder_phrases: ReminderPhrasesPage
+    daily_texts: DailyTextsPage
+    kabbalot: KabbalotPage
+
+
 # ------------------------- Weekly Texts -----------------------
 class WeeklyTextAttributes(SQLModel):
     # Required keys, values may be null
@@ -253,12 +412,22 @@ class WeeklyTextCreate(WeeklyTextAttributes):
     pass
 
 
+class WeeklyTextUpsert(WeeklyTextAttributes):
+    # The upsert key
+    sefaria_url: str
+
+
 class WeeklyTextRead(WeeklyTextAttributes):
     id: int
     created_at: datetime
     updated_at: datetime
 
 
+class WeeklyTextsPage(SQLModel):
+    data: list[WeeklyTextRead]
+    next_cursor: str | None = None
+
+
 class WeeklyTextPatch(SQLModel):
     sefaria_url: str | None = None
     title: str | None = None
@@ -267,6 +436,7 @@ class WeeklyTextPatch(SQLModel):
 
 class WeeklyText(SQLModel, table=True):
     __tablename__ = "weekly_texts"
+    __table_args__ = (Index("ix_weekly_texts_updated_at_id", "updated_at", "id"),)
     id: int | None = Field(default=None, primary_key=True)
     sefaria_url: str | None = Field(default=None, unique=True)
     title: str | None = None
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import uuid
+from datetime import timedelta
+
+from emails.backend.smtp import SMTPBackend  # type: ignore[import-untyped, attr-defined, unused-ignore]
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import col, delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.crud import utc_now
+from app.models import OutboxEmail
+from app.utils import generate_email, send_email, smtp_backend
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Exponential backoff after the ``attempts``-th failed send of an email.
+    """
+    seconds = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def send_batch(smtp: SMTPBackend, emails: list[OutboxEmail]) -> dict[uuid.UUID, str | None]:
+    """
+    Send ``emails`` one after the other over ``smtp``, reusing its connection. Return the
+    error of each email by id, None for the ones sent.
+    """
+    errors: dict[uuid.UUID, str | None] = {}
+    for email in emails:
+        try:
+            email_data = generate_email(
+                email_type=email.email_type, email_to=email.email_to, context=email.context
+            )
+            send_email(
+                email_to=email.email_to,
+                subject=email_data.subject,
+                html_content=email_data.html_content,
+                smtp=smtp,
+            )
+            errors[email.id] = None
+        except Exception as e:
+            logger.warning(f"Sending email {email.id} failed: {e!r}")
+            errors[email.id] = repr(e)
+            # The connection may be left mid-transaction, the next send opens a new one
+            smtp.close()
+    return errors
+
+
+async def claim_due_emails(session: AsyncSession) -> list[OutboxEmail]:
+    """
+    Take up to EMAIL_OUTBOX_BATCH_SIZE emails due for an attempt, skipping the ones other
+    workers are claiming. Claimed emails are not due again before EMAIL_OUTBOX_LEASE_SECONDS,
+    so no transaction stays open while they are sent.
+    """
+    due = (
+        select(OutboxEmail.id)
+        .where(col(OutboxEmail.attempts) < settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+        .where(col(OutboxEmail.next_attempt_at) <= utc_now())
+        .order_by(col(OutboxEmail.next_attempt_at))
+        .limit(settings.EMAIL_OUTBOX_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    lease = timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    statement = (
+        update(OutboxEmail)
+        .where(col(OutboxEmail.id).in_(due))
+        .values(next_attempt_at=utc_now() + lease)
+        .returning(OutboxEmail)
+    )
+    emails: list[OutboxEmail] = (await session.exec(statement)).scalars().all()  # type: ignore
+    await session.commit()
+    return emails
+
+
+async def record_results(
+    session: AsyncSession, emails: list[OutboxEmail], errors: dict[uuid.UUID, str | None]
+) -> None:
+    sent = [email.id for email in emails if errors[email.id] is None]
+    if sent:
+        await session.exec(delete(OutboxEmail).where(col(OutboxEmail.id).in_(sent)))  # type: ignore
+    for email in emails:
+        error = errors[email.id]
+        if error is None:
+            continue
+        retry = (
+            update(OutboxEmail)
+            .where(col(OutboxEmail.id) == email.id)
+            .values(
+                attempts=email.attempts + 1,
+                last_error=error,
+                next_attempt_at=utc_now() + retry_delay(email.attempts + 1),
+            )
+        )
+        await session.exec(retry)  # type: ignore
+    await session.commit()
+
+
+async def process_outbox(session: AsyncSession, smtp: SMTPBackend) -> int:
+    """
+    Send one batch of due emails, return the number of emails attempted.
+    """
+    emails = await claim_due_emails(session)
+    if emails:
+        errors = await run_in_threadpool(send_batch, smtp, emails)
+        await record_results(session, emails, errors)
+    return len(emails)
+
+
+async def run_outbox_worker() -> None:
+    """
+    Send the queued emails until cancelled. The SMTP connection is kept open while there
+    are emails to send, and closed once the outbox is empty rather than left for the
+    relay to time out.
+    """
+    smtp = smtp_backend()
+    try:
+        while True:
+            try:
+                async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                    attempted = await process_outbox(session, smtp)
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                attempted = 0
+            if attempted == 0:
+                await run_in_threadpool(smtp.close)
+            if attempted < settings.EMAIL_OUTBOX_BATCH_SIZE:
+                await asyncio.sleep(settings.EMAIL_OUTBOX_POLL_SECONDS)
+    finally:
+        await run_in_threadpool(smtp.close)
@@ -6,7 +6,8 @@ from typing import Any
 
 import emails  # type: ignore
 import jwt
-from jinja2 import Template
+from emails.backend.smtp import SMTPBackend  # type: ignore[import-untyped, attr-defined, unused-ignore]
+from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemLoader, ModuleLoader
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
@@ -22,17 +23,65 @@ class EmailData:
     subject: str
 
 
+EMAIL_TEMPLATES_DIR = Path(__file__).parent / "email-templates" / "build"
+
+
+def build_email_templates(compiled_dir: str | None = None) -> Environment:
+    """
+    Jinja environment of the built email templates. Each template is compiled once and
+    kept, the files are not checked for changes again. Templates precompiled into
+    ``compiled_dir`` by scripts/compile_email_templates.py are used when it exists and
+    is newer than every HTML file, the others are compiled from their HTML.
+    """
+    loader: BaseLoader = FileSystemLoader(EMAIL_TEMPLATES_DIR)
+    if compiled_dir and Path(compiled_dir).is_dir():
+        compiled_at = Path(compiled_dir).stat().st_mtime
+        sources = EMAIL_TEMPLATES_DIR.glob("*.html")
+        if all(source.stat().st_mtime <= compiled_at for source in sources):
+            loader = ChoiceLoader([ModuleLoader(compiled_dir), loader])
+        else:
+            logger.warning(f"Ignoring {compiled_dir}, the email templates changed since")
+    return Environment(loader=loader, auto_reload=False)
+
+
+# Local development mounts app/ over the image, so its templates are read from source
+email_templates = build_email_templates(
+    None if settings.ENVIRONMENT == "local" else settings.EMAIL_TEMPLATES_COMPILED_DIR
+)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (Path(__file__).parent / "email-templates" / "build" / template_name).read_text()
-    html_content = Template(template_str).render(context)
+    html_content = email_templates.get_template(template_name).render(context)
     return html_content
 
 
+def smtp_options() -> dict[str, Any]:
+    smtp_options: dict[str, Any] = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
+    if settings.SMTP_TLS:
+        smtp_options["tls"] = True
+    elif settings.SMTP_SSL:
+        smtp_options["ssl"] = True
+    if settings.SMTP_USER:
+        smtp_options["user"] = settings.SMTP_USER
+    if settings.SMTP_PASSWORD:
+        smtp_options["password"] = settings.SMTP_PASSWORD
+    return smtp_options
+
+
+def smtp_backend() -> SMTPBackend:
+    """
+    An SMTP connection to reuse across sends, opened by the first one and kept until
+    closed. Sends through it raise on failure instead of only logging.
+    """
+    return SMTPBackend(fail_silently=False, **smtp_options())
+
+
 def send_email(
     *,
     email_to: str,
     subject: str = "",
     html_content: str = "",
+    smtp: SMTPBackend | None = None,
 ) -> None:
     assert settings.emails_enabled, "no provided configuration for email variables"
     message = emails.Message(
@@ -40,16 +89,7 @@ def send_email(
         html=html_content,
         mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
+    response = message.send(to=email_to, smtp=smtp or smtp_options())
     logger.info(f"send email result: {response}")
 
 
@@ -80,7 +120,7 @@ def generate_reset_password_email(email_to: str, email: str, token: str) -> Emai
     return EmailData(html_content=html_content, subject=subject)
 
 
-def generate_new_account_email(email_to: str, username: str, password: str) -> EmailData:
+def generate_new_account_email(email_to: str, username: str) -> EmailData:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - New account for user {username}"
     html_content = render_email_template(
@@ -88,7 +128,6 @@ def generate_new_account_email(email_to: str, username: str, password: str) -> E
         context={
             "project_name": settings.PROJECT_NAME,
             "username": username,
-            "password": password,
             "email": email_to,
             "link": settings.FRONTEND_HOST,
         },
@@ -96,6 +135,21 @@ def generate_new_account_email(email_to: str, username: str, password: str) -> E
     return EmailData(html_content=html_content, subject=subject)
 
 
+def generate_email(*, email_type: str, email_to: str, context: dict[str, Any]) -> EmailData:
+    """
+    Render an email queued in the outbox. Tokens are generated here, when the email is
+    sent, so the queued ``context`` holds nothing secret.
+    """
+    if email_type == "test_email":
+        return generate_test_email(email_to=email_to)
+    if email_type == "reset_password":
+        token = generate_password_reset_token(email=context["email"])
+        return generate_reset_password_email(email_to=email_to, email=context["email"], token=token)
+    if email_type == "new_account":
+        return generate_new_account_email(email_to=email_to, username=context["username"])
+    raise ValueError(f"Unknown email type {email_type!r}")
+
+
 def generate_password_reset_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.now(timezone.utc)
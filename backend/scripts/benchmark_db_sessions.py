@@ -0,0 +1,100 @@
+"""
+Compare request throughput of a sync route using SessionDep with an async route
+using AsyncSessionDep, both running the same query against the configured DB.
+
+Sync routes hold an AnyIO threadpool thread (40 by default) while they wait on
+Postgres, async routes only hold a pooled connection. --db-latency-ms adds a
+pg_sleep to each query to emulate a slower or remote database.
+
+Usage, from the backend directory with the DB running:
+
+    python scripts/benchmark_db_sessions.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Generator
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import Session, create_engine, func, select
+
+from app.api.deps import AsyncSessionDep, SessionDep, get_db
+from app.core.config import settings
+from app.core.db import async_engine, pool_options
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# The sync pool of the app is sized for the few sync routes left, this one gets the
+# size of the async pool so both routes can use as many connections
+sync_engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    **pool_options,
+)
+
+
+def get_sync_db() -> Generator[Session, None, None]:
+    with Session(sync_engine) as session:
+        yield session
+
+
+def build_app(db_latency: float) -> FastAPI:
+    bench_app = FastAPI()
+    bench_app.dependency_overrides[get_db] = get_sync_db
+    statement = select(func.pg_sleep(db_latency), func.now())
+
+    @bench_app.get("/sync")
+    def sync_route(session: SessionDep) -> Any:
+        return str(session.exec(statement).one()[1])
+
+    @bench_app.get("/async")
+    async def async_route(session: AsyncSessionDep) -> Any:
+        return str((await session.exec(statement)).one()[1])
+
+    return bench_app
+
+
+async def run(bench_app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        # Warm up the connection pools
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    bench_app = build_app(args.db_latency_ms / 1000)
+    logger.info(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"db latency {args.db_latency_ms}ms, pool {sync_engine.pool.status()}"
+    )
+    for path in ("/sync", "/async"):
+        elapsed = await run(bench_app, path, args.requests, args.concurrency)
+        logger.info(f"{path:>6}: {args.requests / elapsed:8.1f} req/s")
+    await async_engine.dispose()
+    sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
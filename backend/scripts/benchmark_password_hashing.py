@@ -0,0 +1,100 @@
+"""
+Measure password hash and verify latency at each cost setting, to pick
+PASSWORD_HASH_SCHEME and its cost on the hardware that serves the logins.
+
+A login costs one verify, a signup or password change one hash. Each setting is timed
+with the same context the app builds, and the median and worst of --repeat runs are
+reported. argon2 settings are skipped unless argon2-cffi is installed.
+
+Usage, from the backend directory:
+
+    python scripts/benchmark_password_hashing.py --bcrypt-rounds 10 11 12 13 \
+        --argon2 2:19456:1 3:65536:4
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.security import build_crypt_context
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+PASSWORD = "correct horse battery staple"
+
+
+def timings_ms(fn: Callable[[], Any], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def measure(label: str, scheme: str, repeat: int, **cost: int) -> None:
+    options = {
+        "bcrypt_rounds": 12,
+        "argon2_time_cost": 2,
+        "argon2_memory_cost": 19456,
+        "argon2_parallelism": 1,
+        **cost,
+    }
+    try:
+        context = build_crypt_context(scheme, **options)
+    except RuntimeError as e:
+        logger.info(f"{label:>24}: skipped, {e}")
+        return
+    hashed = context.hash(PASSWORD)
+    hash_ms = timings_ms(lambda: context.hash(PASSWORD), repeat)
+    verify_ms = timings_ms(lambda: context.verify(PASSWORD, hashed), repeat)
+    logger.info(
+        f"{label:>24}: hash median {statistics.median(hash_ms):7.1f}ms "
+        f"max {max(hash_ms):7.1f}ms  verify median {statistics.median(verify_ms):7.1f}ms "
+        f"max {max(verify_ms):7.1f}ms"
+    )
+
+
+def parse_argon2(value: str) -> tuple[int, int, int]:
+    try:
+        time_cost, memory_cost, parallelism = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected TIME:MEMORY_KIB:PARALLELISM, got {value!r}"
+        ) from None
+    return time_cost, memory_cost, parallelism
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13])
+    parser.add_argument(
+        "--argon2",
+        type=parse_argon2,
+        nargs="*",
+        default=[(2, 19456, 1), (3, 65536, 4)],
+        metavar="TIME:MEMORY_KIB:PARALLELISM",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.info(f"Median and max of {args.repeat} runs")
+    for rounds in args.bcrypt_rounds:
+        measure(f"bcrypt rounds={rounds}", "bcrypt", args.repeat, bcrypt_rounds=rounds)
+    for time_cost, memory_cost, parallelism in args.argon2:
+        measure(
+            f"argon2id {time_cost}:{memory_cost}:{parallelism}",
+            "argon2",
+            args.repeat,
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost,
+            argon2_parallelism=parallelism,
+        )
+
+
+if __name__ == "__main__":
+    main()
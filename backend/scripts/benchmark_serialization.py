@@ -0,0 +1,157 @@
+"""
+Compare the cost of turning ORM rows into a JSON response body for each response model.
+
+before: the route builds the response model, FastAPI validates it against response_model,
+        dumps it to Python objects and JSONResponse encodes them with json.dumps
+after:  app.api.responses.model_response validates once and encodes with pydantic-core
+
+No database is needed, the rows are built in memory. --content-size sets the length of
+the text fields, the dominant cost on the daily and weekly text lists.
+
+Usage, from the backend directory:
+
+    python scripts/benchmark_serialization.py --rows 500 --content-size 4000
+"""
+
+import argparse
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+from app.api.responses import model_response
+from app.models import (
+    DailyText,
+    DailyTextsPage,
+    Kabbalah,
+    KabbalotPage,
+    Middah,
+    MiddahRead,
+    ReminderPhrase,
+    ReminderPhrasesPage,
+    User,
+    UsersPublic,
+    WeeklyText,
+    WeeklyTextsPage,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+
+def build_cases(rows: int, content_size: int) -> dict[str, tuple[Any, Any]]:
+    """
+    Map each case to its response model and the content a route passes to model_response,
+    ORM rows wrapped in the envelope's fields.
+    """
+    now = datetime.now(timezone.utc)
+    text = "x" * content_size
+    timestamps = {"created_at": now, "updated_at": now}
+    return {
+        "MiddahRead": (
+            list[MiddahRead],
+            [
+                Middah(name_transliterated=f"m{i}", name_hebrew=f"מ{i}", name_english=f"e{i}")
+                for i in range(rows)
+            ],
+        ),
+        "ReminderPhrasesPage": (
+            ReminderPhrasesPage,
+            {
+                "data": [
+                    ReminderPhrase(id=i, middah="m", text=text, **timestamps) for i in range(rows)
+                ]
+            },
+        ),
+        "DailyTextsPage": (
+            DailyTextsPage,
+            {
+                "data": [
+                    DailyText(id=i, middah="m", sefaria_url=f"u{i}", content=text, **timestamps)
+                    for i in range(rows)
+                ]
+            },
+        ),
+        "KabbalotPage": (
+            KabbalotPage,
+            {
+                "data": [
+                    Kabbalah(id=i, middah="m", description=text, **timestamps) for i in range(rows)
+                ]
+            },
+        ),
+        "WeeklyTextsPage": (
+            WeeklyTextsPage,
+            {
+                "data": [
+                    WeeklyText(id=i, sefaria_url=f"u{i}", content=text, **timestamps)
+                    for i in range(rows)
+                ]
+            },
+        ),
+        "UsersPublic": (
+            UsersPublic,
+            {
+                "data": [
+                    User(id=uuid.uuid4(), email=f"user{i}@example.com", hashed_password="x")
+                    for i in range(rows)
+                ],
+                "count": rows,
+            },
+        ),
+    }
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare(name: str, response_type: Any, content: Any, repeat: int) -> None:
+    field = create_model_field(name=name, type_=response_type, mode="serialization")
+    adapter = TypeAdapter(response_type)
+
+    def before() -> bytes:
+        # The route builds the response model and returns it, then FastAPI's
+        # serialize_response validates and dumps it before the response encodes it
+        value = adapter.validate_python(content, from_attributes=True)
+        value, _ = field.validate(value, {}, loc=("response",))
+        return JSONResponse(field.serialize(value)).body
+
+    def after() -> bytes:
+        return bytes(model_response(response_type, content).body)
+
+    assert json.loads(before()) == json.loads(after())
+    before_ms = best_of(before, repeat) * 1000
+    after_ms = best_of(after, repeat) * 1000
+    logger.info(
+        f"{name:>20}: before {before_ms:8.2f}ms  after {after_ms:8.2f}ms  "
+        f"{before_ms / after_ms:5.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    logger.info(f"{args.rows} rows, content size {args.content_size}, best of {args.repeat}")
+    for name, (response_type, content) in build_cases(args.rows, args.content_size).items():
+        compare(name, response_type, content, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
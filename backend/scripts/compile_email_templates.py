@@ -0,0 +1,37 @@
+"""
+Precompile the built email templates into Python modules, loaded by the backend from
+EMAIL_TEMPLATES_COMPILED_DIR instead of compiling each template at its first render.
+
+Only Jinja is imported, so it runs at image build time without the app settings. The
+environment options must match the one of app.utils, which uses the defaults.
+
+Usage, from the backend directory:
+
+    python scripts/compile_email_templates.py /app/email-templates-compiled
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+EMAIL_TEMPLATES_DIR = Path(__file__).parent.parent / "app" / "email-templates" / "build"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("target", type=Path)
+    args = parser.parse_args()
+
+    environment = Environment(loader=FileSystemLoader(EMAIL_TEMPLATES_DIR))
+    args.target.mkdir(parents=True, exist_ok=True)
+    environment.compile_templates(args.target, zip=None, ignore_errors=False)
+    logger.info(f"Compiled {len(environment.list_templates())} templates into {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,8 @@
 set -e
 set -x
 
-# Let the DB start
+# Let the DB start and run migrations, skipped when already at the Alembic head
 python app/backend_pre_start.py
 
-# Run migrations
-alembic upgrade head
-
 # Create initial data in DB
 python app/initial_data.py
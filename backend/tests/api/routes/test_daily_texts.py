@@ -130,7 +130,7 @@ def test_list_daily_texts(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 2
+    assert len(content["data"]) == 2
 
     # Clean up
     crud.delete_daily_text(
@@ -142,6 +142,60 @@ def test_list_daily_texts(
     crud.delete_middah(session=Session(engine), name_transliterated=middah.name_transliterated)
 
 
+def test_list_daily_texts_filtered_by_middah(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    middah1 = crud.create_middah(
+        session=db_func,
+        middah_in={
+            "name_transliterated": "test_anavah",
+            "name_hebrew": "test_ענוה",
+            "name_english": "test_humility",
+        },
+    )
+    middah2 = crud.create_middah(
+        session=db_func,
+        middah_in={
+            "name_transliterated": "test_zerizut",
+            "name_hebrew": "test_זריזות",
+            "name_english": "test_alacrity",
+        },
+    )
+
+    data1 = crud.create_daily_text(
+        session=db_func,
+        daily_text_in={
+            "middah": middah1.name_transliterated,
+            "sefaria_url": "https://www.sefaria.org/test_filter1",
+            "title": "Test Daily Text Anavah",
+            "content": "Test content anavah",
+        },
+    )
+    data2 = crud.create_daily_text(
+        session=db_func,
+        daily_text_in={
+            "middah": middah2.name_transliterated,
+            "sefaria_url": "https://www.sefaria.org/test_filter2",
+            "title": "Test Daily Text Zerizut",
+            "content": "Test content zerizut",
+        },
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/daily_texts/",
+        headers=superuser_token_headers,
+        params={"middah": middah1.name_transliterated},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [row["id"] for row in content["data"]] == [data1.id]
+
+    # Clean up
+    crud.delete_daily_text(session=Session(engine), daily_text_id=data1.id)
+    crud.delete_daily_text(session=Session(engine), daily_text_id=data2.id)
+    crud.delete_middah(session=Session(engine), name_transliterated=middah1.name_transliterated)
+    crud.delete_middah(session=Session(engine), name_transliterated=middah2.name_transliterated)
+
+
 def test_delete_daily_text(
     client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
 ) -> None:
@@ -185,9 +239,67 @@ def test_delete_daily_text(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 0
+    assert len(content["data"]) == 0
 
     # Clean up
     crud.delete_middah(
         session=Session(engine), name_transliterated=middah.name_transliterated
     )
+
+
+def test_bulk_upsert_daily_texts(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    middah = crud.create_middah(
+        session=db_func,
+        middah_in={
+            "name_transliterated": "test_shtikah",
+            "name_hebrew": "test_שתיקה",
+            "name_english": "test_silence",
+        },
+    )
+    data = [
+        {
+            "middah": middah.name_transliterated,
+            "sefaria_url": "https://www.sefaria.org/test_bulk1",
+            "title": "Bulk Daily Text",
+            "content": "Bulk content",
+        },
+        {
+            "middah": "test_missing",
+            "sefaria_url": "https://www.sefaria.org/test_bulk2",
+            "title": "Daily Text of an unknown middah",
+            "content": "Bulk content",
+        },
+    ]
+    response = client.put(
+        f"{settings.API_V1_STR}/daily_texts/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["status"] for item in content["items"]] == ["inserted", "invalid_middah"]
+    daily_text_id = content["items"][0]["id"]
+
+    # Sending the same texts again changes nothing
+    response = client.put(
+        f"{settings.API_V1_STR}/daily_texts/bulk",
+        headers=superuser_token_headers,
+        json=data[:1],
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"index": 0, "status": "unchanged", "id": None}
+    ]
+
+    response = client.put(
+        f"{settings.API_V1_STR}/daily_texts/bulk",
+        headers=superuser_token_headers,
+        json=[{"middah": middah.name_transliterated, "title": "No URL", "content": "c"}],
+    )
+    assert response.status_code == 422
+
+    # Clean up
+    crud.delete_daily_text(session=Session(engine), daily_text_id=daily_text_id)
+    crud.delete_middah(session=Session(engine), name_transliterated=middah.name_transliterated)
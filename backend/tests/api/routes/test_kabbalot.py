@@ -118,7 +118,7 @@ def test_list_kabbalot(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 2
+    assert len(content["data"]) == 2
 
     # Clean up
     crud.delete_kabbalah(
@@ -171,7 +171,7 @@ def test_delete_kabbalah(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 0
+    assert len(content["data"]) == 0
 
     # Clean up
     crud.delete_middah(
@@ -1,12 +1,13 @@
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
+from httpx import Response
 from sqlmodel import Session
 
 from app.core.config import settings
-from app.core.security import verify_password
+from app.core.security import PasswordHashingBusy, verify_password
 from app.crud import create_user
-from app.models import UserCreate
+from app.models import User, UserCreate
 from app.utils import generate_password_reset_token
 from tests.utils.user import user_authentication_headers
 from tests.utils.utils import random_email, random_lower_string
@@ -22,6 +23,7 @@ def test_get_access_token(client: TestClient) -> None:
     assert r.status_code == 200
     assert "access_token" in tokens
     assert tokens["access_token"]
+    assert tokens["refresh_token"]
 
 
 def test_get_access_token_incorrect_password(client: TestClient) -> None:
@@ -33,6 +35,99 @@ def test_get_access_token_incorrect_password(client: TestClient) -> None:
     assert r.status_code == 400
 
 
+def test_get_access_token_password_hashing_busy(client: TestClient) -> None:
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    with patch(
+        "app.core.security.password_hasher.run", side_effect=PasswordHashingBusy
+    ):
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+
+def test_get_access_token_throttled(client: TestClient) -> None:
+    login_data = {
+        "username": random_email(),
+        "password": "incorrect",
+    }
+    with patch("app.crud.authenticate_async", return_value=None) as authenticate:
+        for _ in range(settings.THROTTLE_EMAIL_CAPACITY):
+            r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+            assert r.status_code == 400
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) > 0
+    # Rejected before looking the user up
+    assert authenticate.call_count == settings.THROTTLE_EMAIL_CAPACITY
+
+
+def login_new_user(client: TestClient, db: Session) -> tuple[User, dict[str, str]]:
+    email = random_email()
+    password = random_lower_string()
+    user = create_user(session=db, user_create=UserCreate(email=email, password=password))
+    r = client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": email, "password": password},
+    )
+    assert r.status_code == 200
+    return user, r.json()
+
+
+def refresh(client: TestClient, refresh_token: str) -> Response:
+    return client.post(
+        f"{settings.API_V1_STR}/login/refresh-token", json={"refresh_token": refresh_token}
+    )
+
+
+def test_refresh_token_rotation(client: TestClient, db: Session) -> None:
+    _, tokens = login_new_user(client, db)
+
+    r = refresh(client, tokens["refresh_token"])
+    assert r.status_code == 200
+    rotated = r.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+
+    r = refresh(client, rotated["refresh_token"])
+    assert r.status_code == 200
+
+
+def test_refresh_token_reuse_revokes_family(client: TestClient, db: Session) -> None:
+    _, tokens = login_new_user(client, db)
+    r = refresh(client, tokens["refresh_token"])
+    assert r.status_code == 200
+    rotated = r.json()
+
+    with patch("app.core.config.settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS", -1):
+        r = refresh(client, tokens["refresh_token"])
+    assert r.status_code == 401
+    # The token the first use returned is revoked with the rest of its family
+    r = refresh(client, rotated["refresh_token"])
+    assert r.status_code == 401
+
+
+def test_refresh_token_invalid(client: TestClient) -> None:
+    r = refresh(client, "invalid")
+    assert r.status_code == 401
+
+
+def test_revoke_tokens(client: TestClient, db: Session) -> None:
+    _, tokens = login_new_user(client, db)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    r = client.post(f"{settings.API_V1_STR}/login/revoke-tokens", headers=headers)
+    assert r.status_code == 200
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 403
+    r = refresh(client, tokens["refresh_token"])
+    assert r.status_code == 401
+
+
 def test_use_access_token(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -101,6 +196,10 @@ def test_reset_password(client: TestClient, db: Session) -> None:
     db.refresh(user)
     assert verify_password(new_password, user.hashed_password)
 
+    # Tokens issued before the reset are revoked
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 403
+
 
 def test_reset_password_invalid_token(
     client: TestClient, superuser_token_headers: dict[str, str]
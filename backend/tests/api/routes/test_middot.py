@@ -3,6 +3,7 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app import crud
+from app.core.cache import middot_cache
 from app.core.db import engine
 from app.core.config import settings
 
@@ -119,4 +120,112 @@ def test_delete_middah(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 0
\ No newline at end of file
+    assert len(content) == 0
+
+def test_middot_served_from_cache(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(f"{settings.API_V1_STR}/middot/", headers=superuser_token_headers)
+    assert response.status_code == 200
+
+    data = {"name_transliterated": "test_chesed",
+            "name_hebrew": "test_חסד",
+            "name_english": "test_kindness"}
+    response = client.post(
+        f"{settings.API_V1_STR}/middot/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+
+    # The cache is refreshed by the create, and then answers the reads
+    hits = middot_cache.stats().hits
+    response = client.get(
+        f"{settings.API_V1_STR}/middot/{data['name_transliterated']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == data
+    response = client.get(f"{settings.API_V1_STR}/middot/", headers=superuser_token_headers)
+    assert data in response.json()
+    assert middot_cache.stats().hits == hits + 2
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/middot/{data['name_transliterated']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 204
+    response = client.get(
+        f"{settings.API_V1_STR}/middot/{data['name_transliterated']}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_get_middah_bundle(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    middah = crud.create_middah(
+        session=db_func,
+        middah_in={"name_transliterated": "test_savlanut",
+        "name_hebrew": "test_סבלנות",
+        "name_english": "test_patience"}
+    )
+    phrases = [
+        crud.create_reminder_phrase(
+            session=db_func,
+            reminder_phrase_in={"middah": middah.name_transliterated, "text": f"Phrase {i}"},
+        )
+        for i in range(3)
+    ]
+    daily_text = crud.create_daily_text(
+        session=db_func,
+        daily_text_in={
+            "middah": middah.name_transliterated,
+            "sefaria_url": "https://www.sefaria.org/bundle1",
+            "title": "Bundle Daily Text",
+            "content": "Bundle daily text content",
+        },
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/middot/{middah.name_transliterated}/bundle",
+        headers=superuser_token_headers,
+        params={"reminder_phrases_limit": 2},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["middah"]["name_transliterated"] == middah.name_transliterated
+    assert [p["id"] for p in content["reminder_phrases"]["data"]] == [p.id for p in phrases[:2]]
+    assert content["reminder_phrases"]["next_cursor"] is not None
+    assert [t["id"] for t in content["daily_texts"]["data"]] == [daily_text.id]
+    assert content["daily_texts"]["data"][0]["title"] == "Bundle Daily Text"
+    assert content["daily_texts"]["next_cursor"] is None
+    assert content["kabbalot"] == {"data": [], "next_cursor": None}
+
+    # The cursor continues the section through the list endpoint
+    response = client.get(
+        f"{settings.API_V1_STR}/reminder_phrases/",
+        headers=superuser_token_headers,
+        params={
+            "middah": middah.name_transliterated,
+            "after": content["reminder_phrases"]["next_cursor"],
+        },
+    )
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["data"]] == [phrases[2].id]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/middot/test_missing/bundle",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+
+    # Clean up
+    for phrase in phrases:
+        crud.delete_reminder_phrase(session=Session(engine), reminder_phrase_id=phrase.id)
+    crud.delete_daily_text(session=Session(engine), daily_text_id=daily_text.id)
+    crud.delete_middah(
+        session=Session(engine),
+        name_transliterated=middah.name_transliterated
+    )
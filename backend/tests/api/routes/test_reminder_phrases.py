@@ -118,7 +118,7 @@ def test_list_reminder_phrases(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 2
+    assert len(content["data"]) == 2
 
     # Clean up
     crud.delete_reminder_phrase(
@@ -130,6 +130,79 @@ def test_list_reminder_phrases(
     crud.delete_middah(session=Session(engine), name_transliterated=middah.name_transliterated)
 
 
+def test_list_reminder_phrases_paginated(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    middah = crud.create_middah(
+        session=db_func,
+        middah_in={
+            "name_transliterated": "test_savlanut",
+            "name_hebrew": "test_סבלנות",
+            "name_english": "test_patience",
+        },
+    )
+    phrases = [
+        crud.create_reminder_phrase(
+            session=db_func,
+            reminder_phrase_in={
+                "middah": middah.name_transliterated,
+                "text": f"Test paginated reminder phrase {i}",
+            },
+        )
+        for i in range(3)
+    ]
+
+    for order_by in ("id", "updated_at"):
+        seen_ids = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "order_by": order_by}
+            if cursor:
+                params["after"] = cursor
+            response = client.get(
+                f"{settings.API_V1_STR}/reminder_phrases/",
+                headers=superuser_token_headers,
+                params=params,
+            )
+            assert response.status_code == 200
+            content = response.json()
+            assert len(content["data"]) <= 2
+            seen_ids.extend(row["id"] for row in content["data"])
+            cursor = content["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(seen_ids) == sorted(phrase.id for phrase in phrases)
+        assert len(seen_ids) == len(set(seen_ids))
+
+    # Clean up
+    for phrase in phrases:
+        crud.delete_reminder_phrase(session=Session(engine), reminder_phrase_id=phrase.id)
+    crud.delete_middah(session=Session(engine), name_transliterated=middah.name_transliterated)
+
+
+def test_list_reminder_phrases_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/reminder_phrases/",
+        headers=superuser_token_headers,
+        params={"after": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_list_reminder_phrases_limit_above_max(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/reminder_phrases/",
+        headers=superuser_token_headers,
+        params={"limit": settings.PAGINATION_MAX_LIMIT + 1},
+    )
+    assert response.status_code == 422
+
+
 def test_delete_reminder_phrase(
     client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
 ) -> None:
@@ -171,9 +244,89 @@ def test_delete_reminder_phrase(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 0
+    assert len(content["data"]) == 0
 
     # Clean up
     crud.delete_middah(
         session=Session(engine), name_transliterated=middah.name_transliterated
     )
+
+
+def test_bulk_create_reminder_phrases(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    middah = crud.create_middah(
+        session=db_func,
+        middah_in={
+            "name_transliterated": "test_zerizut",
+            "name_hebrew": "test_זריזות",
+            "name_english": "test_alacrity",
+        },
+    )
+    existing = crud.create_reminder_phrase(
+        session=db_func,
+        reminder_phrase_in={"middah": middah.name_transliterated, "text": "Existing phrase"},
+    )
+
+    data = [
+        {"middah": middah.name_transliterated, "text": "New phrase 1"},
+        {"middah": middah.name_transliterated, "text": "Existing phrase"},
+        {"middah": "test_missing", "text": "Phrase of an unknown middah"},
+        {"middah": middah.name_transliterated, "text": "New phrase 2"},
+        {"middah": middah.name_transliterated, "text": "New phrase 1"},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/reminder_phrases/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["inserted"] == 2
+    assert content["skipped"] == 2
+    assert content["invalid_middah"] == 1
+    assert [item["status"] for item in content["items"]] == [
+        "inserted",
+        "skipped",
+        "invalid_middah",
+        "inserted",
+        "skipped",
+    ]
+    inserted_ids = [item["id"] for item in content["items"] if item["status"] == "inserted"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/reminder_phrases/",
+        headers=superuser_token_headers,
+        params={"middah": middah.name_transliterated},
+    )
+    texts = [phrase["text"] for phrase in response.json()["data"]]
+    assert texts == ["Existing phrase", "New phrase 1", "New phrase 2"]
+
+    # Clean up
+    for reminder_phrase_id in [existing.id, *inserted_ids]:
+        crud.delete_reminder_phrase(
+            session=Session(engine), reminder_phrase_id=reminder_phrase_id
+        )
+    crud.delete_middah(session=Session(engine), name_transliterated=middah.name_transliterated)
+
+
+def test_bulk_create_reminder_phrases_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/reminder_phrases/bulk",
+        headers=normal_user_token_headers,
+        json=[{"middah": "test_missing", "text": "Phrase"}],
+    )
+    assert response.status_code == 403
+
+
+def test_bulk_create_reminder_phrases_empty(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/reminder_phrases/bulk",
+        headers=superuser_token_headers,
+        json=[],
+    )
+    assert response.status_code == 422
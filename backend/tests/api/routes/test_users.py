@@ -5,9 +5,11 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
 from app import crud
+from app.core.cache import user_cache
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import Item, ItemCreate, User, UserCreate
+from tests.utils.user import user_authentication_headers
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -191,43 +193,55 @@ def test_update_user_me(
     assert user_db.full_name == full_name
 
 
-def test_update_password_me(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
-) -> None:
+def test_update_password_me(client: TestClient, db: Session) -> None:
+    # A user of its own, the change signs out the tokens of the user shared by the module
+    email = random_email()
+    password = random_lower_string()
+    crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    r = client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": email, "password": password},
+    )
+    old_tokens = r.json()
+    headers = {"Authorization": f"Bearer {old_tokens['access_token']}"}
+
     new_password = random_lower_string()
     data = {
-        "current_password": settings.FIRST_SUPERUSER_PASSWORD,
+        "current_password": password,
         "new_password": new_password,
     }
     r = client.patch(
         f"{settings.API_V1_STR}/users/me/password",
-        headers=superuser_token_headers,
+        headers=headers,
         json=data,
     )
     assert r.status_code == 200
-    updated_user = r.json()
-    assert updated_user["message"] == "Password updated successfully"
+    tokens = r.json()
+    assert tokens["access_token"]
+    assert tokens["refresh_token"]
 
-    user_query = select(User).where(User.email == settings.FIRST_SUPERUSER)
+    user_query = select(User).where(User.email == email)
     user_db = db.exec(user_query).first()
     assert user_db
-    assert user_db.email == settings.FIRST_SUPERUSER
+    assert user_db.email == email
     assert verify_password(new_password, user_db.hashed_password)
 
-    # Revert to the old password to keep consistency in test
-    old_data = {
-        "current_password": new_password,
-        "new_password": settings.FIRST_SUPERUSER_PASSWORD,
-    }
-    r = client.patch(
-        f"{settings.API_V1_STR}/users/me/password",
-        headers=superuser_token_headers,
-        json=old_data,
+    # Tokens issued before the change are revoked, the returned ones work
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 403
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": old_tokens["refresh_token"]},
+    )
+    assert r.status_code == 401
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+    r = client.post(
+        f"{settings.API_V1_STR}/login/refresh-token",
+        json={"refresh_token": tokens["refresh_token"]},
     )
-    db.refresh(user_db)
-
     assert r.status_code == 200
-    assert verify_password(settings.FIRST_SUPERUSER_PASSWORD, user_db.hashed_password)
 
 
 def test_update_password_me_incorrect_password(
@@ -444,6 +458,52 @@ def test_delete_user_super_user(
     assert result is None
 
 
+def test_delete_user_super_user_with_items(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    user_id = user.id
+    for _ in range(3):
+        crud.create_item(
+            session=db, item_in=ItemCreate(title=random_lower_string()), owner_id=user_id
+        )
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{user_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert db.exec(select(User).where(User.id == user_id)).first() is None
+    assert db.exec(select(Item).where(Item.owner_id == user_id)).first() is None
+
+
+def test_delete_user_super_user_background(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    user_id = user.id
+    for _ in range(5):
+        crud.create_item(
+            session=db, item_in=ItemCreate(title=random_lower_string()), owner_id=user_id
+        )
+    # Several batches, the TestClient runs the purge before returning the response
+    with patch("app.core.config.settings.USER_PURGE_BATCH_SIZE", 2):
+        r = client.delete(
+            f"{settings.API_V1_STR}/users/{user_id}",
+            headers=superuser_token_headers,
+            params={"background": True},
+        )
+    assert r.status_code == 202
+    assert r.json()["message"] == "User deletion scheduled"
+    assert db.exec(select(User).where(User.id == user_id)).first() is None
+    assert db.exec(select(Item).where(Item.owner_id == user_id)).first() is None
+
+
 def test_delete_user_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -484,3 +544,29 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_update_user_invalidates_cached_user(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    headers = user_authentication_headers(client=client, email=username, password=password)
+
+    r = client.get(f"{settings.API_V1_STR}/middot/", headers=headers)
+    assert r.status_code == 200
+    assert user_cache.get(user.id) is not None
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"is_active": False},
+    )
+    assert r.status_code == 200
+    assert user_cache.get(user.id) is None
+
+    r = client.get(f"{settings.API_V1_STR}/middot/", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
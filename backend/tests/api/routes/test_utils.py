@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.core.db import get_pool_stats
+
+
+def test_db_pool_stats(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    before = get_pool_stats()
+    # Authenticating without the cache loads the superuser through the async session
+    user_cache.clear()
+    r = client.get(f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    pools = r.json()
+    assert pools.keys() == {"primary", "primary_sync"}
+    primary = pools["primary"]
+    assert primary["pool_size"] == settings.POSTGRES_POOL_SIZE
+    assert primary["max_overflow"] == settings.POSTGRES_MAX_OVERFLOW
+    # The session is only closed once the response is sent, its connection is still out
+    assert primary["checked_out"] >= 1
+    assert primary["checkouts"] > before["primary"].checkouts
+    primary_sync = pools["primary_sync"]
+    assert primary_sync["pool_size"] == settings.POSTGRES_SYNC_POOL_SIZE
+    assert primary_sync["checkouts"] == before["primary_sync"].checkouts
+
+
+def test_db_pool_stats_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/db-pool/", headers=normal_user_token_headers)
+    assert r.status_code == 403
+
+
+def test_cache_stats(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/cache-stats/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    users = r.json()["users"]
+    assert users["maxsize"] == settings.USER_CACHE_MAX_SIZE
+    assert users["hits"] + users["misses"] >= 1
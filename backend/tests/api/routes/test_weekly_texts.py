@@ -1,3 +1,7 @@
+import csv
+import io
+import json
+
 from fastapi.testclient import TestClient
 
 from sqlmodel import Session
@@ -92,7 +96,7 @@ def test_list_weekly_texts(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 2
+    assert len(content["data"]) == 2
 
     # Clean up
     crud.delete_weekly_text(
@@ -135,4 +139,194 @@ def test_delete_weekly_text(
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content) == 0
+    assert len(content["data"]) == 0
+
+
+def test_get_weekly_text_conditional(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    weekly_text = crud.create_weekly_text(
+        session=db_func,
+        weekly_text_in={
+            "sefaria_url": "https://www.sefaria.org/weekly6",
+            "title": "Test Weekly Text",
+            "content": "Test content for conditional get",
+        },
+    )
+    url = f"{settings.API_V1_STR}/weekly_texts/{weekly_text.id}"
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    # A write changes the validators
+    response = client.patch(
+        url, headers=superuser_token_headers, json={"title": "Updated Title"}
+    )
+    assert response.status_code == 200
+    response = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Updated Title"
+
+    # Clean up
+    crud.delete_weekly_text(
+        session=Session(engine), weekly_text_id=weekly_text.id
+    )
+
+
+def test_list_weekly_texts_conditional(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    url = f"{settings.API_V1_STR}/weekly_texts/"
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Another page has its own ETag
+    response = client.get(url, headers=superuser_token_headers, params={"limit": 1})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    weekly_text = crud.create_weekly_text(
+        session=db_func,
+        weekly_text_in={
+            "sefaria_url": "https://www.sefaria.org/weekly7",
+            "title": "Test Weekly Text",
+            "content": "Test content for conditional list",
+        },
+    )
+    response = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["data"]) == 1
+
+    # Clean up
+    crud.delete_weekly_text(
+        session=Session(engine), weekly_text_id=weekly_text.id
+    )
+
+
+def test_bulk_upsert_weekly_texts(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    existing = crud.create_weekly_text(
+        session=db_func,
+        weekly_text_in={
+            "sefaria_url": "https://www.sefaria.org/weekly8",
+            "title": "Existing Weekly Text",
+            "content": "Existing content",
+        },
+    )
+    unchanged = crud.create_weekly_text(
+        session=db_func,
+        weekly_text_in={
+            "sefaria_url": "https://www.sefaria.org/weekly9",
+            "title": "Unchanged Weekly Text",
+            "content": "Unchanged content",
+        },
+    )
+
+    data = [
+        {
+            "sefaria_url": "https://www.sefaria.org/weekly8",
+            "title": "Existing Weekly Text",
+            "content": "Updated content",
+        },
+        {
+            "sefaria_url": "https://www.sefaria.org/weekly9",
+            "title": "Unchanged Weekly Text",
+            "content": "Unchanged content",
+        },
+        {
+            "sefaria_url": "https://www.sefaria.org/weekly10",
+            "title": "New Weekly Text",
+            "content": "First version",
+        },
+        {
+            "sefaria_url": "https://www.sefaria.org/weekly10",
+            "title": "New Weekly Text",
+            "content": "Last version",
+        },
+    ]
+    response = client.put(
+        f"{settings.API_V1_STR}/weekly_texts/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["status"] for item in content["items"]] == [
+        "updated",
+        "unchanged",
+        "skipped",
+        "inserted",
+    ]
+    assert (content["inserted"], content["updated"], content["unchanged"]) == (1, 1, 1)
+    assert content["items"][0]["id"] == existing.id
+    new_id = content["items"][3]["id"]
+
+    session = Session(engine)
+    updated = session.get(WeeklyText, existing.id)
+    assert updated.content == "Updated content"
+    assert updated.updated_at > existing.updated_at
+    assert session.get(WeeklyText, unchanged.id).updated_at == unchanged.updated_at
+    assert session.get(WeeklyText, new_id).content == "Last version"
+    session.close()
+
+    # Clean up
+    for weekly_text_id in (existing.id, unchanged.id, new_id):
+        crud.delete_weekly_text(session=Session(engine), weekly_text_id=weekly_text_id)
+
+
+def test_export_weekly_texts(
+    client: TestClient, superuser_token_headers: dict[str, str], db_func: Session
+) -> None:
+    weekly_texts = [
+        crud.create_weekly_text(
+            session=db_func,
+            weekly_text_in={
+                "sefaria_url": f"https://www.sefaria.org/export{i}",
+                "title": f"Exported Weekly Text {i}",
+                "content": "Line one, with a comma\nLine two",
+            },
+        )
+        for i in range(3)
+    ]
+    url = f"{settings.API_V1_STR}/weekly_texts/export"
+
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [w.id for w in weekly_texts]
+    assert rows[0]["content"] == "Line one, with a comma\nLine two"
+
+    response = client.get(url, headers=superuser_token_headers, params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [w.id for w in weekly_texts]
+    assert rows[2]["title"] == "Exported Weekly Text 2"
+    assert rows[2]["content"] == "Line one, with a comma\nLine two"
+
+    response = client.get(url, headers=superuser_token_headers, params={"format": "xml"})
+    assert response.status_code == 422
+
+    # Clean up
+    for weekly_text in weekly_texts:
+        crud.delete_weekly_text(session=Session(engine), weekly_text_id=weekly_text.id)
@@ -0,0 +1,186 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, col, delete
+
+from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.models import DailyText, ReminderPhrase, WeeklyText
+
+# Each resource with a create payload, without its middah, and a patch payload
+CONTENT_RESOURCES = [
+    (
+        "reminder_phrases",
+        True,
+        {"text": "test statement count"},
+        {"text": "test statement count patched"},
+    ),
+    (
+        "daily_texts",
+        True,
+        {
+            "sefaria_url": "https://www.sefaria.org/test_statement_count",
+            "title": "Test Daily Text Title",
+            "content": "Test daily text content",
+        },
+        {"content": "Test daily text content patched"},
+    ),
+    (
+        "kabbalot",
+        True,
+        {"description": "test statement count"},
+        {"description": "test statement count patched"},
+    ),
+    (
+        "weekly_texts",
+        False,
+        {
+            "sefaria_url": "https://www.sefaria.org/weekly_statement_count",
+            "title": "Test Weekly Text Title",
+            "content": "Test weekly text content",
+        },
+        {"content": "Test weekly text content patched"},
+    ),
+]
+
+
+@contextmanager
+def count_statements() -> Iterator[list[str]]:
+    """
+    Collect the SQL statements sent on the primary engine, BEGIN and COMMIT are not
+    statements sent through a cursor and are not collected.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="module")
+def middah_name(client: TestClient, superuser_token_headers: dict[str, str]) -> Iterator[str]:
+    data = {
+        "name_transliterated": "test_zerizut",
+        "name_hebrew": "test_זריזות",
+        "name_english": "test_alacrity",
+    }
+    # Fills the user cache, so the statements counted are only the writes
+    response = client.get(f"{settings.API_V1_STR}/middot/", headers=superuser_token_headers)
+    assert response.status_code == 200
+
+    with count_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/middot/", headers=superuser_token_headers, json=data
+        )
+    assert response.status_code == 200
+    assert len(statements) == 1, statements
+    yield data["name_transliterated"]
+
+    with count_statements() as statements:
+        response = client.delete(
+            f"{settings.API_V1_STR}/middot/{data['name_transliterated']}",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 204
+    assert len(statements) == 1, statements
+
+
+@pytest.mark.parametrize("resource, references_middah, create_data, patch_data", CONTENT_RESOURCES)
+def test_content_writes_are_one_statement(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    middah_name: str,
+    resource: str,
+    references_middah: bool,
+    create_data: dict[str, str],
+    patch_data: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/{resource}/"
+    if references_middah:
+        create_data = {"middah": middah_name, **create_data}
+
+    with count_statements() as statements:
+        response = client.post(url, headers=superuser_token_headers, json=create_data)
+    assert response.status_code == 200
+    created = response.json()
+    assert len(statements) == 1, statements
+
+    with count_statements() as statements:
+        response = client.patch(
+            f"{url}{created['id']}", headers=superuser_token_headers, json=patch_data
+        )
+    assert response.status_code == 200
+    patched = response.json()
+    assert patched.items() >= patch_data.items()
+    assert patched["created_at"] == created["created_at"]
+    assert patched["updated_at"] >= created["updated_at"]
+    assert len(statements) == 1, statements
+
+    with count_statements() as statements:
+        response = client.delete(f"{url}{created['id']}", headers=superuser_token_headers)
+    assert response.status_code == 204
+    assert len(statements) == 1, statements
+
+    with count_statements() as statements:
+        response = client.patch(
+            f"{url}{created['id']}", headers=superuser_token_headers, json=patch_data
+        )
+    assert response.status_code == 404
+    assert len(statements) == 1, statements
+
+
+def test_bulk_writes_statement_count(
+    client: TestClient, superuser_token_headers: dict[str, str], middah_name: str
+) -> None:
+    # The middot referenced are locked by one statement before the single write
+    with count_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/reminder_phrases/bulk",
+            headers=superuser_token_headers,
+            json=[{"middah": middah_name, "text": f"test bulk statement {i}"} for i in range(3)],
+        )
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+    assert len(statements) == 2, statements
+
+    texts = [
+        {
+            "sefaria_url": f"https://www.sefaria.org/test_bulk_statement_{i}",
+            "title": "Test Title",
+            "content": "Test content",
+        }
+        for i in range(3)
+    ]
+    with count_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/daily_texts/bulk",
+            headers=superuser_token_headers,
+            json=[{"middah": middah_name, **text} for text in texts],
+        )
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+    assert len(statements) == 2, statements
+
+    with count_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/weekly_texts/bulk", headers=superuser_token_headers, json=texts
+        )
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+    assert len(statements) == 1, statements
+
+    with Session(engine) as session:
+        session.execute(delete(ReminderPhrase).where(col(ReminderPhrase.middah) == middah_name))
+        session.execute(delete(DailyText).where(col(DailyText.middah) == middah_name))
+        sefaria_urls = [text["sefaria_url"] for text in texts]
+        session.execute(delete(WeeklyText).where(col(WeeklyText.sefaria_url).in_(sefaria_urls)))
+        session.commit()
@@ -0,0 +1,93 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.cache import TTLCache
+from app.middleware import CompressionMiddleware, negotiate_encoding
+
+BODY = "שלום, hello. " * 200
+
+
+def make_client(cache: TTLCache[tuple[str, str, str, str], bytes] | None = None) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=500, gzip_level=6, brotli_quality=4, cache=cache
+    )
+
+    @app.get("/large")
+    def large() -> Response:
+        return Response(BODY, headers={"ETag": 'W/"1"'}, media_type="text/plain")
+
+    @app.get("/small")
+    def small() -> Response:
+        return Response("small", media_type="text/plain")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse((BODY for _ in range(3)), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") in {"br", "gzip"}
+
+
+def test_compress_large_response() -> None:
+    client = make_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(BODY.encode())
+    assert response.text == BODY
+
+
+def test_skip_small_or_unaccepted_response() -> None:
+    client = make_client()
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "small"
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BODY
+
+
+def test_compress_with_brotli() -> None:
+    # The test client decodes br itself once brotli is installed
+    pytest.importorskip("brotli")
+    client = make_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert int(response.headers["content-length"]) < len(BODY.encode())
+    assert response.text == BODY
+    response = client.get("/stream", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == BODY * 3
+
+
+def test_compress_streamed_response() -> None:
+    client = make_client()
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY * 3
+
+
+def test_reuse_compressed_body_for_same_etag() -> None:
+    cache: TTLCache[tuple[str, str, str, str], bytes] = TTLCache(
+        name="test_compressed", register=False, maxsize=4, ttl=60
+    )
+    client = make_client(cache)
+    client.get("/large", headers={"Accept-Encoding": "gzip"})
+    key = ("gzip", "/large", "", 'W/"1"')
+    assert gzip.decompress(cache.get(key) or b"") == BODY.encode()
+    hits = cache.stats().hits
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.text == BODY
+    assert cache.stats().hits == hits + 1
@@ -0,0 +1,90 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.deps import decode_token, should_read_from_primary
+from app.core.cache import token_cache
+from app.core.security import create_access_token
+from app.middleware import READ_PRIMARY_COOKIE, ReadPrimaryAfterWriteMiddleware
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope)
+
+
+def test_read_from_replica_by_default() -> None:
+    assert should_read_from_primary(make_request({})) is False
+
+
+def test_read_from_primary_after_write() -> None:
+    cookie = f"{READ_PRIMARY_COOKIE}={time.time() + 5}"
+    assert should_read_from_primary(make_request({"cookie": cookie})) is True
+
+
+def test_read_from_replica_once_write_window_expired() -> None:
+    cookie = f"{READ_PRIMARY_COOKIE}={time.time() - 1}"
+    assert should_read_from_primary(make_request({"cookie": cookie})) is False
+
+
+def test_read_from_primary_with_no_cache() -> None:
+    assert should_read_from_primary(make_request({"cache-control": "no-cache"})) is True
+
+
+def test_write_sets_read_primary_cookie() -> None:
+    app = FastAPI()
+    app.add_middleware(ReadPrimaryAfterWriteMiddleware, window_seconds=5)
+
+    @app.get("/read")
+    def read() -> bool:
+        return True
+
+    @app.post("/write")
+    def write() -> bool:
+        return True
+
+    with TestClient(app) as c:
+        assert READ_PRIMARY_COOKIE not in c.get("/read").cookies
+        r = c.post("/write")
+        assert float(r.cookies[READ_PRIMARY_COOKIE]) > time.time()
+
+
+def test_decode_token_is_cached() -> None:
+    token_cache.clear()
+    token = create_access_token(uuid.uuid4(), expires_delta=timedelta(minutes=5))
+    misses = token_cache.misses
+    hits = token_cache.hits
+    assert decode_token(token) == decode_token(token)
+    assert token_cache.misses == misses + 1
+    assert token_cache.hits == hits + 1
+
+
+def test_decode_token_cache_expires_with_token() -> None:
+    token_cache.clear()
+    token = create_access_token(uuid.uuid4(), expires_delta=timedelta(seconds=2))
+    decode_token(token)
+    hits = token_cache.hits
+    with patch("app.core.cache.time.monotonic", return_value=time.monotonic() + 3):
+        decode_token(token)
+    assert token_cache.hits == hits
+
+
+def test_decode_token_rejects_invalid_tokens_uncached() -> None:
+    token_cache.clear()
+    expired = create_access_token(uuid.uuid4(), expires_delta=timedelta(seconds=-1))
+    for token in [expired, "invalid"]:
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(token)
+        assert exc_info.value.status_code == 403
+    assert token_cache.stats().size == 0
@@ -0,0 +1,50 @@
+import json
+from datetime import datetime, timezone
+
+from app.api.responses import PydanticJSONResponse, model_response
+from app.models import DailyText, DailyTextsPage, User, UsersPublic
+
+
+def test_model_response_encodes_orm_rows() -> None:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    row = DailyText(
+        id=1,
+        middah="test",
+        sefaria_url=None,
+        title="t",
+        content="תוכן",
+        created_at=now,
+        updated_at=now,
+    )
+    response = model_response(
+        DailyTextsPage, {"data": [row], "next_cursor": None}, headers={"ETag": 'W/"1"'}
+    )
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == 'W/"1"'
+    assert json.loads(response.body) == {
+        "data": [
+            {
+                "id": 1,
+                "middah": "test",
+                "sefaria_url": None,
+                "title": "t",
+                "content": "תוכן",
+                "created_at": "2026-01-01T00:00:00Z",
+                "updated_at": "2026-01-01T00:00:00Z",
+            }
+        ],
+        "next_cursor": None,
+    }
+
+
+def test_model_response_only_exposes_response_fields() -> None:
+    user = User(email="user@example.com", hashed_password="secret")
+    response = model_response(UsersPublic, {"data": [user], "count": 1})
+    content = json.loads(response.body)
+    assert content["data"][0]["id"] == str(user.id)
+    assert "hashed_password" not in content["data"][0]
+
+
+def test_pydantic_json_response_matches_json_dumps() -> None:
+    content = {"message": "שלום", "values": [1, 2.5, None, True]}
+    assert json.loads(PydanticJSONResponse(content).body) == content
@@ -4,8 +4,10 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
+from app.api.throttle import throttle_store
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.throttle import MemoryRateLimitStore
 from app.main import app
 from app.models import Item, User, Middah, ReminderPhrase, DailyText, Kabbalah, WeeklyText
 from tests.utils.user import authentication_token_from_email
@@ -64,6 +66,13 @@ def cleanup_db_after() -> Generator[None, None, None]:
         session.commit()   
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_throttle() -> None:
+    # The suite logs in far more often than any client, every test starts with full buckets
+    if isinstance(throttle_store, MemoryRateLimitStore):
+        throttle_store.clear()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def db_func() -> Generator[Session, None, None]:
     with Session(engine) as session:
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from app.core.cache import TTLCache, caches
+
+
+def test_cache_hit_and_miss() -> None:
+    cache: TTLCache[str, int] = TTLCache(name="test_hit_miss", register=False, maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+    assert "test_hit_miss" not in caches
+
+
+def test_cache_registers_itself() -> None:
+    cache: TTLCache[str, int] = TTLCache(name="test_registered", maxsize=10, ttl=60)
+    try:
+        assert caches["test_registered"] is cache
+    finally:
+        del caches["test_registered"]
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(name="test_lru", register=False, maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire() -> None:
+    cache: TTLCache[str, int] = TTLCache(name="test_ttl", register=False, maxsize=10, ttl=60)
+    with patch("app.core.cache.time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.time.monotonic", return_value=1059.0):
+        assert cache.get("a") == 1
+    with patch("app.core.cache.time.monotonic", return_value=1060.0):
+        assert cache.get("a") is None
+    assert cache.stats().size == 0
+
+
+def test_cache_pop() -> None:
+    cache: TTLCache[str, int] = TTLCache(name="test_pop", register=False, maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, Template
+
+from app.utils import EMAIL_TEMPLATES_DIR, build_email_templates, render_email_template
+
+CONTEXT = {
+    "project_name": "Test Project",
+    "username": "user@example.com",
+    "email": "user@example.com",
+    "password": "password",
+    "valid_hours": 48,
+    "link": "https://example.com/reset-password?token=token",
+}
+
+
+def test_render_email_template_matches_file() -> None:
+    for template_name in ["new_account.html", "reset_password.html", "test_email.html"]:
+        template_str = (EMAIL_TEMPLATES_DIR / template_name).read_text()
+        expected = Template(template_str).render(CONTEXT)
+        assert render_email_template(template_name=template_name, context=CONTEXT) == expected
+
+
+def test_email_templates_are_compiled_once() -> None:
+    email_templates = build_email_templates()
+    template = email_templates.get_template("test_email.html")
+    assert email_templates.get_template("test_email.html") is template
+
+
+def test_precompiled_email_templates(tmp_path: Path) -> None:
+    Environment(loader=FileSystemLoader(EMAIL_TEMPLATES_DIR)).compile_templates(tmp_path, zip=None)
+    precompiled = build_email_templates(str(tmp_path))
+    expected = build_email_templates().get_template("reset_password.html").render(CONTEXT)
+    template = precompiled.get_template("reset_password.html")
+    # Loaded from its module rather than compiled from the HTML
+    assert template.filename
+    assert Path(template.filename).parent == tmp_path
+    assert template.render(CONTEXT) == expected
+
+
+def test_missing_precompiled_dir_falls_back_to_source(tmp_path: Path) -> None:
+    email_templates = build_email_templates(str(tmp_path / "missing"))
+    template = email_templates.get_template("test_email.html")
+    assert template.filename == str(EMAIL_TEMPLATES_DIR / "test_email.html")
+
+
+def test_stale_precompiled_dir_falls_back_to_source(tmp_path: Path) -> None:
+    Environment(loader=FileSystemLoader(EMAIL_TEMPLATES_DIR)).compile_templates(tmp_path, zip=None)
+    # Compiled before the latest edit of the templates
+    os.utime(tmp_path, (0, 0))
+    email_templates = build_email_templates(str(tmp_path))
+    template = email_templates.get_template("test_email.html")
+    assert template.filename == str(EMAIL_TEMPLATES_DIR / "test_email.html")
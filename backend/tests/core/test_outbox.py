@@ -0,0 +1,153 @@
+import asyncio
+import re
+import uuid
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from email import message_from_bytes
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.models import OutboxEmail
+from app.outbox import process_outbox, retry_delay, send_batch
+from app.utils import smtp_backend, verify_password_reset_token
+from tests.utils.smtp import SMTPStandIn, smtp_stand_in
+
+
+@contextmanager
+def relay() -> Iterator[SMTPStandIn]:
+    with smtp_stand_in() as stand_in, ExitStack() as stack:
+        for name, value in [
+            ("SMTP_HOST", "127.0.0.1"),
+            ("SMTP_PORT", stand_in.port),
+            ("SMTP_TLS", False),
+            ("SMTP_USER", None),
+            ("SMTP_PASSWORD", None),
+            ("EMAILS_FROM_EMAIL", "outbox@example.com"),
+        ]:
+            stack.enter_context(patch(f"app.core.config.settings.{name}", value))
+        yield stand_in
+
+
+def outbox_email(email_to: str) -> OutboxEmail:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return OutboxEmail(
+        email_to=email_to,
+        email_type="test_email",
+        context={},
+        next_attempt_at=now,
+        created_at=now,
+    )
+
+
+def test_retry_delay_doubles_up_to_max() -> None:
+    with (
+        patch("app.core.config.settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30),
+        patch("app.core.config.settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS", 100),
+    ):
+        assert retry_delay(1) == timedelta(seconds=30)
+        assert retry_delay(2) == timedelta(seconds=60)
+        assert retry_delay(3) == timedelta(seconds=100)
+
+
+def test_send_batch_reuses_connection() -> None:
+    emails = [outbox_email(f"outbox{i}@example.com") for i in range(3)]
+    with relay() as stand_in:
+        smtp = smtp_backend()
+        errors = send_batch(smtp, emails)
+        smtp.close()
+    assert list(errors.values()) == [None, None, None]
+    assert [recipients for recipients, _ in stand_in.messages] == [
+        [email.email_to] for email in emails
+    ]
+    subject = f"Subject: {settings.PROJECT_NAME} - Test email".encode()
+    assert subject in stand_in.messages[0][1]
+    assert stand_in.connections == 1
+
+
+def test_send_batch_renders_emails_when_sent() -> None:
+    email = outbox_email("outbox@example.com")
+    email.email_type = "reset_password"
+    email.context = {"email": "outbox@example.com"}
+    unknown = outbox_email("outbox@example.com")
+    unknown.email_type = "unknown"
+    with relay() as stand_in:
+        smtp = smtp_backend()
+        errors = send_batch(smtp, [email, unknown])
+        smtp.close()
+    assert errors[email.id] is None
+    assert "Unknown email type" in (errors[unknown.id] or "")
+    # The reset token is only generated for the email sent, and is valid
+    message = message_from_bytes(stand_in.messages[0][1])
+    html = next(
+        part.get_payload(decode=True).decode()
+        for part in message.walk()
+        if part.get_content_type() == "text/html"
+    )
+    token = re.search(r"reset-password\?token=([\w.-]+)", html)
+    assert token
+    assert verify_password_reset_token(token[1]) == "outbox@example.com"
+
+
+def test_send_batch_reconnects_after_failure() -> None:
+    emails = [outbox_email(f"outbox{i}@example.com") for i in range(3)]
+    with relay() as stand_in:
+        stand_in.rejected.add(emails[1].email_to)
+        smtp = smtp_backend()
+        errors = send_batch(smtp, emails)
+        smtp.close()
+    assert errors[emails[0].id] is None
+    assert errors[emails[1].id]
+    assert errors[emails[2].id] is None
+    assert len(stand_in.messages) == 2
+    assert stand_in.connections == 2
+
+
+def test_process_outbox() -> None:
+    sent_to = f"{uuid.uuid4().hex}@example.com"
+    rejected_to = f"{uuid.uuid4().hex}@example.com"
+
+    async def run() -> list[OutboxEmail]:
+        engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                for email_to in [sent_to, rejected_to]:
+                    await crud.enqueue_email(
+                        session=session,
+                        email_to=email_to,
+                        email_type="test_email",
+                    )
+                await session.commit()
+
+                smtp = smtp_backend()
+                await process_outbox(session, smtp)
+                smtp.close()
+
+                statement = (
+                    select(OutboxEmail)
+                    .where(col(OutboxEmail.email_to).in_([sent_to, rejected_to]))
+                    .execution_options(populate_existing=True)
+                )
+                remaining = list((await session.exec(statement)).all())
+                cleanup = delete(OutboxEmail).where(col(OutboxEmail.email_to) == rejected_to)
+                await session.exec(cleanup)  # type: ignore
+                await session.commit()
+                return remaining
+        finally:
+            await engine.dispose()
+
+    with relay() as stand_in:
+        stand_in.rejected.add(rejected_to)
+        remaining = asyncio.run(run())
+
+    assert [sent_to] in [recipients for recipients, _ in stand_in.messages]
+    # Sent emails are deleted, failed ones wait for their next attempt
+    assert [email.email_to for email in remaining] == [rejected_to]
+    assert remaining[0].attempts == 1
+    assert remaining[0].last_error
+    assert remaining[0].next_attempt_at > datetime.now(timezone.utc).replace(tzinfo=None)
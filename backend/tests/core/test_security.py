@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import (
+    PasswordHasher,
+    PasswordHashingBusy,
+    build_crypt_context,
+    get_password_hash,
+    verify_password,
+)
+
+COST = {"argon2_time_cost": 2, "argon2_memory_cost": 19456, "argon2_parallelism": 1}
+
+
+def test_password_hasher_runs_hashes() -> None:
+    hasher = PasswordHasher(workers=1, max_queue=1)
+
+    async def hash_and_verify() -> bool:
+        hashed = await hasher.run(get_password_hash, "secret-password")
+        return await hasher.run(verify_password, "secret-password", hashed)
+
+    assert asyncio.run(hash_and_verify())
+    stats = hasher.stats()
+    assert stats.completed == 2
+    assert stats.running == 0
+    assert stats.queued == 0
+    assert stats.run_avg_ms > 0
+
+
+def test_password_hasher_rejects_when_full() -> None:
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def saturate() -> None:
+        running = asyncio.ensure_future(hasher.run(release.wait))
+        queued = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert hasher.stats().running == 1
+        assert hasher.stats().queued == 1
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.run(release.wait)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(saturate())
+    stats = hasher.stats()
+    assert stats.rejected == 1
+    assert stats.completed == 2
+    assert stats.queued == 0
+    assert stats.wait_max_ms > 0
+
+
+def test_crypt_context_flags_other_costs_for_update() -> None:
+    context = build_crypt_context("bcrypt", bcrypt_rounds=5, **COST)
+    current = context.hash("secret-password")
+    assert current.startswith("$2b$05$")
+    assert not context.needs_update(current)
+
+    for rounds in (4, 6):
+        other = build_crypt_context("bcrypt", bcrypt_rounds=rounds, **COST)
+        hashed = other.hash("secret-password")
+        assert context.needs_update(hashed)
+        verified, new_hash = context.verify_and_update("secret-password", hashed)
+        assert verified
+        assert new_hash is not None
+        assert new_hash.startswith("$2b$05$")
+
+
+def test_crypt_context_argon2_rehashes_bcrypt() -> None:
+    context = build_crypt_context("argon2", bcrypt_rounds=5, **COST)
+    assert context.hash("secret-password").startswith("$argon2id$")
+
+    bcrypt_hash = build_crypt_context("bcrypt", bcrypt_rounds=5, **COST).hash("secret-password")
+    verified, new_hash = context.verify_and_update("secret-password", bcrypt_hash)
+    assert verified
+    assert new_hash is not None
+    assert new_hash.startswith("$argon2id$")
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.throttle import Bucket, MemoryRateLimitStore, PostgresRateLimitStore
+from app.models import RateLimitBucket
+
+BUCKET = Bucket(capacity=3, per_minute=6)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_store_allows_a_burst_then_refills() -> None:
+    clock = FakeClock()
+    store = MemoryRateLimitStore(maxsize=10, clock=clock)
+
+    async def take() -> float:
+        return await store.take("login:ip:1.2.3.4", BUCKET)
+
+    assert [asyncio.run(take()) for _ in range(3)] == [0, 0, 0]
+    # 6 tokens a minute, the next one is 10 seconds away
+    assert asyncio.run(take()) == pytest.approx(10)
+    clock.now += 4
+    assert asyncio.run(take()) == pytest.approx(6)
+    clock.now += 7
+    assert asyncio.run(take()) == 0
+    # Refilled up to the capacity only
+    clock.now += 3600
+    assert [asyncio.run(take()) for _ in range(4)][-1] > 0
+
+
+def test_memory_store_keys_are_independent_and_bounded() -> None:
+    clock = FakeClock()
+    store = MemoryRateLimitStore(maxsize=2, clock=clock)
+    empty = Bucket(capacity=1, per_minute=1)
+
+    async def take(key: str) -> float:
+        return await store.take(key, empty)
+
+    assert asyncio.run(take("a")) == 0
+    assert asyncio.run(take("a")) > 0
+    assert asyncio.run(take("b")) == 0
+    # "a" is evicted, and starts over with a full bucket
+    assert asyncio.run(take("c")) == 0
+    assert asyncio.run(take("a")) == 0
+
+
+def test_postgres_store() -> None:
+    async def run() -> list[float]:
+        engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+        store = PostgresRateLimitStore(engine, idle_seconds=60, prune_every=2)
+        key = "test:ip:postgres"
+        try:
+            return [await store.take(key, BUCKET) for _ in range(4)]
+        finally:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    delete(RateLimitBucket).where(RateLimitBucket.key == key)  # type: ignore[arg-type]
+                )
+            await engine.dispose()
+
+    waits = asyncio.run(run())
+    assert waits[:3] == [0, 0, 0]
+    assert 0 < waits[3] <= 10
@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 from sqlmodel import select
 
-from app.backend_pre_start import init, logger
+from app.backend_pre_start import init, logger, migrate
 
 
 def test_init_successful_connection() -> None:
@@ -30,4 +30,40 @@ def test_init_successful_connection() -> None:
             connection_successful
         ), "The database connection should be successful and not raise an exception."
 
-        session_mock.exec.assert_called_once_with(select1)
\ No newline at end of file
+        session_mock.exec.assert_called_once_with(select1)
+
+def test_migrate_skips_upgrade_at_head() -> None:
+    engine_mock = MagicMock()
+    context_mock = MagicMock()
+    context_mock.get_current_heads.return_value = ("a4d6f0c8e1b2",)
+    script_mock = MagicMock()
+    script_mock.get_heads.return_value = ["a4d6f0c8e1b2"]
+
+    with (
+        patch("app.backend_pre_start.MigrationContext.configure", return_value=context_mock),
+        patch("app.backend_pre_start.ScriptDirectory.from_config", return_value=script_mock),
+        patch("app.backend_pre_start.command.upgrade") as upgrade_mock,
+        patch.object(logger, "info"),
+    ):
+        migrate(engine_mock)
+
+        upgrade_mock.assert_not_called()
+
+
+def test_migrate_upgrades_behind_head() -> None:
+    engine_mock = MagicMock()
+    context_mock = MagicMock()
+    context_mock.get_current_heads.return_value = ("1a31ce608336",)
+    script_mock = MagicMock()
+    script_mock.get_heads.return_value = ["a4d6f0c8e1b2"]
+
+    with (
+        patch("app.backend_pre_start.MigrationContext.configure", return_value=context_mock),
+        patch("app.backend_pre_start.ScriptDirectory.from_config", return_value=script_mock),
+        patch("app.backend_pre_start.command.upgrade") as upgrade_mock,
+        patch.object(logger, "info"),
+    ):
+        migrate(engine_mock)
+
+        upgrade_mock.assert_called_once()
+        assert upgrade_mock.call_args.args[1] == "head"
@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.db import engine
+from app.importer import RESOURCES, import_files, validated_batches
+from app.models import DailyText, Middah, ReminderPhrase
+
+
+def write_jsonl(path: Path, records: list[dict[str, str | None]]) -> Path:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def test_validated_batches_reports_line(tmp_path: Path) -> None:
+    path = write_jsonl(
+        tmp_path / "phrases.jsonl",
+        [{"middah": "test_anavah", "text": "Phrase"}, {"middah": "test_anavah"}],
+    )
+    with pytest.raises(ValueError, match="phrases.jsonl:2: text Field required"):
+        list(validated_batches(RESOURCES["reminder_phrases"], path, 10))
+
+
+def test_validated_batches_reads_csv(tmp_path: Path) -> None:
+    path = tmp_path / "daily_texts.csv"
+    path.write_text("middah,sefaria_url,title,content\ntest_anavah,,Title,Content\n")
+    batches = list(validated_batches(RESOURCES["daily_texts"], path, 10))
+    assert batches == [[(2, "test_anavah", None, "Title", "Content")]]
+
+
+def test_import_files(tmp_path: Path) -> None:
+    files = {
+        "middot": write_jsonl(
+            tmp_path / "middot.jsonl",
+            [
+                {
+                    "name_transliterated": "test_import",
+                    "name_hebrew": "test_יבוא",
+                    "name_english": "test_import",
+                }
+            ],
+        ),
+        "reminder_phrases": write_jsonl(
+            tmp_path / "phrases.jsonl",
+            [
+                {"middah": "test_import", "text": "Imported phrase 1"},
+                {"middah": "test_import", "text": "Imported phrase 2"},
+                {"middah": "test_import", "text": "Imported phrase 1"},
+            ],
+        ),
+        "daily_texts": write_jsonl(
+            tmp_path / "daily_texts.jsonl",
+            [
+                {
+                    "middah": "test_import",
+                    "sefaria_url": "https://www.sefaria.org/test_import",
+                    "title": "Imported",
+                    "content": "First version",
+                },
+                {
+                    "middah": "test_import",
+                    "sefaria_url": "https://www.sefaria.org/test_import",
+                    "title": "Imported",
+                    "content": "Last version",
+                },
+            ],
+        ),
+    }
+    assert import_files(files, batch_size=2) == {
+        "middot": 1,
+        "reminder_phrases": 2,
+        "daily_texts": 1,
+    }
+    # Importing the same files again changes nothing
+    assert import_files(files) == {"middot": 0, "reminder_phrases": 0, "daily_texts": 0}
+
+    with Session(engine) as session:
+        phrases = session.exec(
+            select(ReminderPhrase).where(col(ReminderPhrase.middah) == "test_import")
+        ).all()
+        assert sorted(p.text for p in phrases) == ["Imported phrase 1", "Imported phrase 2"]
+        daily_text = session.exec(
+            select(DailyText).where(col(DailyText.middah) == "test_import")
+        ).one()
+        assert daily_text.content == "Last version"
+
+    # Clean up
+    for phrase in phrases:
+        crud.delete_reminder_phrase(session=Session(engine), reminder_phrase_id=phrase.id)
+    crud.delete_daily_text(session=Session(engine), daily_text_id=daily_text.id)
+    crud.delete_middah(session=Session(engine), name_transliterated="test_import")
+
+
+def test_import_files_unknown_middah_imports_nothing(tmp_path: Path) -> None:
+    files = {
+        "middot": write_jsonl(
+            tmp_path / "middot.jsonl",
+            [
+                {
+                    "name_transliterated": "test_import_rollback",
+                    "name_hebrew": "test_גלגול",
+                    "name_english": "test_rollback",
+                }
+            ],
+        ),
+        "kabbalot": write_jsonl(
+            tmp_path / "kabbalot.jsonl",
+            [{"middah": "test_missing", "description": "Kabbalah of an unknown middah"}],
+        ),
+    }
+    with pytest.raises(ValueError, match="unknown middot test_missing"):
+        import_files(files)
+    with Session(engine) as session:
+        assert session.get(Middah, "test_import_rollback") is None
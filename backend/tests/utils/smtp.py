@@ -0,0 +1,89 @@
+import socketserver
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SMTPStandIn:
+    """
+    What a local SMTP server received: the messages by recipient and the connections
+    opened. Recipients in ``rejected`` are refused with a 550.
+    """
+
+    port: int = 0
+    rejected: set[str] = field(default_factory=set)
+    messages: list[tuple[list[str], bytes]] = field(default_factory=list)
+    connections: int = 0
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    server: "SMTPServer"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        stand_in = self.server.stand_in
+        stand_in.connections += 1
+        recipients: list[str] = []
+        self.reply("220 localhost SMTP stand-in")
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command.split(":", 1)[1].strip().strip("<>")
+                if recipient in stand_in.rejected:
+                    self.reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(recipient)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                    lines.append(data[1:] if data.startswith(b"..") else data)
+                stand_in.messages.append((recipients, b"".join(lines)))
+                self.reply("250 OK")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, stand_in: SMTPStandIn) -> None:
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.stand_in = stand_in
+        stand_in.port = self.server_address[1]
+
+
+@contextmanager
+def smtp_stand_in() -> Iterator[SMTPStandIn]:
+    """
+    Run an SMTP server on a free local port for the duration of the block, a stand-in for
+    the relay that needs nothing but the standard library.
+    """
+    stand_in = SMTPStandIn()
+    server = SMTPServer(stand_in)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield stand_in
+    finally:
+        server.shutdown()
+        server.server_close()
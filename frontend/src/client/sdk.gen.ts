@@ -3,18 +3,32 @@
 import type { CancelablePromise } from './core/CancelablePromise';
 import { OpenAPI } from './core/OpenAPI';
 import { request as __request } from './core/request';
-import type { DailyTextsListDailyTextsResponse, DailyTextsCreateDailyTextData, DailyTextsCreateDailyTextResponse, DailyTextsGetDailyTextData, DailyTextsGetDailyTextResponse, DailyTextsPatchDailyTextData, DailyTextsPatchDailyTextResponse, DailyTextsDeleteDailyTextData, DailyTextsDeleteDailyTextResponse, ItemsReadItemsData, ItemsReadItemsResponse, ItemsCreateItemData, ItemsCreateItemResponse, ItemsReadItemData, ItemsReadItemResponse, ItemsUpdateItemData, ItemsUpdateItemResponse, ItemsDeleteItemData, ItemsDeleteItemResponse, KabbalotListKabbalotResponse, KabbalotCreateKabbalahData, KabbalotCreateKabbalahResponse, KabbalotGetKabbalahData, KabbalotGetKabbalahResponse, KabbalotPatchKabbalahData, KabbalotPatchKabbalahResponse, KabbalotDeleteKabbalahData, KabbalotDeleteKabbalahResponse, LoginLoginAccessTokenData, LoginLoginAccessTokenResponse, LoginTestTokenResponse, LoginRecoverPasswordData, LoginRecoverPasswordResponse, LoginResetPasswordData, LoginResetPasswordResponse, LoginRecoverPasswordHtmlContentData, LoginRecoverPasswordHtmlContentResponse, MiddotListMiddotResponse, MiddotCreateMiddahData, MiddotCreateMiddahResponse, MiddotGetMiddahData, MiddotGetMiddahResponse, MiddotDeleteMiddahData, MiddotDeleteMiddahResponse, PrivateCreateUserData, PrivateCreateUserResponse, ReminderPhrasesListReminderPhrasesResponse, ReminderPhrasesCreateReminderPhraseData, ReminderPhrasesCreateReminderPhraseResponse, ReminderPhrasesGetReminderPhraseData, ReminderPhrasesGetReminderPhraseResponse, ReminderPhrasesPatchReminderPhraseData, ReminderPhrasesPatchReminderPhraseResponse, ReminderPhrasesDeleteReminderPhraseData, ReminderPhrasesDeleteReminderPhraseResponse, UsersReadUsersData, UsersReadUsersResponse, UsersCreateUserData, UsersCreateUserResponse, UsersReadUserMeResponse, UsersDeleteUserMeResponse, UsersUpdateUserMeData, UsersUpdateUserMeResponse, UsersUpdatePasswordMeData, UsersUpdatePasswordMeResponse, UsersRegisterUserData, UsersRegisterUserResponse, UsersReadUserByIdData, UsersReadUserByIdResponse, UsersUpdateUserData, UsersUpdateUserResponse, UsersDeleteUserData, UsersDeleteUserResponse, UtilsTestEmailData, UtilsTestEmailResponse, UtilsHealthCheckResponse, WeeklyTextsListWeeklyTextsResponse, WeeklyTextsCreateWeeklyTextData, WeeklyTextsCreateWeeklyTextResponse, WeeklyTextsGetWeeklyTextData, WeeklyTextsGetWeeklyTextResponse, WeeklyTextsPatchWeeklyTextData, WeeklyTextsPatchWeeklyTextResponse, WeeklyTextsDeleteWeeklyTextData, WeeklyTextsDeleteWeeklyTextResponse } from './types.gen';
+import type { DailyTextsListDailyTextsData, DailyTextsListDailyTextsResponse, DailyTextsCreateDailyTextData, DailyTextsCreateDailyTextResponse, DailyTextsGetDailyTextData, DailyTextsGetDailyTextResponse, DailyTextsPatchDailyTextData, DailyTextsPatchDailyTextResponse, DailyTextsDeleteDailyTextData, DailyTextsDeleteDailyTextResponse, ItemsReadItemsData, ItemsReadItemsResponse, ItemsCreateItemData, ItemsCreateItemResponse, ItemsReadItemData, ItemsReadItemResponse, ItemsUpdateItemData, ItemsUpdateItemResponse, ItemsDeleteItemData, ItemsDeleteItemResponse, KabbalotListKabbalotData, KabbalotListKabbalotResponse, KabbalotCreateKabbalahData, KabbalotCreateKabbalahResponse, KabbalotGetKabbalahData, KabbalotGetKabbalahResponse, KabbalotPatchKabbalahData, KabbalotPatchKabbalahResponse, KabbalotDeleteKabbalahData, KabbalotDeleteKabbalahResponse, LoginLoginAccessTokenData, LoginLoginAccessTokenResponse, LoginRefreshAccessTokenData, LoginRefreshAccessTokenResponse, LoginRevokeTokensResponse, LoginTestTokenResponse, LoginRecoverPasswordData, LoginRecoverPasswordResponse, LoginResetPasswordData, LoginResetPasswordResponse, LoginRecoverPasswordHtmlContentData, LoginRecoverPasswordHtmlContentResponse, MiddotListMiddotResponse, MiddotCreateMiddahData, MiddotCreateMiddahResponse, MiddotGetMiddahData, MiddotGetMiddahResponse, MiddotGetMiddahBundleData, MiddotGetMiddahBundleResponse, MiddotDeleteMiddahData, MiddotDeleteMiddahResponse, PrivateCreateUserData, PrivateCreateUserResponse, ReminderPhrasesListReminderPhrasesData, ReminderPhrasesListReminderPhrasesResponse, ReminderPhrasesCreateReminderPhraseData, ReminderPhrasesCreateReminderPhraseResponse, ReminderPhrasesGetReminderPhraseData, ReminderPhrasesGetReminderPhraseResponse, ReminderPhrasesPatchReminderPhraseData, ReminderPhrasesPatchReminderPhraseResponse, ReminderPhrasesDeleteReminderPhraseData, ReminderPhrasesDeleteReminderPhraseResponse, UsersReadUsersData, UsersReadUsersResponse, UsersCreateUserData, UsersCreateUserResponse, UsersReadUserMeResponse, UsersDeleteUserMeData, UsersDeleteUserMeResponse, UsersUpdateUserMeData, UsersUpdateUserMeResponse, UsersUpdatePasswordMeData, UsersUpdatePasswordMeResponse, UsersRegisterUserData, UsersRegisterUserResponse, UsersReadUserByIdData, UsersReadUserByIdResponse, UsersUpdateUserData, UsersUpdateUserResponse, UsersDeleteUserData, UsersDeleteUserResponse, UtilsTestEmailData, UtilsTestEmailResponse, UtilsHealthCheckResponse, WeeklyTextsListWeeklyTextsData, WeeklyTextsListWeeklyTextsResponse, WeeklyTextsCreateWeeklyTextData, WeeklyTextsCreateWeeklyTextResponse, WeeklyTextsGetWeeklyTextData, WeeklyTextsGetWeeklyTextResponse, WeeklyTextsPatchWeeklyTextData, WeeklyTextsPatchWeeklyTextResponse, WeeklyTextsDeleteWeeklyTextData, WeeklyTextsDeleteWeeklyTextResponse } from './types.gen';
 
 export class DailyTextsService {
     /**
      * List Daily Texts
+     * @param data The data for the request.
+     * @param data.after
+     * @param data.limit
+     * @param data.middah
+     * @param data.orderBy
      * @returns DailyTextRead Successful Response
      * @throws ApiError
      */
-    public static listDailyTexts(): CancelablePromise<DailyTextsListDailyTextsResponse> {
+    public static listDailyTexts(data: DailyTextsListDailyTextsData = {}): CancelablePromise<DailyTextsListDailyTextsResponse> {
         return __request(OpenAPI, {
             method: 'GET',
-            url: '/api/v1/daily_texts/'
+            url: '/api/v1/daily_texts/',
+            query: {
+                after: data.after,
+                limit: data.limit,
+                middah: data.middah,
+                order_by: data.orderBy
+            },
+            errors: {
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -215,13 +229,27 @@ export class ItemsService {
 export class KabbalotService {
     /**
      * List Kabbalot
+     * @param data The data for the request.
+     * @param data.after
+     * @param data.limit
+     * @param data.middah
+     * @param data.orderBy
      * @returns KabbalahRead Successful Response
      * @throws ApiError
      */
-    public static listKabbalot(): CancelablePromise<KabbalotListKabbalotResponse> {
+    public static listKabbalot(data: KabbalotListKabbalotData = {}): CancelablePromise<KabbalotListKabbalotResponse> {
         return __request(OpenAPI, {
             method: 'GET',
-            url: '/api/v1/kabbalot/'
+            url: '/api/v1/kabbalot/',
+            query: {
+                after: data.after,
+                limit: data.limit,
+                middah: data.middah,
+                order_by: data.orderBy
+            },
+            errors: {
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -329,6 +357,40 @@ export class LoginService {
         });
     }
     
+    /**
+     * Refresh Access Token
+     * Exchange a refresh token for a new access token and refresh token, each refresh token
+     * can only be used once
+     * @param data The data for the request.
+     * @param data.requestBody
+     * @returns Token Successful Response
+     * @throws ApiError
+     */
+    public static refreshAccessToken(data: LoginRefreshAccessTokenData): CancelablePromise<LoginRefreshAccessTokenResponse> {
+        return __request(OpenAPI, {
+            method: 'POST',
+            url: '/api/v1/login/refresh-token',
+            body: data.requestBody,
+            mediaType: 'application/json',
+            errors: {
+                422: 'Validation Error'
+            }
+        });
+    }
+    
+    /**
+     * Revoke Tokens
+     * Sign out everywhere, revoking every access and refresh token of the current user
+     * @returns Message Successful Response
+     * @throws ApiError
+     */
+    public static revokeTokens(): CancelablePromise<LoginRevokeTokensResponse> {
+        return __request(OpenAPI, {
+            method: 'POST',
+            url: '/api/v1/login/revoke-tokens'
+        });
+    }
+    
     /**
      * Test Token
      * Test access token
@@ -459,6 +521,38 @@ export class MiddotService {
         });
     }
     
+    /**
+     * Get Middah Bundle
+     * Get a middah with its reminder phrases, daily texts and kabbalot in one request.
+     *
+     * Each section is capped by its own limit. A section's next_cursor can be passed as
+     * ``after`` to the matching list endpoint, filtered by the same middah, to read the rest.
+     * @param data The data for the request.
+     * @param data.nameTransliterated
+     * @param data.reminderPhrasesLimit
+     * @param data.dailyTextsLimit
+     * @param data.kabbalotLimit
+     * @returns MiddahBundle Successful Response
+     * @throws ApiError
+     */
+    public static getMiddahBundle(data: MiddotGetMiddahBundleData): CancelablePromise<MiddotGetMiddahBundleResponse> {
+        return __request(OpenAPI, {
+            method: 'GET',
+            url: '/api/v1/middot/{name_transliterated}/bundle',
+            path: {
+                name_transliterated: data.nameTransliterated
+            },
+            query: {
+                reminder_phrases_limit: data.reminderPhrasesLimit,
+                daily_texts_limit: data.dailyTextsLimit,
+                kabbalot_limit: data.kabbalotLimit
+            },
+            errors: {
+                422: 'Validation Error'
+            }
+        });
+    }
+    
     /**
      * Delete Middah
      * @param data The data for the request.
@@ -505,13 +599,27 @@ export class PrivateService {
 export class ReminderPhrasesService {
     /**
      * List Reminder Phrases
+     * @param data The data for the request.
+     * @param data.after
+     * @param data.limit
+     * @param data.middah
+     * @param data.orderBy
      * @returns ReminderPhraseRead Successful Response
      * @throws ApiError
      */
-    public static listReminderPhrases(): CancelablePromise<ReminderPhrasesListReminderPhrasesResponse> {
+    public static listReminderPhrases(data: ReminderPhrasesListReminderPhrasesData = {}): CancelablePromise<ReminderPhrasesListReminderPhrasesResponse> {
         return __request(OpenAPI, {
             method: 'GET',
-            url: '/api/v1/reminder_phrases/'
+            url: '/api/v1/reminder_phrases/',
+            query: {
+                after: data.after,
+                limit: data.limit,
+                middah: data.middah,
+                order_by: data.orderBy
+            },
+            errors: {
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -658,13 +766,24 @@ export class UsersService {
     /**
      * Delete User Me
      * Delete own user.
+     *
+     * With background=true the account is deactivated and a 202 is returned at once, its
+     * items and then the user are deleted in batches afterwards.
+     * @param data The data for the request.
+     * @param data.background
      * @returns Message Successful Response
      * @throws ApiError
      */
-    public static deleteUserMe(): CancelablePromise<UsersDeleteUserMeResponse> {
+    public static deleteUserMe(data: UsersDeleteUserMeData = {}): CancelablePromise<UsersDeleteUserMeResponse> {
         return __request(OpenAPI, {
             method: 'DELETE',
-            url: '/api/v1/users/me'
+            url: '/api/v1/users/me',
+            query: {
+                background: data.background
+            },
+            errors: {
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -690,10 +809,11 @@ export class UsersService {
     
     /**
      * Update Password Me
-     * Update own password.
+     * Update own password. Every other session is signed out, this one continues with
+     * the returned tokens.
      * @param data The data for the request.
      * @param data.requestBody
-     * @returns Message Successful Response
+     * @returns Token Successful Response
      * @throws ApiError
      */
     public static updatePasswordMe(data: UsersUpdatePasswordMeData): CancelablePromise<UsersUpdatePasswordMeResponse> {
@@ -776,8 +896,12 @@ export class UsersService {
     /**
      * Delete User
      * Delete a user.
+     *
+     * With background=true the user is deactivated and a 202 is returned at once, its items
+     * and then the user are deleted in batches afterwards.
      * @param data The data for the request.
      * @param data.userId
+     * @param data.background
      * @returns Message Successful Response
      * @throws ApiError
      */
@@ -788,6 +912,9 @@ export class UsersService {
             path: {
                 user_id: data.userId
             },
+            query: {
+                background: data.background
+            },
             errors: {
                 422: 'Validation Error'
             }
@@ -833,13 +960,25 @@ export class UtilsService {
 export class WeeklyTextsService {
     /**
      * List Weekly Texts
+     * @param data The data for the request.
+     * @param data.after
+     * @param data.limit
+     * @param data.orderBy
      * @returns WeeklyTextRead Successful Response
      * @throws ApiError
      */
-    public static listWeeklyTexts(): CancelablePromise<WeeklyTextsListWeeklyTextsResponse> {
+    public static listWeeklyTexts(data: WeeklyTextsListWeeklyTextsData = {}): CancelablePromise<WeeklyTextsListWeeklyTextsResponse> {
         return __request(OpenAPI, {
             method: 'GET',
-            url: '/api/v1/weekly_texts/'
+            url: '/api/v1/weekly_texts/',
+            query: {
+                after: data.after,
+                limit: data.limit,
+                order_by: data.orderBy
+            },
+            errors: {
+                422: 'Validation Error'
+            }
         });
     }
     
@@ -33,6 +33,11 @@ export type DailyTextRead = {
     updated_at: string;
 };
 
+export type DailyTextsPage = {
+    data: Array<DailyTextRead>;
+    next_cursor?: (string | null);
+};
+
 export type HTTPValidationError = {
     detail?: Array<ValidationError>;
 };
@@ -77,10 +82,22 @@ export type KabbalahRead = {
     updated_at: string;
 };
 
+export type KabbalotPage = {
+    data: Array<KabbalahRead>;
+    next_cursor?: (string | null);
+};
+
 export type Message = {
     message: string;
 };
 
+export type MiddahBundle = {
+    middah: MiddahRead;
+    reminder_phrases: ReminderPhrasesPage;
+    daily_texts: DailyTextsPage;
+    kabbalot: KabbalotPage;
+};
+
 export type MiddahCreate = {
     name_transliterated: string;
     name_hebrew: string;
@@ -105,6 +122,10 @@ export type PrivateUserCreate = {
     is_verified?: boolean;
 };
 
+export type RefreshTokenRequest = {
+    refresh_token: string;
+};
+
 export type ReminderPhraseCreate = {
     middah: string;
     text: string;
@@ -123,9 +144,15 @@ export type ReminderPhraseRead = {
     updated_at: string;
 };
 
+export type ReminderPhrasesPage = {
+    data: Array<ReminderPhraseRead>;
+    next_cursor?: (string | null);
+};
+
 export type Token = {
     access_token: string;
     token_type?: string;
+    refresh_token?: (string | null);
 };
 
 export type UpdatePassword = {
@@ -200,7 +227,19 @@ export type WeeklyTextRead = {
     updated_at: string;
 };
 
-export type DailyTextsListDailyTextsResponse = (Array<DailyTextRead>);
+export type WeeklyTextsPage = {
+    data: Array<WeeklyTextRead>;
+    next_cursor?: (string | null);
+};
+
+export type DailyTextsListDailyTextsData = {
+    after?: (string | null);
+    limit?: number;
+    middah?: (string | null);
+    orderBy?: 'id' | 'updated_at';
+};
+
+export type DailyTextsListDailyTextsResponse = (DailyTextsPage);
 
 export type DailyTextsCreateDailyTextData = {
     requestBody: DailyTextCreate;
@@ -259,7 +298,14 @@ export type ItemsDeleteItemData = {
 
 export type ItemsDeleteItemResponse = (Message);
 
-export type KabbalotListKabbalotResponse = (Array<KabbalahRead>);
+export type KabbalotListKabbalotData = {
+    after?: (string | null);
+    limit?: number;
+    middah?: (string | null);
+    orderBy?: 'id' | 'updated_at';
+};
+
+export type KabbalotListKabbalotResponse = (KabbalotPage);
 
 export type KabbalotCreateKabbalahData = {
     requestBody: KabbalahCreate;
@@ -292,6 +338,14 @@ export type LoginLoginAccessTokenData = {
 
 export type LoginLoginAccessTokenResponse = (Token);
 
+export type LoginRefreshAccessTokenData = {
+    requestBody: RefreshTokenRequest;
+};
+
+export type LoginRefreshAccessTokenResponse = (Token);
+
+export type LoginRevokeTokensResponse = (Message);
+
 export type LoginTestTokenResponse = (UserPublic);
 
 export type LoginRecoverPasswordData = {
@@ -326,6 +380,15 @@ export type MiddotGetMiddahData = {
 
 export type MiddotGetMiddahResponse = (MiddahRead);
 
+export type MiddotGetMiddahBundleData = {
+    dailyTextsLimit?: number;
+    kabbalotLimit?: number;
+    nameTransliterated: string;
+    reminderPhrasesLimit?: number;
+};
+
+export type MiddotGetMiddahBundleResponse = (MiddahBundle);
+
 export type MiddotDeleteMiddahData = {
     nameTransliterated: string;
 };
@@ -338,7 +401,14 @@ export type PrivateCreateUserData = {
 
 export type PrivateCreateUserResponse = (UserPublic);
 
-export type ReminderPhrasesListReminderPhrasesResponse = (Array<ReminderPhraseRead>);
+export type ReminderPhrasesListReminderPhrasesData = {
+    after?: (string | null);
+    limit?: number;
+    middah?: (string | null);
+    orderBy?: 'id' | 'updated_at';
+};
+
+export type ReminderPhrasesListReminderPhrasesResponse = (ReminderPhrasesPage);
 
 export type ReminderPhrasesCreateReminderPhraseData = {
     requestBody: ReminderPhraseCreate;
@@ -380,6 +450,10 @@ export type UsersCreateUserResponse = (UserPublic);
 
 export type UsersReadUserMeResponse = (UserPublic);
 
+export type UsersDeleteUserMeData = {
+    background?: boolean;
+};
+
 export type UsersDeleteUserMeResponse = (Message);
 
 export type UsersUpdateUserMeData = {
@@ -392,7 +466,7 @@ export type UsersUpdatePasswordMeData = {
     requestBody: UpdatePassword;
 };
 
-export type UsersUpdatePasswordMeResponse = (Message);
+export type UsersUpdatePasswordMeResponse = (Token);
 
 export type UsersRegisterUserData = {
     requestBody: UserRegister;
@@ -414,6 +488,7 @@ export type UsersUpdateUserData = {
 export type UsersUpdateUserResponse = (UserPublic);
 
 export type UsersDeleteUserData = {
+    background?: boolean;
     userId: string;
 };
 
@@ -427,7 +502,13 @@ export type UtilsTestEmailResponse = (Message);
 
 export type UtilsHealthCheckResponse = (boolean);
 
-export type WeeklyTextsListWeeklyTextsResponse = (Array<WeeklyTextRead>);
+export type WeeklyTextsListWeeklyTextsData = {
+    after?: (string | null);
+    limit?: number;
+    orderBy?: 'id' | 'updated_at';
+};
+
+export type WeeklyTextsListWeeklyTextsResponse = (WeeklyTextsPage);
 
 export type WeeklyTextsCreateWeeklyTextData = {
     requestBody: WeeklyTextCreate;
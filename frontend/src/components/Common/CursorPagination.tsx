@@ -0,0 +1,52 @@
+import { Flex } from "@chakra-ui/react"
+import { z } from "zod"
+
+import {
+  PaginationNextTrigger,
+  PaginationPrevTrigger,
+  PaginationRoot,
+} from "@/components/ui/pagination.tsx"
+
+// The cursors of every page before the current one, so "previous" can step back
+export const cursorSearchSchema = z.object({
+  cursors: z.array(z.string()).catch([]),
+})
+
+interface CursorPaginationProps {
+  cursors: string[]
+  nextCursor?: string | null
+  pageSize: number
+  onChange: (cursors: string[]) => void
+}
+
+export function CursorPagination({
+  cursors,
+  nextCursor,
+  pageSize,
+  onChange,
+}: CursorPaginationProps) {
+  const page = cursors.length + 1
+  const pages = nextCursor ? page + 1 : page
+
+  return (
+    <Flex justifyContent="flex-end" mt={4}>
+      <PaginationRoot
+        count={pages * pageSize}
+        pageSize={pageSize}
+        page={page}
+        onPageChange={({ page: target }) =>
+          onChange(
+            target > page && nextCursor
+              ? [...cursors, nextCursor]
+              : cursors.slice(0, -1),
+          )
+        }
+      >
+        <Flex>
+          <PaginationPrevTrigger />
+          <PaginationNextTrigger />
+        </Flex>
+      </PaginationRoot>
+    </Flex>
+  )
+}
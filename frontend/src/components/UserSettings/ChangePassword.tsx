@@ -4,6 +4,7 @@ import { type SubmitHandler, useForm } from "react-hook-form"
 import { FiLock } from "react-icons/fi"
 
 import { type ApiError, type UpdatePassword, UsersService } from "@/client"
+import { storeTokens } from "@/hooks/useAuth"
 import useCustomToast from "@/hooks/useCustomToast"
 import { confirmPasswordRules, handleError, passwordRules } from "@/utils"
 import { PasswordInput } from "../ui/password-input"
@@ -28,7 +29,9 @@ const ChangePassword = () => {
   const mutation = useMutation({
     mutationFn: (data: UpdatePassword) =>
       UsersService.updatePasswordMe({ requestBody: data }),
-    onSuccess: () => {
+    onSuccess: (tokens) => {
+      // The change revoked the tokens in use, continue with the new ones
+      storeTokens(tokens)
       showSuccessToast("Password updated successfully.")
       reset()
     },
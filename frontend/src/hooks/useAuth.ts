@@ -6,16 +6,91 @@ import {
   type Body_login_login_access_token as AccessToken,
   type ApiError,
   LoginService,
+  type Token,
   type UserPublic,
   type UserRegister,
   UsersService,
 } from "@/client"
+import type { ApiRequestOptions } from "@/client/core/ApiRequestOptions"
 import { handleError } from "@/utils"
 
 const isLoggedIn = () => {
   return localStorage.getItem("access_token") !== null
 }
 
+const storeTokens = (tokens: Token) => {
+  localStorage.setItem("access_token", tokens.access_token)
+  if (tokens.refresh_token) {
+    localStorage.setItem("refresh_token", tokens.refresh_token)
+  }
+}
+
+const clearTokens = () => {
+  localStorage.removeItem("access_token")
+  localStorage.removeItem("refresh_token")
+}
+
+// Refresh this long before the access token expires, so requests in flight don't race it
+const REFRESH_MARGIN_SECONDS = 30
+
+const expiresSoon = (accessToken: string) => {
+  try {
+    const encoded = accessToken.split(".")[1].replace(/-/g, "+").replace(/_/g, "/")
+    const payload = JSON.parse(atob(encoded))
+    return payload.exp * 1000 - Date.now() < REFRESH_MARGIN_SECONDS * 1000
+  } catch {
+    return true
+  }
+}
+
+// The refresh request itself resolves its token too, it must not wait on itself
+const REFRESH_URL = "/api/v1/login/refresh-token"
+
+// Every request waiting on a refresh shares it, a refresh token can only be used once
+let refreshing: Promise<string> | null = null
+
+const refreshAccessToken = (refreshToken: string) => {
+  refreshing ??= LoginService.refreshAccessToken({
+    requestBody: { refresh_token: refreshToken },
+  })
+    .then((tokens) => {
+      storeTokens(tokens)
+      return tokens.access_token
+    })
+    .catch(() => {
+      // Another tab may have used the token first and stored the next pair, keep it
+      const storedRefreshToken = localStorage.getItem("refresh_token")
+      const storedAccessToken = localStorage.getItem("access_token")
+      if (
+        storedRefreshToken &&
+        storedRefreshToken !== refreshToken &&
+        storedAccessToken
+      ) {
+        return storedAccessToken
+      }
+      clearTokens()
+      return ""
+    })
+    .finally(() => {
+      refreshing = null
+    })
+  return refreshing
+}
+
+const getAccessToken = async (options: ApiRequestOptions<string>) => {
+  const accessToken = localStorage.getItem("access_token") || ""
+  const refreshToken = localStorage.getItem("refresh_token")
+  if (
+    options.url === REFRESH_URL ||
+    !accessToken ||
+    !refreshToken ||
+    !expiresSoon(accessToken)
+  ) {
+    return accessToken
+  }
+  return refreshAccessToken(refreshToken)
+}
+
 const useAuth = () => {
   const [error, setError] = useState<string | null>(null)
   const navigate = useNavigate()
@@ -45,7 +120,7 @@ const useAuth = () => {
     const response = await LoginService.loginAccessToken({
       formData: data,
     })
-    localStorage.setItem("access_token", response.access_token)
+    storeTokens(response)
   }
 
   const loginMutation = useMutation({
@@ -59,7 +134,7 @@ const useAuth = () => {
   })
 
   const logout = () => {
-    localStorage.removeItem("access_token")
+    clearTokens()
     navigate({ to: "/login" })
   }
 
@@ -73,5 +148,5 @@ const useAuth = () => {
   }
 }
 
-export { isLoggedIn }
+export { clearTokens, getAccessToken, isLoggedIn, storeTokens }
 export default useAuth
@@ -7,28 +7,48 @@ import {
   VStack,
 } from "@chakra-ui/react"
 import { useQuery } from "@tanstack/react-query"
-import { createFileRoute } from "@tanstack/react-router"
+import { createFileRoute, useNavigate } from "@tanstack/react-router"
 import { FiSearch } from "react-icons/fi"
 
 import { DailyTextsService } from "@/client"
+import {
+  CursorPagination,
+  cursorSearchSchema,
+} from "@/components/Common/CursorPagination"
 import { DailyTextActionsMenu } from "@/components/Common/DailyTextActionsMenu"
 import AddDailyText from "@/components/DailyTexts/AddDailyText"
 
-function getDailyTextsQueryOptions() {
+const PER_PAGE = 50
+
+function getDailyTextsQueryOptions({ after }: { after?: string }) {
   return {
-    queryFn: () => DailyTextsService.listDailyTexts(),
-    queryKey: ["dailyTexts"],
+    queryFn: () => DailyTextsService.listDailyTexts({ after, limit: PER_PAGE }),
+    queryKey: ["dailyTexts", { after }],
   }
 }
 
 export const Route = createFileRoute("/_layout/daily-texts")({
   component: DailyTexts,
+  validateSearch: (search) => cursorSearchSchema.parse(search),
 })
 
 function DailyTextsTable() {
-  const { data, isLoading } = useQuery(getDailyTextsQueryOptions())
+  const navigate = useNavigate({ from: Route.fullPath })
+  const { cursors } = Route.useSearch()
+
+  const { data, isLoading, isPlaceholderData } = useQuery({
+    ...getDailyTextsQueryOptions({ after: cursors[cursors.length - 1] }),
+    placeholderData: (prevData) => prevData,
+  })
+
+  const setCursors = (cursors: string[]) => {
+    navigate({
+      to: "/daily-texts",
+      search: (prev) => ({ ...prev, cursors }),
+    })
+  }
 
-  const dailyTexts = data ?? []
+  const dailyTexts = data?.data ?? []
 
   if (isLoading) {
     return (
@@ -57,48 +77,56 @@ function DailyTextsTable() {
   }
 
   return (
-    <Table.Root size={{ base: "sm", md: "md" }}>
-      <Table.Header>
-        <Table.Row>
-          <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
-          <Table.ColumnHeader w="md">Title</Table.ColumnHeader>
-          <Table.ColumnHeader>Text</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
-        </Table.Row>
-      </Table.Header>
-      <Table.Body>
-        {dailyTexts.map((dailyText) => (
-          <Table.Row key={dailyText.id}>
-            <Table.Cell truncate maxW="sm">
-              {dailyText.id}
-            </Table.Cell>
-            <Table.Cell truncate maxW="sm">
-              {dailyText.middah}
-            </Table.Cell>
-            <Table.Cell truncate maxW="md">
-              {dailyText.title || "-"}
-            </Table.Cell>
-            <Table.Cell maxW="lg">
-              {dailyText.sefaria_url ? (
-                <a href={dailyText.sefaria_url} target="_blank" rel="noopener noreferrer" style={{ color: "blue", textDecoration: "underline" }}>
-                  {dailyText.sefaria_url}
-                </a>
-              ) : null}
-              {dailyText.content && (
-                <div style={{ marginTop: dailyText.sefaria_url ? "4px" : "0" }}>
-                  "{dailyText.content}"
-                </div>
-              )}
-              {!dailyText.sefaria_url && !dailyText.content && "-"}
-            </Table.Cell>
-            <Table.Cell>
-              <DailyTextActionsMenu dailyText={dailyText} />
-            </Table.Cell>
+    <>
+      <Table.Root size={{ base: "sm", md: "md" }}>
+        <Table.Header>
+          <Table.Row>
+            <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
+            <Table.ColumnHeader w="md">Title</Table.ColumnHeader>
+            <Table.ColumnHeader>Text</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
           </Table.Row>
-        ))}
-      </Table.Body>
-    </Table.Root>
+        </Table.Header>
+        <Table.Body>
+          {dailyTexts.map((dailyText) => (
+            <Table.Row key={dailyText.id} opacity={isPlaceholderData ? 0.5 : 1}>
+              <Table.Cell truncate maxW="sm">
+                {dailyText.id}
+              </Table.Cell>
+              <Table.Cell truncate maxW="sm">
+                {dailyText.middah}
+              </Table.Cell>
+              <Table.Cell truncate maxW="md">
+                {dailyText.title || "-"}
+              </Table.Cell>
+              <Table.Cell maxW="lg">
+                {dailyText.sefaria_url ? (
+                  <a href={dailyText.sefaria_url} target="_blank" rel="noopener noreferrer" style={{ color: "blue", textDecoration: "underline" }}>
+                    {dailyText.sefaria_url}
+                  </a>
+                ) : null}
+                {dailyText.content && (
+                  <div style={{ marginTop: dailyText.sefaria_url ? "4px" : "0" }}>
+                    "{dailyText.content}"
+                  </div>
+                )}
+                {!dailyText.sefaria_url && !dailyText.content && "-"}
+              </Table.Cell>
+              <Table.Cell>
+                <DailyTextActionsMenu dailyText={dailyText} />
+              </Table.Cell>
+            </Table.Row>
+          ))}
+        </Table.Body>
+      </Table.Root>
+      <CursorPagination
+        cursors={cursors}
+        nextCursor={data?.next_cursor}
+        pageSize={PER_PAGE}
+        onChange={setCursors}
+      />
+    </>
   )
 }
 
@@ -7,28 +7,48 @@ import {
   VStack,
 } from "@chakra-ui/react"
 import { useQuery } from "@tanstack/react-query"
-import { createFileRoute } from "@tanstack/react-router"
+import { createFileRoute, useNavigate } from "@tanstack/react-router"
 import { FiSearch } from "react-icons/fi"
 
 import { KabbalotService } from "@/client"
+import {
+  CursorPagination,
+  cursorSearchSchema,
+} from "@/components/Common/CursorPagination"
 import { KabbalahActionsMenu } from "@/components/Common/KabbalahActionsMenu"
 import AddKabbalah from "@/components/Kabbalot/AddKabbalah"
 
-function getKabbalotQueryOptions() {
+const PER_PAGE = 50
+
+function getKabbalotQueryOptions({ after }: { after?: string }) {
   return {
-    queryFn: () => KabbalotService.listKabbalot(),
-    queryKey: ["kabbalot"],
+    queryFn: () => KabbalotService.listKabbalot({ after, limit: PER_PAGE }),
+    queryKey: ["kabbalot", { after }],
   }
 }
 
 export const Route = createFileRoute("/_layout/kabbalot")({
   component: Kabbalot,
+  validateSearch: (search) => cursorSearchSchema.parse(search),
 })
 
 function KabbalotTable() {
-  const { data, isLoading } = useQuery(getKabbalotQueryOptions())
+  const navigate = useNavigate({ from: Route.fullPath })
+  const { cursors } = Route.useSearch()
+
+  const { data, isLoading, isPlaceholderData } = useQuery({
+    ...getKabbalotQueryOptions({ after: cursors[cursors.length - 1] }),
+    placeholderData: (prevData) => prevData,
+  })
+
+  const setCursors = (cursors: string[]) => {
+    navigate({
+      to: "/kabbalot",
+      search: (prev) => ({ ...prev, cursors }),
+    })
+  }
 
-  const kabbalot = data ?? []
+  const kabbalot = data?.data ?? []
 
   if (isLoading) {
     return (
@@ -57,34 +77,42 @@ function KabbalotTable() {
   }
 
   return (
-    <Table.Root size={{ base: "sm", md: "md" }}>
-      <Table.Header>
-        <Table.Row>
-          <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
-          <Table.ColumnHeader>Description</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
-        </Table.Row>
-      </Table.Header>
-      <Table.Body>
-        {kabbalot.map((kabbalah) => (
-          <Table.Row key={kabbalah.id}>
-            <Table.Cell truncate maxW="sm">
-              {kabbalah.id}
-            </Table.Cell>
-            <Table.Cell truncate maxW="sm">
-              {kabbalah.middah}
-            </Table.Cell>
-            <Table.Cell truncate maxW="lg">
-              "{kabbalah.description}"
-            </Table.Cell>
-            <Table.Cell>
-              <KabbalahActionsMenu kabbalah={kabbalah} />
-            </Table.Cell>
+    <>
+      <Table.Root size={{ base: "sm", md: "md" }}>
+        <Table.Header>
+          <Table.Row>
+            <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
+            <Table.ColumnHeader>Description</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
           </Table.Row>
-        ))}
-      </Table.Body>
-    </Table.Root>
+        </Table.Header>
+        <Table.Body>
+          {kabbalot.map((kabbalah) => (
+            <Table.Row key={kabbalah.id} opacity={isPlaceholderData ? 0.5 : 1}>
+              <Table.Cell truncate maxW="sm">
+                {kabbalah.id}
+              </Table.Cell>
+              <Table.Cell truncate maxW="sm">
+                {kabbalah.middah}
+              </Table.Cell>
+              <Table.Cell truncate maxW="lg">
+                "{kabbalah.description}"
+              </Table.Cell>
+              <Table.Cell>
+                <KabbalahActionsMenu kabbalah={kabbalah} />
+              </Table.Cell>
+            </Table.Row>
+          ))}
+        </Table.Body>
+      </Table.Root>
+      <CursorPagination
+        cursors={cursors}
+        nextCursor={data?.next_cursor}
+        pageSize={PER_PAGE}
+        onChange={setCursors}
+      />
+    </>
   )
 }
 
@@ -7,28 +7,49 @@ import {
   VStack,
 } from "@chakra-ui/react"
 import { useQuery } from "@tanstack/react-query"
-import { createFileRoute } from "@tanstack/react-router"
+import { createFileRoute, useNavigate } from "@tanstack/react-router"
 import { FiSearch } from "react-icons/fi"
 
 import { ReminderPhrasesService } from "@/client"
+import {
+  CursorPagination,
+  cursorSearchSchema,
+} from "@/components/Common/CursorPagination"
 import { ReminderPhraseActionsMenu } from "@/components/Common/ReminderPhraseActionsMenu"
 import AddReminderPhrase from "@/components/ReminderPhrases/AddReminderPhrase"
 
-function getReminderPhrasesQueryOptions() {
+const PER_PAGE = 50
+
+function getReminderPhrasesQueryOptions({ after }: { after?: string }) {
   return {
-    queryFn: () => ReminderPhrasesService.listReminderPhrases(),
-    queryKey: ["reminderPhrases"],
+    queryFn: () =>
+      ReminderPhrasesService.listReminderPhrases({ after, limit: PER_PAGE }),
+    queryKey: ["reminderPhrases", { after }],
   }
 }
 
 export const Route = createFileRoute("/_layout/reminder-phrases")({
   component: ReminderPhrases,
+  validateSearch: (search) => cursorSearchSchema.parse(search),
 })
 
 function ReminderPhrasesTable() {
-  const { data, isLoading } = useQuery(getReminderPhrasesQueryOptions())
+  const navigate = useNavigate({ from: Route.fullPath })
+  const { cursors } = Route.useSearch()
+
+  const { data, isLoading, isPlaceholderData } = useQuery({
+    ...getReminderPhrasesQueryOptions({ after: cursors[cursors.length - 1] }),
+    placeholderData: (prevData) => prevData,
+  })
+
+  const setCursors = (cursors: string[]) => {
+    navigate({
+      to: "/reminder-phrases",
+      search: (prev) => ({ ...prev, cursors }),
+    })
+  }
 
-  const reminderPhrases = data ?? []
+  const reminderPhrases = data?.data ?? []
 
   if (isLoading) {
     return (
@@ -57,34 +78,45 @@ function ReminderPhrasesTable() {
   }
 
   return (
-    <Table.Root size={{ base: "sm", md: "md" }}>
-      <Table.Header>
-        <Table.Row>
-          <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
-          <Table.ColumnHeader>Text</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
-        </Table.Row>
-      </Table.Header>
-      <Table.Body>
-        {reminderPhrases.map((reminderPhrase) => (
-          <Table.Row key={reminderPhrase.id}>
-            <Table.Cell truncate maxW="sm">
-              {reminderPhrase.id}
-            </Table.Cell>
-            <Table.Cell truncate maxW="sm">
-              {reminderPhrase.middah}
-            </Table.Cell>
-            <Table.Cell truncate maxW="lg">
-              "{reminderPhrase.text}"
-            </Table.Cell>
-            <Table.Cell>
-              <ReminderPhraseActionsMenu reminderPhrase={reminderPhrase} />
-            </Table.Cell>
+    <>
+      <Table.Root size={{ base: "sm", md: "md" }}>
+        <Table.Header>
+          <Table.Row>
+            <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Middah</Table.ColumnHeader>
+            <Table.ColumnHeader>Text</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
           </Table.Row>
-        ))}
-      </Table.Body>
-    </Table.Root>
+        </Table.Header>
+        <Table.Body>
+          {reminderPhrases.map((reminderPhrase) => (
+            <Table.Row
+              key={reminderPhrase.id}
+              opacity={isPlaceholderData ? 0.5 : 1}
+            >
+              <Table.Cell truncate maxW="sm">
+                {reminderPhrase.id}
+              </Table.Cell>
+              <Table.Cell truncate maxW="sm">
+                {reminderPhrase.middah}
+              </Table.Cell>
+              <Table.Cell truncate maxW="lg">
+                "{reminderPhrase.text}"
+              </Table.Cell>
+              <Table.Cell>
+                <ReminderPhraseActionsMenu reminderPhrase={reminderPhrase} />
+              </Table.Cell>
+            </Table.Row>
+          ))}
+        </Table.Body>
+      </Table.Root>
+      <CursorPagination
+        cursors={cursors}
+        nextCursor={data?.next_cursor}
+        pageSize={PER_PAGE}
+        onChange={setCursors}
+      />
+    </>
   )
 }
 
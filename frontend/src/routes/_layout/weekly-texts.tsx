@@ -7,28 +7,49 @@ import {
   VStack,
 } from "@chakra-ui/react"
 import { useQuery } from "@tanstack/react-query"
-import { createFileRoute } from "@tanstack/react-router"
+import { createFileRoute, useNavigate } from "@tanstack/react-router"
 import { FiSearch } from "react-icons/fi"
 
 import { WeeklyTextsService } from "@/client"
+import {
+  CursorPagination,
+  cursorSearchSchema,
+} from "@/components/Common/CursorPagination"
 import { WeeklyTextActionsMenu } from "@/components/Common/WeeklyTextActionsMenu"
 import AddWeeklyText from "@/components/WeeklyTexts/AddWeeklyText"
 
-function getWeeklyTextsQueryOptions() {
+const PER_PAGE = 50
+
+function getWeeklyTextsQueryOptions({ after }: { after?: string }) {
   return {
-    queryFn: () => WeeklyTextsService.listWeeklyTexts(),
-    queryKey: ["weeklyTexts"],
+    queryFn: () =>
+      WeeklyTextsService.listWeeklyTexts({ after, limit: PER_PAGE }),
+    queryKey: ["weeklyTexts", { after }],
   }
 }
 
 export const Route = createFileRoute("/_layout/weekly-texts")({
   component: WeeklyTexts,
+  validateSearch: (search) => cursorSearchSchema.parse(search),
 })
 
 function WeeklyTextsTable() {
-  const { data, isLoading } = useQuery(getWeeklyTextsQueryOptions())
+  const navigate = useNavigate({ from: Route.fullPath })
+  const { cursors } = Route.useSearch()
+
+  const { data, isLoading, isPlaceholderData } = useQuery({
+    ...getWeeklyTextsQueryOptions({ after: cursors[cursors.length - 1] }),
+    placeholderData: (prevData) => prevData,
+  })
+
+  const setCursors = (cursors: string[]) => {
+    navigate({
+      to: "/weekly-texts",
+      search: (prev) => ({ ...prev, cursors }),
+    })
+  }
 
-  const weeklyTexts = data ?? []
+  const weeklyTexts = data?.data ?? []
 
   if (isLoading) {
     return (
@@ -57,44 +78,55 @@ function WeeklyTextsTable() {
   }
 
   return (
-    <Table.Root size={{ base: "sm", md: "md" }}>
-      <Table.Header>
-        <Table.Row>
-          <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
-          <Table.ColumnHeader w="md">Title</Table.ColumnHeader>
-          <Table.ColumnHeader>Text</Table.ColumnHeader>
-          <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
-        </Table.Row>
-      </Table.Header>
-      <Table.Body>
-        {weeklyTexts.map((weeklyText) => (
-          <Table.Row key={weeklyText.id}>
-            <Table.Cell truncate maxW="sm">
-              {weeklyText.id}
-            </Table.Cell>
-            <Table.Cell truncate maxW="md">
-              {weeklyText.title || "-"}
-            </Table.Cell>
-            <Table.Cell maxW="lg">
-              {weeklyText.sefaria_url ? (
-                <a href={weeklyText.sefaria_url} target="_blank" rel="noopener noreferrer" style={{ color: "blue", textDecoration: "underline" }}>
-                  {weeklyText.sefaria_url}
-                </a>
-              ) : null}
-              {weeklyText.content && (
-                <div style={{ marginTop: weeklyText.sefaria_url ? "4px" : "0" }}>
-                  "{weeklyText.content}"
-                </div>
-              )}
-              {!weeklyText.sefaria_url && !weeklyText.content && "-"}
-            </Table.Cell>
-            <Table.Cell>
-              <WeeklyTextActionsMenu weeklyText={weeklyText} />
-            </Table.Cell>
+    <>
+      <Table.Root size={{ base: "sm", md: "md" }}>
+        <Table.Header>
+          <Table.Row>
+            <Table.ColumnHeader w="sm">ID</Table.ColumnHeader>
+            <Table.ColumnHeader w="md">Title</Table.ColumnHeader>
+            <Table.ColumnHeader>Text</Table.ColumnHeader>
+            <Table.ColumnHeader w="sm">Actions</Table.ColumnHeader>
           </Table.Row>
-        ))}
-      </Table.Body>
-    </Table.Root>
+        </Table.Header>
+        <Table.Body>
+          {weeklyTexts.map((weeklyText) => (
+            <Table.Row
+              key={weeklyText.id}
+              opacity={isPlaceholderData ? 0.5 : 1}
+            >
+              <Table.Cell truncate maxW="sm">
+                {weeklyText.id}
+              </Table.Cell>
+              <Table.Cell truncate maxW="md">
+                {weeklyText.title || "-"}
+              </Table.Cell>
+              <Table.Cell maxW="lg">
+                {weeklyText.sefaria_url ? (
+                  <a href={weeklyText.sefaria_url} target="_blank" rel="noopener noreferrer" style={{ color: "blue", textDecoration: "underline" }}>
+                    {weeklyText.sefaria_url}
+                  </a>
+                ) : null}
+                {weeklyText.content && (
+                  <div style={{ marginTop: weeklyText.sefaria_url ? "4px" : "0" }}>
+                    "{weeklyText.content}"
+                  </div>
+                )}
+                {!weeklyText.sefaria_url && !weeklyText.content && "-"}
+              </Table.Cell>
+              <Table.Cell>
+                <WeeklyTextActionsMenu weeklyText={weeklyText} />
+              </Table.Cell>
+            </Table.Row>
+          ))}
+        </Table.Body>
+      </Table.Root>
+      <CursorPagination
+        cursors={cursors}
+        nextCursor={data?.next_cursor}
+        pageSize={PER_PAGE}
+        onChange={setCursors}
+      />
+    </>
   )
 }
 